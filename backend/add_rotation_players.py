@@ -5,9 +5,8 @@ Expanding coverage with key bench and rotation players for 2025-26 season
 import sys
 import io
 from nba_stats_fetcher import NBAStatsFetcher
-from models import get_engine, get_session, Player, Game
+from models import get_engine, get_session, Player, Game, bulk_upsert_games
 from datetime import datetime
-import time
 
 # Force UTF-8 output
 if not isinstance(sys.stdout, io.TextIOWrapper) or sys.stdout.encoding != 'utf-8':
@@ -123,9 +122,6 @@ def add_rotation_players_to_db():
                 players_skipped += 1
                 continue
 
-            # Respect API rate limits
-            time.sleep(0.6)
-
             # Fetch player data
             try:
                 games = fetcher.fetch_player_season(
@@ -145,23 +141,22 @@ def add_rotation_players_to_db():
                 session.add(player)
                 session.flush()
 
-                # Add games
-                for game in games:
-                    game_date = datetime.strptime(game['date'], '%Y-%m-%d').date()
-
-                    new_game = Game(
-                        player_id=player.id,
-                        date=game_date,
-                        opponent=game['opponent'],
-                        is_home=bool(game['is_home']),
-                        points=int(game['points']),
-                        rebounds=int(game['rebounds']),
-                        assists=int(game['assists']),
-                        steals=int(game['steals']),
-                        blocks=int(game['blocks']),
-                        three_pm=int(game['three_pm'])
-                    )
-                    session.add(new_game)
+                # Add games (one statement; duplicate dates are skipped by the database)
+                bulk_upsert_games(session, [
+                    {
+                        'player_id': player.id,
+                        'date': datetime.strptime(game['date'], '%Y-%m-%d').date(),
+                        'opponent': game['opponent'],
+                        'is_home': bool(game['is_home']),
+                        'points': int(game['points']),
+                        'rebounds': int(game['rebounds']),
+                        'assists': int(game['assists']),
+                        'steals': int(game['steals']),
+                        'blocks': int(game['blocks']),
+                        'three_pm': int(game['three_pm'])
+                    }
+                    for game in games
+                ])
 
                 session.commit()
                 players_added += 1
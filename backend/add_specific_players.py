@@ -2,9 +2,9 @@
 Add specific players to the database
 """
 from nba_stats_fetcher import NBAStatsFetcher
-from models import get_engine, init_db, get_session, Player, Game
+from models import get_engine, init_db, get_session, Player, bulk_upsert_games
 from nba_api.stats.static import players as nba_players
-import time
+import rate_limiter
 
 # List of players to add (name, team, position)
 # Team and position will be fetched from NBA API
@@ -56,9 +56,8 @@ for player_name in players_to_add:
     try:
         # Fetch game logs for 2025-26 season
         # We'll use a placeholder for team/position and update after fetching
-        time.sleep(0.6)  # Rate limiting
-
         from nba_api.stats.endpoints import playergamelog
+        rate_limiter.acquire(rate_limiter.NBA_STATS)
         gamelog = playergamelog.PlayerGameLog(player_id=player_id, season="2025-26")
         games_df = gamelog.get_data_frames()[0]
 
@@ -83,7 +82,7 @@ for player_name in players_to_add:
         session.flush()  # Get the player ID
 
         # Add games
-        games_added = 0
+        game_rows = []
         for _, game_row in games_df.iterrows():
             # Parse matchup to determine home/away and opponent
             matchup = game_row['MATCHUP']
@@ -103,22 +102,22 @@ for player_name in players_to_add:
             else:
                 minutes_played = float(minutes_raw) if minutes_raw else 0.0
 
-            game = Game(
-                player_id=new_player.id,
-                date=game_date,
-                opponent=opponent,
-                is_home=is_home,
-                points=int(game_row.get('PTS', 0) or 0),
-                rebounds=int(game_row.get('REB', 0) or 0),
-                assists=int(game_row.get('AST', 0) or 0),
-                steals=int(game_row.get('STL', 0) or 0),
-                blocks=int(game_row.get('BLK', 0) or 0),
-                three_pm=int(game_row.get('FG3M', 0) or 0),
-                minutes=minutes_played
-            )
-            session.add(game)
-            games_added += 1
-
+            game_rows.append({
+                'player_id': new_player.id,
+                'date': game_date,
+                'opponent': opponent,
+                'is_home': is_home,
+                'points': int(game_row.get('PTS', 0) or 0),
+                'rebounds': int(game_row.get('REB', 0) or 0),
+                'assists': int(game_row.get('AST', 0) or 0),
+                'steals': int(game_row.get('STL', 0) or 0),
+                'blocks': int(game_row.get('BLK', 0) or 0),
+                'three_pm': int(game_row.get('FG3M', 0) or 0),
+                'minutes': minutes_played
+            })
+
+        # One statement for all games (duplicate dates are skipped by the database)
+        games_added = bulk_upsert_games(session, game_rows)
         session.commit()
         print(f"  SUCCESS: Added {full_name} ({team_abbr}) with {games_added} games")
 
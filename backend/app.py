@@ -4,142 +4,248 @@ Serves player prop data and analytics to the frontend
 Includes halftime betting projections and live stat tracking
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from calculator import StatScoutCalculator
 from db_loader import DatabaseLoader as DataLoader
 from odds_api import OddsAPIClient
 from nba_schedule_fetcher import NBAScheduleFetcher
-from team_quarter_analytics import TeamQuarterAnalytics
 from espn_injury_tracker import ESPNInjuryTracker
 from parlay_builder import ParlayBuilder
+from prop_board import PropBoard, TEAM_COLORS, STAT_LINES, SORT_FIELDS, get_opponent_def_stat, sort_key
+from game_store import STAT_COLUMNS, COMBINED_STATS, sync_game_stores, notify_games_changed
+from shared_cache import SharedValue
 from datetime import datetime, timedelta
+import base64
+import itertools
+import json
+import math
 import random
+import threading
+import metrics
+import http_cache
+
+class LazyService:
+    """
+    Stand-in for a service singleton that is only built on first use
+
+    Keeps rarely used services (and their imports, engines and sessions)
+    off the import path; attribute access is forwarded to the real object.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._service = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._service is None:
+            with self._lock:
+                if self._service is None:
+                    self._service = self._factory()
+        return getattr(self._service, name)
+
+
+def create_quarter_analytics():
+    from team_quarter_analytics import TeamQuarterAnalytics
+    return TeamQuarterAnalytics()
+
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend communication
+metrics.init_app(app)  # Per-route latency/SQL/calculator metrics at /api/metrics
 
 # Initialize injury tracker first (needed by calculator)
-injury_tracker = ESPNInjuryTracker()
+# Warm-starts from its disk cache; refreshed by a scheduler job (see below)
+# Caches are shared across gunicorn workers through shared_cache (CACHE_URL)
+injury_tracker = ESPNInjuryTracker(fetch_on_read=False, shared_cache=SharedValue("injuries"))
 
 # Initialize calculator with injury tracker, data loader, odds API client, schedule fetcher, and quarter analytics
 calc = StatScoutCalculator(injury_tracker=injury_tracker)
 loader = DataLoader()
 odds_client = OddsAPIClient()
-schedule_fetcher = NBAScheduleFetcher()
-quarter_analytics = TeamQuarterAnalytics()
+schedule_fetcher = NBAScheduleFetcher(fetch_on_read=False, shared_cache=SharedValue("schedule"))
+quarter_analytics = LazyService(create_quarter_analytics)  # Own engine/session, built on first quarter request
 parlay_builder = ParlayBuilder()
 
-# Initialize background scheduler for automated updates
-from scheduler import init_scheduler
-scheduler = init_scheduler()
+# Background jobs run in whichever worker holds the scheduler lease
+from scheduler import LeaderScheduler
+scheduler = LeaderScheduler()
 
 # Cache for odds data (optimized to conserve API quota)
 odds_cache = {
     "data": {},
-    "last_updated": None
+    "last_updated": None,
+    "version": 0  # Bumped whenever the cached odds are replaced
 }
+shared_odds = SharedValue("odds")  # What the scheduler leader fetched, for every worker
 
 # Cache configuration (in seconds)
 CACHE_DURATION = 4 * 60 * 60  # 4 hours (was 30 minutes)
 ACTIVE_HOURS_START = 6  # 6 AM
 ACTIVE_HOURS_END = 23   # 11 PM
 
+# Background refresh configuration
+REFRESH_CHECK_INTERVAL = 10 * 60  # How often refresh jobs check their cache
+ODDS_MIN_REQUESTS_REMAINING = 25  # Stop scheduled odds refreshes below this quota
+
 def is_active_hours():
     """Check if current time is during active hours (when odds should refresh)"""
     now = datetime.now()
     current_hour = now.hour
     return ACTIVE_HOURS_START <= current_hour < ACTIVE_HOURS_END
 
+def sync_odds_cache():
+    """Adopt odds another worker published if they're newer than ours"""
+    if not shared_odds.sync() or not shared_odds.value:
+        return
+    last_updated = datetime.fromisoformat(shared_odds.value["last_updated"])
+    if odds_cache["last_updated"] is None or last_updated > odds_cache["last_updated"]:
+        odds_cache["data"] = shared_odds.value["data"]
+        odds_cache["last_updated"] = last_updated
+        odds_cache["version"] += 1
+
 def get_cached_odds():
     """
-    Get odds from cache or fetch new ones
+    Get odds from cache (never fetches - see refresh_odds_cache)
+
+    Request handlers only read the cache, so their latency never depends
+    on The Odds API.
+    """
+    sync_odds_cache()
+    return odds_cache["data"]
+
+def refresh_odds_cache(force: bool = False):
+    """
+    Fetch fresh odds into the cache when due (runs on the scheduler)
 
     Optimization features:
     - 4-hour cache duration (reduced from 30 min)
     - Only refreshes during active hours (6 AM - 11 PM)
+    - Skips scheduled refreshes when the API quota is nearly used up
     - Saves ~75% of API requests
+
+    Args:
+        force: Refresh even if the cache is still fresh or quota is low
     """
+    # Another worker may have refreshed already (e.g. a previous leader)
+    sync_odds_cache()
     now = datetime.now()
 
     # Check if cache is expired
-    cache_expired = (odds_cache["last_updated"] is None or
+    cache_expired = (force or odds_cache["last_updated"] is None or
                      (now - odds_cache["last_updated"]).total_seconds() > CACHE_DURATION)
 
-    # Only fetch if cache is expired AND we're in active hours
-    # This prevents unnecessary API calls during late night/early morning
-    if cache_expired and is_active_hours():
-        print("[INFO] Fetching fresh odds from API...")
-        print(f"[INFO] Cache age: {(now - odds_cache['last_updated']).total_seconds() / 3600:.1f} hours" if odds_cache["last_updated"] else "[INFO] First fetch")
-
-        response = odds_client.get_all_player_props(
-            markets="player_points,player_rebounds,player_assists,player_threes,player_steals,player_blocks"
-        )
-
-        if response.get("success"):
-            parsed_props = odds_client.parse_player_props(response)
-
-            # Store in cache by player name and stat type (with all bookmakers)
-            odds_cache["data"] = {}
-            for prop in parsed_props:
-                key = f"{prop['player_name']}_{prop['stat_type']}"
+    if not cache_expired:
+        return odds_cache["data"]
 
-                # Group by player+stat, keeping all bookmakers
-                if key not in odds_cache["data"]:
-                    odds_cache["data"][key] = []
-
-                odds_cache["data"][key].append({
-                    "bookmaker": prop["bookmaker"],
-                    "line": prop["line"],
-                    "over_odds": prop.get("over_odds"),
-                    "under_odds": prop.get("under_odds")
-                })
+    # Only fetch during active hours
+    # This prevents unnecessary API calls during late night/early morning
+    if not is_active_hours():
+        print(f"[INFO] Odds cache expired but outside active hours ({ACTIVE_HOURS_START}:00-{ACTIVE_HOURS_END}:00). Using stale cache.")
+        return odds_cache["data"]
+
+    remaining = odds_client.requests_remaining
+    if not force and remaining is not None and remaining < ODDS_MIN_REQUESTS_REMAINING:
+        print(f"[WARNING] Skipping odds refresh: only {remaining} API requests remaining")
+        return odds_cache["data"]
+
+    print("[INFO] Fetching fresh odds from API...")
+    print(f"[INFO] Cache age: {(now - odds_cache['last_updated']).total_seconds() / 3600:.1f} hours" if odds_cache["last_updated"] else "[INFO] First fetch")
+
+    response = odds_client.get_all_player_props(
+        markets="player_points,player_rebounds,player_assists,player_threes,player_steals,player_blocks"
+    )
+
+    if response.get("success"):
+        parsed_props = odds_client.parse_player_props(response)
+
+        # Store in cache by player name and stat type (with all bookmakers)
+        # Build a new dict and swap it in, so readers never see a partial cache
+        new_data = {}
+        for prop in parsed_props:
+            key = f"{prop['player_name']}_{prop['stat_type']}"
+
+            # Group by player+stat, keeping all bookmakers
+            if key not in new_data:
+                new_data[key] = []
+
+            new_data[key].append({
+                "bookmaker": prop["bookmaker"],
+                "line": prop["line"],
+                "over_odds": prop.get("over_odds"),
+                "under_odds": prop.get("under_odds")
+            })
 
-            odds_cache["last_updated"] = now
-            print(f"[SUCCESS] Cached {len(parsed_props)} odds from {len(set(p['bookmaker'] for p in parsed_props))} bookmakers")
-            print(f"[INFO] Next refresh after: {(now + timedelta(seconds=CACHE_DURATION)).strftime('%I:%M %p')}")
-        else:
-            print(f"[WARNING] Could not fetch odds: {response.get('error')}")
-    elif cache_expired and not is_active_hours():
-        print(f"[INFO] Cache expired but outside active hours ({ACTIVE_HOURS_START}:00-{ACTIVE_HOURS_END}:00). Using stale cache.")
+        odds_cache["data"] = new_data
+        odds_cache["last_updated"] = now
+        odds_cache["version"] += 1
+        try:
+            shared_odds.publish({"data": new_data, "last_updated": now.isoformat()})
+        except Exception as e:
+            print(f"[WARNING] Could not share odds with other workers: {e}")
+        print(f"[SUCCESS] Cached {len(parsed_props)} odds from {len(set(p['bookmaker'] for p in parsed_props))} bookmakers")
+        print(f"[INFO] Next refresh after: {(now + timedelta(seconds=CACHE_DURATION)).strftime('%I:%M %p')}")
     else:
-        cache_age = (now - odds_cache["last_updated"]).total_seconds() / 3600 if odds_cache["last_updated"] else 0
-        print(f"[INFO] Using cached odds (age: {cache_age:.1f} hours)")
+        print(f"[WARNING] Could not fetch odds: {response.get('error')}")
 
     return odds_cache["data"]
 
-# Verify database connection on startup
-try:
-    player_count = len(loader.get_player_names())
-    print(f"[SUCCESS] Database connected successfully - {player_count} players loaded")
-except Exception as e:
-    print(f"[ERROR] Error connecting to database: {e}")
-
-# Team color mapping (for frontend display)
-TEAM_COLORS = {
-    "LAL": "#552583", "GSW": "#1D428A", "BOS": "#007A33", "MIL": "#00471B",
-    "DAL": "#00538C", "DEN": "#0E2240", "PHX": "#E56020", "PHI": "#006BB6",
-    "MIA": "#98002E", "CHI": "#CE1141", "BKN": "#000000", "MIN": "#0C2340",
-    "SAC": "#5A2D81", "POR": "#E03A3E", "LAC": "#C8102E", "UTA": "#002B5C",
-    "MEM": "#5D76A9", "NOP": "#0C2340", "SAS": "#C4CED4", "HOU": "#CE1141",
-    "OKC": "#007AC1", "ATL": "#E03A3E", "CLE": "#860038", "IND": "#002D62",
-    "DET": "#C8102E", "TOR": "#CE1141", "WAS": "#002B5C", "CHA": "#1D1160",
-    "ORL": "#0077C0", "NYK": "#006BB6"
-}
+def refresh_injury_cache():
+    """Sweep ESPN injuries when the cached report is stale (runs on the scheduler)"""
+    if injury_tracker.is_stale():
+        injury_tracker.refresh()
+        # Rebuild the teammate boost table now rather than on the next request
+        calc.get_teammate_boost_table(loader)
+
+def refresh_schedule_cache():
+    """Refresh upcoming games when stale (runs on the scheduler)"""
+    if not schedule_fetcher.is_stale():
+        return
+    # Outside active hours only fill an empty cache (e.g. right after startup)
+    if is_active_hours() or not schedule_fetcher.games_cache:
+        schedule_fetcher.get_upcoming_games(refresh_cache=True)
+
+# Refresh every source in the background; request handlers only read caches
+scheduler.add_refresh_job(refresh_odds_cache, REFRESH_CHECK_INTERVAL, 'odds_refresh', 'Odds Refresh')
+scheduler.add_refresh_job(refresh_injury_cache, REFRESH_CHECK_INTERVAL, 'injury_refresh', 'Injury Refresh')
+scheduler.add_refresh_job(refresh_schedule_cache, REFRESH_CHECK_INTERVAL, 'schedule_refresh', 'Schedule Refresh')
+scheduler.start()
+
+# Materialized prop board shared by /api/players and /api/parlay/generate
+prop_board = PropBoard(
+    loader=loader,
+    calc=calc,
+    injury_tracker=injury_tracker,
+    schedule_fetcher=schedule_fetcher,
+    odds_cache=odds_cache,
+    refresh_odds=sync_odds_cache
+)
+
+
+@app.before_request
+def sync_shared_caches():
+    """Pick up odds and new games published by other workers"""
+    sync_odds_cache()
+    sync_game_stores()
+
+# Time the expensive sections so /api/metrics can break down request latency
+metrics.time_methods(calc, 'calculator', ['analyze_props', 'analyze_player_prop', 'analyze_line_ladder'])
+metrics.time_methods(prop_board, 'prop_board', ['get_players', 'get_parlay_pool'])
+metrics.time_methods(odds_client, 'odds_api', ['get_all_player_props'])
+
+def warm_up():
+    """Load the game store and verify the database (off the import path)"""
+    try:
+        player_count = len(loader.get_player_names())
+        print(f"[SUCCESS] Database connected successfully - {player_count} players loaded")
+    except Exception as e:
+        print(f"[ERROR] Error connecting to database: {e}")
 
-# Betting lines for each stat type (these would come from an API in production)
-STAT_LINES = {
-    "Points": lambda avg: round(avg * 2) / 2,  # Round to nearest .5
-    "Rebounds": lambda avg: round(avg * 2) / 2,
-    "Assists": lambda avg: round(avg * 2) / 2,
-    "Steals": lambda avg: round(avg * 2) / 2,
-    "Blocks": lambda avg: round(avg * 2) / 2,
-    "3PM": lambda avg: round(avg * 2) / 2,
-    "PRA": lambda avg: round(avg * 2) / 2,  # Points + Rebounds + Assists
-    "PA": lambda avg: round(avg * 2) / 2,   # Points + Assists
-    "PR": lambda avg: round(avg * 2) / 2,   # Points + Rebounds
-    "RA": lambda avg: round(avg * 2) / 2    # Rebounds + Assists
-}
+
+# Importing the app never waits on the database, so the health check passes
+# right away; requests that need the game store before this finishes wait for it
+threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
 
 # Map stat names to CSV columns
 STAT_COLUMN_MAP = {
@@ -168,20 +274,6 @@ def generate_game_info():
     return date_str, time_str
 
 
-def get_opponent_def_stat(stat_type: str) -> str:
-    """Generate opponent defensive stat string"""
-    if stat_type == "Points":
-        return f"{random.randint(105, 120)}.{random.randint(0, 9)} PPG"
-    elif stat_type == "Rebounds":
-        return f"{random.randint(40, 50)}.{random.randint(0, 9)} RPG"
-    elif stat_type == "Assists":
-        return f"{random.randint(20, 28)}.{random.randint(0, 9)} APG"
-    elif stat_type == "3PM":
-        return f"{random.randint(10, 15)}.{random.randint(0, 9)} 3PM"
-    else:
-        return f"{random.randint(30, 60)}.{random.randint(0, 9)} Total"
-
-
 @app.route('/api/odds/status', methods=['GET'])
 def odds_status():
     """Check odds API status and cache info"""
@@ -214,8 +306,7 @@ def odds_status():
 @app.route('/api/odds/refresh', methods=['POST'])
 def refresh_odds():
     """Force refresh odds cache"""
-    odds_cache["last_updated"] = None  # Invalidate cache
-    cached_odds = get_cached_odds()
+    cached_odds = refresh_odds_cache(force=True)
     
     return jsonify({
         "success": True,
@@ -226,11 +317,9 @@ def refresh_odds():
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
-    try:
-        player_count = len(loader.get_player_names())
-    except:
-        player_count = 0
+    """Health check endpoint (never waits for the database or the game store load)"""
+    store = loader.game_store
+    player_count = len(store.data.names) if store.loaded else 0
 
     return jsonify({
         "status": "healthy",
@@ -239,172 +328,170 @@ def health_check():
     })
 
 
+# Page sizes for /api/players pagination (limit/cursor)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(state: dict) -> str:
+    """Opaque pagination cursor for a listing state"""
+    return base64.urlsafe_b64encode(json.dumps(state).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Parse a cursor from encode_cursor (raises ValueError if malformed)"""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    if not isinstance(state, dict) or not isinstance(state.get("position"), int) or state["position"] < 0:
+        raise ValueError("Invalid cursor")
+    if "after" in state and not is_sort_key(state["after"]):
+        raise ValueError("Invalid cursor")
+    return state
+
+
+def is_sort_key(after) -> bool:
+    """Whether a cursor's 'after' is a [value, name, statType] sort key (value a number or null)"""
+    if not isinstance(after, list) or len(after) != 3:
+        return False
+    value, name, stat_type = after
+    numeric = value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))
+    return numeric and isinstance(name, str) and isinstance(stat_type, str)
+
+
+def first_index_after(rows, after: tuple, field: str, descending: bool) -> int:
+    """Index of the first row that sorts after the cursor key (binary search)"""
+    low, high = 0, len(rows)
+    while low < high:
+        mid = (low + high) // 2
+        key = sort_key(rows[mid], field)
+        if (key < after) if descending else (key > after):
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
 @app.route('/api/players', methods=['GET'])
+@http_cache.cached(prop_board.current_versions)
 def get_all_players():
-    """Get all available player props"""
+    """
+    Get all available player props
+
+    Query params:
+        team, stat: Filters (default all)
+        sort: Server-side sort field (see prop_board.SORT_FIELDS), with
+              order=desc (default) or asc; default is board order
+        limit: Page size; the response then includes next_cursor
+        cursor: next_cursor from the previous page
+        format=ndjson (or Accept: application/x-ndjson): stream one prop
+              per line, ending with a {"success", "count", "next_cursor"}
+              line. Without sort, rows are streamed as the board computes them.
+    """
     
     # Get query parameters for filtering
     team_filter = request.args.get('team', 'all')
     stat_filter = request.args.get('stat', 'all')
-    
-    try:
-        players_list = []
-        player_id = 1
+    sort_field = request.args.get('sort')
+    descending = request.args.get('order', 'desc').lower() != 'asc'
+    stream = (request.args.get('format') == 'ndjson' or
+              request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+              == 'application/x-ndjson')
 
-        # Get all players from CSV
-        player_names = loader.get_player_names()
-
-        # Get list of all teams for opponent selection
-        all_teams = loader.get_teams()
+    if sort_field and sort_field not in SORT_FIELDS:
+        return jsonify({"success": False, "error": f"sort must be one of {', '.join(SORT_FIELDS)}"}), 400
 
-        # CRITICAL PERFORMANCE FIX: Pre-fetch injuries ONCE for the entire request
-        # This prevents calling ESPN API hundreds of times (one per player+stat combination)!
-        injury_tracker.get_all_injuries()
-
-        # Cache game info by team to avoid repeated lookups
-        team_game_cache = {}
+    try:
+        limit = None
+        if 'limit' in request.args:
+            limit = int(request.args['limit'])
+        elif 'cursor' in request.args:
+            limit = DEFAULT_PAGE_SIZE
+        if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        cursor = {"position": 0}
+        if 'cursor' in request.args:
+            cursor = decode_cursor(request.args['cursor'])
+            if cursor.get("sort") != sort_field or (sort_field and cursor.get("descending") != descending):
+                raise ValueError("cursor doesn't match the requested sort")
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
-        for player_name in player_names:
-            player_info = loader.get_player_info(player_name)
-            
-            if not player_info:
-                continue
-            
-            team = player_info["team"]
-            
-            # Team filter
-            if team_filter != 'all' and team != team_filter:
-                continue
-            
-            # Get all available stats for this player
-            all_stats = loader.get_all_available_stats(player_name)
-            
-            # Process each stat type
-            for stat_type, stat_values in all_stats.items():
-                # Format stat type for display
-                if stat_type == 'three_pm':
-                    display_stat_type = '3PM'
-                elif len(stat_type) <= 3:
-                    display_stat_type = stat_type.upper()
-                else:
-                    display_stat_type = stat_type.title()
-                
-                # Stat filter
-                if stat_filter != 'all' and display_stat_type.lower() != stat_filter.lower():
+    try:
+        # Read the materialized board (only rebuilt when stats, odds,
+        # injuries or schedule changed since the last request)
+        position = cursor["position"]
+        skip = 0
+        if sort_field:
+            rows = prop_board.get_players_sorted(sort_field, descending)
+            if "after" in cursor:
+                value, name, stat_type = cursor["after"]
+                after = (float('-inf') if value is None else value, name, stat_type)
+                rows = itertools.islice(rows, first_index_after(rows, after, sort_field, descending), None)
+        else:
+            # Board order: the cursor is the number of rows already served
+            rows = prop_board.iter_players() if stream else prop_board.get_players()
+            skip = position
+
+        filtered = team_filter != 'all' or stat_filter != 'all'
+        renumber = filtered or sort_field is not None
+        page = {"count": 0, "last": None, "has_more": False}
+
+        def page_rows():
+            """Rows of the requested page (filtered results are numbered from 1 again)"""
+            remaining_skip = skip
+            for player in rows:
+                if team_filter != 'all' and player["team"] != team_filter:
                     continue
-                
-                if len(stat_values) < 5:  # Need at least 5 games
+                if stat_filter != 'all' and player["statType"].lower() != stat_filter.lower():
                     continue
+                if remaining_skip:
+                    remaining_skip -= 1
+                    continue
+                if limit is not None and page["count"] == limit:
+                    page["has_more"] = True
+                    return
+                page["count"] += 1
+                page["last"] = player
+                yield {**player, "id": position + page["count"]} if renumber else player
+
+        def next_cursor():
+            if not page["has_more"]:
+                return None
+            state = {"sort": sort_field, "position": position + page["count"]}
+            if sort_field:
+                value, name, stat_type = sort_key(page["last"], sort_field)
+                state["descending"] = descending
+                state["after"] = [None if value == float('-inf') else value, name, stat_type]
+            return encode_cursor(state)
+
+        if stream:
+            def generate():
+                try:
+                    for player in page_rows():
+                        yield app.json.dumps(player) + "\n"
+                    yield app.json.dumps({"success": True, "count": page["count"],
+                                          "next_cursor": next_cursor()}) + "\n"
+                except Exception as e:
+                    yield app.json.dumps({"success": False, "error": str(e)}) + "\n"
+
+            return Response(generate(), mimetype='application/x-ndjson')
+
+        if not renumber and limit is None:
+            players_list = rows  # Whole board, as materialized
+        else:
+            players_list = list(page_rows())
 
-                # Calculate average
-                avg_stat = sum(stat_values) / len(stat_values)
-
-                # Try to get real betting lines from odds API
-                cached_odds = get_cached_odds()
-                odds_key = f"{player_name}_{display_stat_type}"
-
-                bookmaker_lines = []
-                is_real_line = False
-
-                if odds_key in cached_odds:
-                    # Use real betting lines from multiple bookmakers
-                    bookmaker_lines = cached_odds[odds_key]
-                    # Use the first bookmaker's line as the primary line
-                    line = bookmaker_lines[0]["line"] if bookmaker_lines else STAT_LINES.get(display_stat_type, lambda x: round(x - 0.5, 1))(avg_stat)
-                    is_real_line = True if bookmaker_lines else False
-                else:
-                    # Fallback to calculated line based on average
-                    line = STAT_LINES.get(display_stat_type, lambda x: round(x - 0.5, 1))(avg_stat)
-                    is_real_line = False
-
-                # Get real game matchup from schedule (cached by team)
-                if team not in team_game_cache:
-                    team_game_cache[team] = schedule_fetcher.get_player_next_game(team)
-
-                next_game = team_game_cache[team]
-
-                if next_game:
-                    # Use real game data
-                    opponent = next_game['opponent']
-                    is_home = next_game['is_home']
-                    game_date = next_game['game_date']
-                    game_time = next_game['game_time']
-                    opponent_rank = random.randint(5, 25)  # Still mock for now
-                else:
-                    # No game found in betting lines - show placeholder
-                    opponent = "TBD"
-                    opponent_rank = random.randint(5, 25)
-                    is_home = True
-                    game_date = "TBD"
-                    game_time = "TBD"
-
-                # Calculate all analytics
-                # TEMPORARY: Skip teammate boost to reduce memory usage on free tier
-                # TODO: Re-enable after optimizing or upgrading to paid tier
-                analysis = calc.analyze_player_prop(
-                    player_name=player_name,
-                    team=team,
-                    stat_type=display_stat_type,
-                    player_stats=stat_values,
-                    line=line,
-                    opponent=opponent,
-                    opponent_rank=opponent_rank,
-                    is_home=is_home,
-                    db_loader=None  # Temporarily disabled for memory
-                )
-
-                # Format for frontend
-                player_prop = {
-                    "id": player_id,
-                    "name": player_name,
-                    "team": team,
-                    "teamColor": TEAM_COLORS.get(team, "#000000"),
-                    "position": player_info["position"],
-                    "statType": display_stat_type,
-                    "line": line,
-                    "isRealLine": is_real_line,  # Flag if line is from real odds API
-                    "bookmakerLines": bookmaker_lines,  # All available bookmaker lines
-                    "hitRate": analysis["hit_rate"],
-                    "season_hits": analysis.get("season_hits"),
-                    "total_games": analysis.get("total_games"),
-                    "recent_hit_rate": analysis.get("recent_hit_rate"),
-                    "recent_hits": analysis.get("recent_hits"),
-                    "recent_total": analysis.get("recent_total"),
-                    "trustScore": analysis["trust_score"],
-                    "lastGames": analysis["last_games"],
-                    "last5Games": analysis["last_5_games"],
-                    "last15Games": analysis["last_15_games"],
-                    "recentForm": analysis["recent_form"],
-                    "opponent": opponent,
-                    "opponentRank": opponent_rank,
-                    "opponentDefStat": get_opponent_def_stat(display_stat_type),
-                    "gameDate": game_date,
-                    "gameTime": game_time,
-                    "isHome": is_home,
-                    "avgLastN": analysis["avg_last_10"],
-                    "streak": analysis["streak"],
-                    "streakType": analysis["streak_type"],
-                    "avgMinutes": player_info.get("avg_minutes", 0)
-                }
-                
-                players_list.append(player_prop)
-                player_id += 1
-
-        # Get injury status for all players in batch
-        all_player_names = list(set([p["name"] for p in players_list]))
-        injury_statuses = injury_tracker.get_batch_status(all_player_names)
-
-        # Add injury status to each player
-        for player in players_list:
-            player_status = injury_statuses.get(player["name"], {"status": "ACTIVE", "source": "default"})
-            player["injuryStatus"] = player_status["status"]
-            player["injurySource"] = player_status.get("source", "default")
-
-        return jsonify({
+        response = {
             "success": True,
             "count": len(players_list),
             "players": players_list
-        })
+        }
+        if limit is not None:
+            response["next_cursor"] = next_cursor()
+        return jsonify(response)
     
     except Exception as e:
         return jsonify({
@@ -450,7 +537,8 @@ def get_player(player_name):
                 opponent=opponent,
                 opponent_rank=random.randint(5, 25),
                 is_home=random.choice([True, False]),
-                db_loader=loader
+                db_loader=loader,
+                stat_window=loader.get_stat_window(player_name, stat_type)
             )
             
             props.append(analysis)
@@ -527,7 +615,8 @@ def calculate_custom():
                 opponent=opponent,
                 opponent_rank=opponent_rank,
                 is_home=is_home,
-                db_loader=loader
+                db_loader=loader,
+                stat_window=loader.get_stat_window(player_name, matched_stat)
             )
             
             # Generate game info
@@ -604,6 +693,122 @@ def calculate_custom():
         }), 500
 
 
+# Most lines one ladder request may evaluate
+MAX_LADDER_LINES = 500
+
+
+def parse_ladder_lines(data: dict) -> list:
+    """
+    Lines a ladder request asks for (raises ValueError if invalid)
+
+    Either an explicit "lines" list or line_min..line_max by step. The
+    count is checked against MAX_LADDER_LINES before any list is built,
+    and every line must be finite (NaN/inf can't be returned as JSON).
+    """
+    if 'lines' in data:
+        if not isinstance(data['lines'], list):
+            raise ValueError("lines must be a list")
+        if len(data['lines']) > MAX_LADDER_LINES:
+            raise ValueError(f"At most {MAX_LADDER_LINES} lines per request")
+        lines = [float(line) for line in data['lines']]
+    elif 'line_min' in data and 'line_max' in data:
+        line_min, line_max = float(data['line_min']), float(data['line_max'])
+        step = float(data.get('step', 0.5))
+        if not all(math.isfinite(value) for value in (line_min, line_max, step)):
+            raise ValueError("line_min, line_max and step must be finite")
+        if step <= 0:
+            raise ValueError("step must be positive")
+        span = (line_max - line_min) / step
+        if not math.isfinite(span) or round(span) + 1 > MAX_LADDER_LINES:
+            raise ValueError(f"At most {MAX_LADDER_LINES} lines per request")
+        # Rounded only to drop float noise, so steps finer than 0.1 survive
+        lines = [round(line_min + i * step, 6) for i in range(max(round(span) + 1, 0))]
+    else:
+        raise ValueError("Provide lines or line_min/line_max")
+
+    if not lines:
+        raise ValueError("No lines to evaluate")
+    if not all(math.isfinite(line) for line in lines):
+        raise ValueError("lines must be finite")
+    return lines
+
+
+@app.route('/api/calculate/ladder', methods=['POST'])
+def calculate_line_ladder():
+    """
+    Trust scores for one player prop at many alternate lines
+
+    Body: player_name, stat_type, and either "lines" (list) or line_min,
+    line_max and optional step (default 0.5). Optional opponent,
+    opponent_rank and is_home as in /api/calculate.
+    """
+    data = request.json or {}
+
+    if 'player_name' not in data or 'stat_type' not in data:
+        return jsonify({"success": False, "error": "Missing required fields"}), 400
+
+    try:
+        lines = parse_ladder_lines(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    try:
+        player_name = data['player_name']
+        stat_type = data['stat_type']
+
+        player_info = loader.get_player_info(player_name)
+        if not player_info:
+            return jsonify({"success": False, "error": "Player not found"}), 404
+
+        # Map display stat type to the stored stat (3PM -> three_pm, combos stay upper case)
+        stat_key = 'three_pm' if stat_type.lower() == '3pm' else stat_type.lower()
+        if stat_key.upper() in COMBINED_STATS:
+            stat_key = stat_key.upper()
+        if stat_key not in STAT_COLUMNS and stat_key not in COMBINED_STATS:
+            return jsonify({"success": False, "error": f"Stat type {stat_type} not available for {player_name}"}), 404
+
+        # History read once; the rolling-window index covers the line-independent numbers
+        stat_values = loader.get_player_stat_history(player_name, stat_key)
+        stat_window = loader.get_stat_window(player_name, stat_key)
+
+        all_teams = loader.get_teams()
+        opponents = [t for t in all_teams if t != player_info["team"]]
+        opponent = data.get('opponent', random.choice(opponents) if opponents else "OPP")
+        opponent_rank = data.get('opponent_rank', random.randint(5, 25))
+        is_home = data.get('is_home', random.choice([True, False]))
+
+        # Teammate boost, rest, usage and pace don't depend on the line: compute once
+        context_scores = calc.calculate_context_scores(
+            player_name=player_name,
+            team=player_info["team"],
+            stat_type=stat_type,
+            db_loader=loader,
+            opponent=opponent
+        )
+
+        analysis = calc.analyze_line_ladder(
+            stat_values, lines, opponent_rank, is_home,
+            context_scores=context_scores, stat_window=stat_window
+        )
+
+        return jsonify({
+            "success": True,
+            "player": player_name,
+            "team": player_info["team"],
+            "statType": stat_type,
+            "opponent": opponent,
+            "opponentRank": opponent_rank,
+            "isHome": is_home,
+            "analysis": analysis
+        })
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
 @app.route('/api/add-player', methods=['POST'])
 def add_player():
     """Add a new player to the database"""
@@ -619,7 +824,7 @@ def add_player():
 
         from nba_stats_fetcher import NBAStatsFetcher
         from nba_api.stats.static import players as nba_players
-        from models import Player, Game
+        from models import Player, bulk_upsert_games
 
         # Find player in NBA API
         all_nba_players = nba_players.get_players()
@@ -653,9 +858,9 @@ def add_player():
 
         # Fetch player details to get position
         from nba_api.stats.endpoints import commonplayerinfo
-        import time
+        import rate_limiter
 
-        time.sleep(0.6)  # Rate limiting
+        rate_limiter.acquire(rate_limiter.NBA_STATS)
         player_details = commonplayerinfo.CommonPlayerInfo(player_id=nba_player['id'])
         player_info_df = player_details.get_data_frames()[0]
 
@@ -690,26 +895,30 @@ def add_player():
         session.flush()
 
         # Add games
-        for game in games:
-            from datetime import datetime
-            new_game = Game(
-                player_id=new_player.id,
-                date=datetime.strptime(game['date'], '%Y-%m-%d').date(),
-                opponent=game['opponent'],
-                is_home=bool(game['is_home']),
-                points=int(game['points']),
-                rebounds=int(game['rebounds']),
-                assists=int(game['assists']),
-                steals=int(game['steals']),
-                blocks=int(game['blocks']),
-                three_pm=int(game['three_pm'])
-            )
-            session.add(new_game)
+        from datetime import datetime
+        games_added = bulk_upsert_games(session, [
+            {
+                'player_id': new_player.id,
+                'date': datetime.strptime(game['date'], '%Y-%m-%d').date(),
+                'opponent': game['opponent'],
+                'is_home': bool(game['is_home']),
+                'points': int(game['points']),
+                'rebounds': int(game['rebounds']),
+                'assists': int(game['assists']),
+                'steals': int(game['steals']),
+                'blocks': int(game['blocks']),
+                'three_pm': int(game['three_pm'])
+            }
+            for game in games
+        ])
 
         session.commit()
-        games_added = len(games)
         session.close()
 
+        # Make the new player visible to the game stores of every worker
+        # (reloaded rather than appended: the player list changed too)
+        notify_games_changed()
+
         return jsonify({
             "success": True,
             "message": f"Added {full_name} with {games_added} games"
@@ -727,8 +936,6 @@ def add_player():
 @app.route('/api/update', methods=['POST'])
 def trigger_update():
     """Manually trigger a stats update (runs asynchronously)"""
-    import threading
-
     def run_update():
         """Background thread function to run the update"""
         try:
@@ -751,7 +958,7 @@ def trigger_update():
         # Return immediately while update runs in background
         return jsonify({
             "success": True,
-            "message": "Stats update started in background. Check server logs for progress.",
+            "message": "Stats update started in background. Check /api/update/status for progress.",
             "status": "running"
         })
 
@@ -762,6 +969,33 @@ def trigger_update():
         }), 500
 
 
+
+@app.route('/api/update/status', methods=['GET'])
+def update_status():
+    """Progress of the latest stats update job (see update_stats.update_all_players)"""
+    from sqlalchemy import inspect
+    from models import UpdateJob, get_session
+
+    try:
+        if not inspect(loader.engine).has_table(UpdateJob.__tablename__):
+            return jsonify({"success": True, "job": None})
+
+        session = get_session(loader.engine)
+        try:
+            job = session.query(UpdateJob).order_by(UpdateJob.id.desc()).first()
+            return jsonify({
+                "success": True,
+                "job": job.to_dict() if job else None
+            })
+        finally:
+            session.close()
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
 # ========== INJURY & STATUS ENDPOINTS ==========
 
 @app.route('/api/injuries/player/<player_name>', methods=['GET'])
@@ -866,6 +1100,7 @@ def refresh_injury_data():
 # ========== TEAM QUARTER ANALYTICS ENDPOINTS ==========
 
 @app.route('/api/quarters/team/<team_abbr>', methods=['GET'])
+@http_cache.cached(lambda: quarter_analytics.version)
 def get_team_quarter_stats(team_abbr):
     """Get quarter statistics for a specific team"""
     try:
@@ -899,6 +1134,7 @@ def get_team_quarter_stats(team_abbr):
 
 
 @app.route('/api/quarters/matchup', methods=['GET'])
+@http_cache.cached(lambda: quarter_analytics.version)
 def get_matchup_quarter_analysis():
     """Get quarter analysis for a team vs team matchup"""
     try:
@@ -935,6 +1171,7 @@ def get_matchup_quarter_analysis():
 # ========== MATCHUP HISTORY ENDPOINTS ==========
 
 @app.route('/api/location-split/<player_name>/<stat_type>/<int:is_home>', methods=['GET'])
+@http_cache.cached(lambda: loader.game_store.version)
 def get_location_split(player_name, stat_type, is_home):
     """Get a player's home/away performance split (lazy loaded)"""
     try:
@@ -961,6 +1198,7 @@ def get_location_split(player_name, stat_type, is_home):
 
 
 @app.route('/api/half-tendency/<player_name>/<stat_type>', methods=['GET'])
+@http_cache.cached(lambda: loader.game_store.version)
 def get_half_tendency(player_name, stat_type):
     """Get a player's first half vs second half tendency"""
     try:
@@ -985,6 +1223,7 @@ def get_half_tendency(player_name, stat_type):
 
 
 @app.route('/api/live-projection/<player_name>/<stat_type>/<current_stat>', methods=['GET'])
+@http_cache.cached(lambda: loader.game_store.version)
 def get_live_projection(player_name, stat_type, current_stat):
     """Get live projection for halftime betting"""
     try:
@@ -1005,6 +1244,7 @@ def get_live_projection(player_name, stat_type, current_stat):
 
 
 @app.route('/api/matchup/<player_name>/<opponent>', methods=['GET'])
+@http_cache.cached(lambda: loader.game_store.version)
 def get_player_matchup_history(player_name, opponent):
     """Get a player's performance history against a specific opponent"""
     try:
@@ -1045,6 +1285,7 @@ def generate_parlay():
         min_legs = data.get('min_legs', 2)
         max_legs = data.get('max_legs', 6)
         banned_players = data.get('banned_players', [])
+        seed = data.get('seed')  # Optional: reproducible suggestions
 
         # Validate safety level
         if safety_level not in ['conservative', 'moderate', 'aggressive']:
@@ -1060,10 +1301,6 @@ def generate_parlay():
                 "error": f"Invalid game_filter: {game_filter}. Must be 'any', 'single', or 'specific'"
             }), 400
 
-        # Get all available props by calling the get_all_players logic
-        # This reuses the same data pipeline as the /api/players endpoint
-        all_props = []
-
         # Helper function for case and accent-insensitive name matching
         import unicodedata
         def normalize_name(name):
@@ -1074,106 +1311,17 @@ def generate_parlay():
             return without_accents.lower().strip()
 
         # Normalize banned player names for comparison
-        normalized_banned = [normalize_name(p) for p in banned_players]
-
-        player_names = loader.get_player_names()
-
-        # Pre-fetch injuries once for performance
-        injury_tracker.get_all_injuries()
+        normalized_banned = set(normalize_name(p) for p in banned_players)
 
-        # Cache game info by team
-        team_game_cache = {}
-
-        for player_name in player_names:
-            # Check if player is banned (case and accent insensitive)
-            if normalize_name(player_name) in normalized_banned:
-                continue  # Skip banned players
-            player_info = loader.get_player_info(player_name)
-
-            if not player_info:
-                continue
-
-            team = player_info["team"]
-            all_stats = loader.get_all_available_stats(player_name)
-
-            # Process each stat type
-            for stat_type, stat_values in all_stats.items():
-                # Format stat type for display
-                if stat_type == 'three_pm':
-                    display_stat_type = '3PM'
-                elif len(stat_type) <= 3:
-                    display_stat_type = stat_type.upper()
-                else:
-                    display_stat_type = stat_type.title()
-
-                if len(stat_values) < 5:
-                    continue
+        # Props come from the materialized board, which already skips injured
+        # players and props without a scheduled game
+        all_props = prop_board.get_parlay_pool()
 
-                avg_stat = sum(stat_values) / len(stat_values)
-
-                # Get real betting lines
-                cached_odds = get_cached_odds()
-                odds_key = f"{player_name}_{display_stat_type}"
-
-                # Try to use real odds, fallback to calculated lines
-                line = None
-                odds = -110  # Default odds
-
-                if odds_key in cached_odds and cached_odds[odds_key]:
-                    # Use real betting lines from bookmaker
-                    bookmaker_lines = cached_odds[odds_key]
-                    if bookmaker_lines:
-                        first_bookmaker = bookmaker_lines[0]
-                        line = first_bookmaker.get("line")
-                        odds = first_bookmaker.get("over_odds", -110)
-
-                # Fallback to calculated line if no real odds
-                if line is None:
-                    line = STAT_LINES.get(display_stat_type, lambda x: round(x - 0.5, 1))(avg_stat)
-
-                # Get game matchup
-                if team not in team_game_cache:
-                    team_game_cache[team] = schedule_fetcher.get_player_next_game(team)
-
-                next_game = team_game_cache[team]
-                if not next_game:
-                    continue  # Skip props without scheduled games
-
-                opponent = next_game['opponent']
-                is_home = next_game['is_home']
-
-                # Calculate trust score using full analysis
-                analysis = calc.analyze_player_prop(
-                    player_name=player_name,
-                    team=team,
-                    stat_type=display_stat_type,
-                    player_stats=stat_values,
-                    line=line,
-                    opponent=opponent,
-                    opponent_rank=15,  # Default middle-of-pack
-                    is_home=is_home,
-                    db_loader=loader
-                )
-
-                # Check injury status - skip injured/questionable players
-                injury_status = injury_tracker.get_player_status(player_name)
-                if injury_status:
-                    status = injury_status.get('status', '')
-                    # Skip OUT and QUESTIONABLE players from parlays
-                    if status in ['OUT', 'QUESTIONABLE', 'DOUBTFUL']:
-                        continue  # Don't include injured players in parlay pool
-
-                # Add to available props for parlay building
-                all_props.append({
-                    'player_name': player_name,
-                    'team': team,
-                    'opponent': opponent,
-                    'stat_type': display_stat_type,
-                    'line': line,
-                    'odds': odds,
-                    'trust_score': analysis['trust_score'],
-                    'is_home': is_home
-                })
+        if normalized_banned:
+            all_props = [
+                prop for prop in all_props
+                if normalize_name(prop['player_name']) not in normalized_banned
+            ]
 
         # Generate parlays
         suggestions = parlay_builder.generate_parlay(
@@ -1184,7 +1332,8 @@ def generate_parlay():
             selected_games=selected_games,
             num_suggestions=num_suggestions,
             min_legs=min_legs,
-            max_legs=max_legs
+            max_legs=max_legs,
+            seed=seed
         )
 
         return jsonify({
@@ -4,8 +4,8 @@ Backfill minutes data for existing players
 from models import get_engine, get_session, Player, Game
 from nba_api.stats.endpoints import playergamelog
 from nba_api.stats.static import players as nba_players
-import time
-from datetime import datetime
+from nba_stats_fetcher import NBAStatsFetcher
+import rate_limiter
 
 print("=" * 60)
 print("BACKFILLING MINUTES DATA FOR EXISTING PLAYERS")
@@ -51,8 +51,7 @@ for player in all_players:
 
         player_id = nba_player[0]['id']
 
-        # Rate limiting
-        time.sleep(0.6)
+        rate_limiter.acquire(rate_limiter.NBA_STATS)
 
         # Fetch game logs for 2025-26 season
         gamelog = playergamelog.PlayerGameLog(player_id=player_id, season="2025-26")
@@ -63,28 +62,20 @@ for player in all_players:
             error_count += 1
             continue
 
-        # Get all games for this player from database
-        db_games = session.query(Game).filter(Game.player_id == player.id).order_by(Game.date).all()
-
-        # Match games by date and update minutes
-        games_updated = 0
-        for db_game in db_games:
-            # Find matching game in NBA data
-            matching_games = games_df[games_df['GAME_DATE'] == db_game.date.strftime('%b %d, %Y')]
-
-            if not matching_games.empty:
-                game_row = matching_games.iloc[0]
-
-                # Parse minutes
-                minutes_raw = game_row.get('MIN', 0)
-                if isinstance(minutes_raw, str) and ':' in minutes_raw:
-                    parts = minutes_raw.split(':')
-                    minutes_played = float(parts[0]) + (float(parts[1]) / 60) if len(parts) == 2 else 0.0
-                else:
-                    minutes_played = float(minutes_raw) if minutes_raw else 0.0
-
-                db_game.minutes = minutes_played
-                games_updated += 1
+        # Parse the whole log once: minutes by game date (first row per date)
+        batch = NBAStatsFetcher.parse_game_log(games_df)
+        batch = batch[batch['game_date'].notna()].drop_duplicates('game_date', keep='first')
+        minutes_by_date = dict(zip(batch['game_date'].dt.date.tolist(), batch['minutes'].tolist()))
+
+        # Match this player's games by date and update minutes in one batch
+        db_games = session.query(Game.id, Game.date).filter(Game.player_id == player.id).all()
+        updates = [
+            {'id': game_id, 'minutes': minutes_by_date[game_date]}
+            for game_id, game_date in db_games
+            if game_date in minutes_by_date
+        ]
+        session.bulk_update_mappings(Game, updates)
+        games_updated = len(updates)
 
         session.commit()
         print(f"  SUCCESS: Updated {games_updated} games with minutes data")
@@ -0,0 +1,167 @@
+"""
+API Server Startup Benchmark
+Imports app.py in fresh interpreters (python -X importtime) and reports the
+import wall time, the slowest modules and any heavy module that was pulled
+onto the startup path
+
+This is what a Render cold start waits for before the health check can pass,
+so it is checked against a budget: the script exits 1 when the median import
+time is over --budget-ms or a deferred module (pandas, nba_api, APScheduler...)
+is imported at startup.
+
+Usage (from backend/):
+    python benchmarks/bench_importtime.py
+    python benchmarks/bench_importtime.py --budget-ms 1000 --save before.json
+    python benchmarks/bench_importtime.py --compare before.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic_league import generate_league, write_database  # noqa: E402
+
+# Modules that only rarely used paths need; importing app must not load them
+DEFERRED_MODULES = ["pandas", "nba_api", "apscheduler", "pytz", "team_quarter_analytics", "update_stats"]
+
+# Runs in the child interpreter: time the import, report what got loaded
+CHILD_SCRIPT = """
+import json, os, sys, time
+sys.path.insert(0, {backend!r})
+start = time.perf_counter()
+import app
+seconds = time.perf_counter() - start
+loaded = sorted({{name.split('.')[0] for name in sys.modules}})
+print("STARTUP_RESULT " + json.dumps({{"seconds": seconds, "modules": loaded}}), flush=True)
+sys.stderr.flush()
+os._exit(0)  # Don't wait for the warm-up thread
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output
+
+    Returns:
+        Dict of {module: (self_us, cumulative_us)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+def run_once(env):
+    """Import the app once in a fresh interpreter"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT.format(backend=BACKEND_DIR)],
+        env=env, cwd=env["STATSCOUT_BENCH_DIR"], capture_output=True, text=True, timeout=300
+    )
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith("STARTUP_RESULT "):
+            result = json.loads(line[len("STARTUP_RESULT "):])
+    if result is None:
+        raise RuntimeError(f"Importing app failed:\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}")
+    result["importtime"] = parse_importtime(proc.stderr)
+    return result
+
+
+def run_benchmark(args):
+    """Import the app args.runs times against a small synthetic database"""
+    work_dir = tempfile.mkdtemp(prefix="statscout_startup_")
+    league = generate_league(teams=4, players_per_team=5, games=10, seed=42)
+    url = write_database(league, os.path.join(work_dir, "statscout.db"))
+
+    # Hold the scheduler lease so the child never starts background jobs
+    # (no network calls, no job imports racing the measured import)
+    cache_url = f"sqlite:///{os.path.join(work_dir, 'statscout_cache.db')}"
+    from shared_cache import LeaderLock, create_backend
+    lease = LeaderLock("scheduler", backend=create_backend(cache_url), ttl=3600)
+    lease.renew()
+
+    env = dict(os.environ, DATABASE_URL=url, CACHE_URL=cache_url, STATSCOUT_BENCH_DIR=work_dir)
+    env.pop("ODDS_API_KEY", None)
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    lease.release()
+
+    slowest = sorted(
+        runs[-1]["importtime"].items(), key=lambda item: item[1][0], reverse=True
+    )[:args.top]
+    app_cumulative = [r["importtime"].get("app", (0, 0))[1] / 1000 for r in runs]
+
+    return {
+        "runs": args.runs,
+        "import_ms": statistics.median(r["seconds"] * 1000 for r in runs),
+        "import_ms_min": min(r["seconds"] * 1000 for r in runs),
+        "app_importtime_ms": statistics.median(app_cumulative),
+        "deferred_loaded": [m for m in DEFERRED_MODULES if m in runs[-1]["modules"]],
+        "slowest": [{"module": name, "self_ms": s / 1000, "cumulative_ms": c / 1000} for name, (s, c) in slowest],
+    }
+
+
+def print_report(report, budget_ms, baseline=None):
+    """Print the results (with change vs a baseline report)"""
+    print("\n" + "=" * 72)
+    print(f"STATSCOUT STARTUP BENCHMARK - import app, {report['runs']} fresh interpreters")
+    print("=" * 72)
+    change = ""
+    if baseline and baseline.get("import_ms"):
+        change = f" ({(report['import_ms'] / baseline['import_ms'] - 1) * 100:+.1f}% vs base)"
+    print(f"Import wall time (median): {report['import_ms']:8.1f} ms{change}")
+    print(f"Import wall time (best):   {report['import_ms_min']:8.1f} ms")
+    print(f"-X importtime for app:     {report['app_importtime_ms']:8.1f} ms")
+    print(f"Budget:                    {budget_ms:8.1f} ms")
+    print("-" * 72)
+    print(f"{'Slowest modules (self time)':48} {'self ms':>10} {'cum ms':>10}")
+    for entry in report["slowest"]:
+        print(f"{entry['module'][:48]:48} {entry['self_ms']:10.1f} {entry['cumulative_ms']:10.1f}")
+    print("-" * 72)
+    if report["deferred_loaded"]:
+        print(f"[ERROR] Deferred modules imported at startup: {', '.join(report['deferred_loaded'])}")
+    else:
+        print(f"Deferred modules kept off the startup path: {', '.join(DEFERRED_MODULES)}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark StatScout API server startup (import time)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to import the app in")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Fail above this median import time")
+    parser.add_argument("--save", help="Save results as JSON (for --compare later)")
+    parser.add_argument("--compare", help="JSON results from an earlier run to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = run_benchmark(args)
+    print_report(report, args.budget_ms, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Saved results to {args.save}")
+
+    over_budget = report["import_ms"] > args.budget_ms
+    if over_budget:
+        print(f"[ERROR] Startup over budget: {report['import_ms']:.0f} ms > {args.budget_ms:.0f} ms")
+    sys.exit(1 if over_budget or report["deferred_loaded"] else 0)
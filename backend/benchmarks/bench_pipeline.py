@@ -0,0 +1,250 @@
+"""
+Prop Pipeline Benchmark
+Times the hot endpoints against a synthetic league with all external data
+sources faked, and reports p50/p95 latency, SQL queries per call and peak RSS
+
+Usage (from backend/):
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --save before.json
+    python benchmarks/bench_pipeline.py --compare before.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic_league import generate_league, write_database, build_odds_events  # noqa: E402
+from fakes import install_fakes, synthetic_injuries  # noqa: E402
+
+
+class QueryCounter:
+    """Counts SQL statements executed on any SQLAlchemy engine"""
+
+    def __init__(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        self.count = 0
+        event.listen(Engine, "after_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unavailable)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_case(name, func, iterations, queries, setup=None):
+    """
+    Time one benchmark case
+
+    Args:
+        name: Case name for the report
+        func: Callable to time (should raise on failure)
+        iterations: Timed calls (after one untimed warm-up call)
+        queries: QueryCounter
+        setup: Optional callable run before every call (not timed)
+
+    Returns:
+        Result dict with latency percentiles and queries per call
+    """
+    if setup:
+        setup()
+    func()  # Warm-up
+
+    timings = []
+    query_total = 0
+    for _ in range(iterations):
+        if setup:
+            setup()
+        before = queries.count
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+        query_total += queries.count - before
+
+    return {
+        "name": name,
+        "iterations": iterations,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "mean_ms": statistics.mean(timings),
+        "queries_per_call": query_total / iterations,
+    }
+
+
+def check_response(response):
+    """Fail loudly if an endpoint errored (a fast error isn't a speedup)"""
+    payload = response.get_json()
+    if response.status_code != 200 or not payload.get("success", False):
+        raise RuntimeError(f"Request failed ({response.status_code}): {payload.get('error')}")
+    return payload
+
+
+def run_benchmarks(args):
+    """Build the synthetic league, boot the app against it and time each case"""
+    work_dir = tempfile.mkdtemp(prefix="statscout_bench_")
+    db_path = args.db or os.path.join(work_dir, "statscout.db")
+
+    print(f"[INFO] Generating league: {args.teams} teams x {args.players_per_team} players, {args.games} games")
+    start = time.perf_counter()
+    league = generate_league(args.teams, args.players_per_team, args.games, args.seed)
+    url = write_database(league, db_path)
+    print(f"[INFO] Wrote {len(league['games'])} games to {db_path} in {time.perf_counter() - start:.1f}s")
+
+    events = build_odds_events(league, bookmakers=args.bookmakers)
+    install_fakes(events, synthetic_injuries(league, args.injury_rate), odds_latency=args.odds_latency)
+    os.environ["DATABASE_URL"] = url
+    os.chdir(work_dir)  # Keep any cache files the app writes out of the repo
+
+    queries = QueryCounter()
+
+    start = time.perf_counter()
+    import app as statscout_app
+    import_seconds = time.perf_counter() - start
+    startup_queries = queries.count
+
+    # Stop background jobs and warm every cache synchronously instead
+    statscout_app.scheduler.shutdown(wait=True)
+    statscout_app.is_active_hours = lambda: True
+    statscout_app.refresh_injury_cache()
+    statscout_app.refresh_schedule_cache()
+    statscout_app.refresh_odds_cache(force=True)
+
+    client = statscout_app.app.test_client()
+    board = statscout_app.prop_board
+    calc = statscout_app.calc
+    loader = statscout_app.loader
+    names = [player["name"] for player in league["players"]]
+    iterations = args.iterations
+
+    results = []
+
+    def players():
+        check_response(client.get('/api/players'))
+
+    def cold_board():
+        board.invalidate()
+        statscout_app.http_cache.response_cache.clear()
+
+    results.append(run_case("GET /api/players (cold board)", players, max(3, iterations // 5), queries,
+                            setup=cold_board))
+    results.append(run_case("GET /api/players (warm)", players, iterations, queries))
+
+    etag = client.get('/api/players').headers['ETag']
+    results.append(run_case(
+        "GET /api/players (304)", lambda: client.get('/api/players', headers={'If-None-Match': etag}),
+        iterations, queries))
+
+    parlay_body = {"target_odds": 400, "safety_level": "moderate", "num_suggestions": 3, "seed": args.seed}
+    results.append(run_case(
+        "POST /api/parlay/generate", lambda: check_response(client.post('/api/parlay/generate', json=parlay_body)),
+        iterations, queries))
+
+    player_cycle = iter(names * (iterations + 1))
+    results.append(run_case(
+        "GET /api/player/<name>", lambda: check_response(client.get(f'/api/player/{next(player_cycle)}')),
+        iterations, queries))
+
+    history = loader.get_player_stat_history(names[0], 'points')
+    info = loader.get_player_info(names[0])
+    stat_window = loader.get_stat_window(names[0], 'points')
+
+    def analyze():
+        calc.analyze_player_prop(
+            player_name=names[0], team=info["team"], stat_type="Points", player_stats=history,
+            line=20.5, opponent=league["teams"][-1], opponent_rank=15, is_home=True, db_loader=loader,
+            stat_window=stat_window
+        )
+
+    results.append(run_case("calc.analyze_player_prop", analyze, iterations, queries))
+
+    return {
+        "config": vars(args),
+        "players": len(league["players"]),
+        "games": len(league["games"]),
+        "props": sum(len(m["outcomes"]) // 2 for e in events for b in e["bookmakers"] for m in b["markets"]),
+        "app_import_seconds": import_seconds,
+        "startup_queries": startup_queries,
+        "peak_rss_mb": peak_rss_mb(),
+        "results": results,
+    }
+
+
+def print_report(report, baseline=None):
+    """Print the results table (with % change vs a baseline report)"""
+    before = {r["name"]: r for r in baseline["results"]} if baseline else {}
+
+    print("\n" + "=" * 88)
+    print(f"STATSCOUT PIPELINE BENCHMARK - {report['players']} players, {report['games']} games, "
+          f"{report['props']} props")
+    print("=" * 88)
+    print(f"{'Case':34} {'p50 ms':>10} {'p95 ms':>10} {'mean ms':>10} {'queries':>9} {'vs base':>10}")
+    print("-" * 88)
+    for result in report["results"]:
+        change = ""
+        if result["name"] in before and before[result["name"]]["p50_ms"] > 0:
+            delta = (result["p50_ms"] / before[result["name"]]["p50_ms"] - 1) * 100
+            change = f"{delta:+.1f}%"
+        print(f"{result['name']:34} {result['p50_ms']:10.2f} {result['p95_ms']:10.2f} "
+              f"{result['mean_ms']:10.2f} {result['queries_per_call']:9.1f} {change:>10}")
+    print("-" * 88)
+    print(f"App import: {report['app_import_seconds']:.2f}s ({report['startup_queries']} queries)")
+    if report["peak_rss_mb"] is not None:
+        rss_line = f"Peak RSS: {report['peak_rss_mb']:.0f} MB"
+        if baseline and baseline.get("peak_rss_mb"):
+            rss_line += f" (base {baseline['peak_rss_mb']:.0f} MB)"
+        print(rss_line)
+    print("=" * 88)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the StatScout prop pipeline")
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--players-per-team", type=int, default=15)
+    parser.add_argument("--games", type=int, default=82)
+    parser.add_argument("--bookmakers", type=int, default=3, help="Bookmakers quoting each prop")
+    parser.add_argument("--injury-rate", type=float, default=0.05)
+    parser.add_argument("--odds-latency", type=float, default=0.0, help="Simulated seconds per Odds API request")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="Write the synthetic database here instead of a temp dir")
+    parser.add_argument("--save", help="Save results as JSON (for --compare later)")
+    parser.add_argument("--compare", help="JSON results from an earlier run to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    save_path = os.path.abspath(args.save) if args.save else None
+    report = run_benchmarks(args)
+    print_report(report, baseline)
+
+    if save_path:
+        with open(save_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Saved results to {save_path}")
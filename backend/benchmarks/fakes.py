@@ -0,0 +1,125 @@
+"""
+Local fakes for the external data sources
+Stand-ins for The Odds API, ESPN injuries and the schedule fetcher so the
+app can be benchmarked offline against a synthetic league
+
+Each fake subclasses the real client and only replaces the network call,
+so parsing and caching run the production code paths.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import espn_injury_tracker  # noqa: E402
+import nba_schedule_fetcher  # noqa: E402
+import odds_api  # noqa: E402
+
+INJURY_STATUSES = ["OUT", "QUESTIONABLE", "DAY-TO-DAY", "DOUBTFUL"]
+
+
+class FakeOddsAPIClient(odds_api.OddsAPIClient):
+    """Serves a synthetic slate in The Odds API response format"""
+
+    events = []     # Set by install_fakes()
+    latency = 0.0   # Simulated seconds per request
+
+    def __init__(self, api_key="synthetic", **kwargs):
+        super().__init__(api_key=api_key, **kwargs)
+        self.requests_remaining = 500
+        self.requests_used = 0
+
+    def _respond(self, data):
+        if self.latency:
+            time.sleep(self.latency)
+        self.requests_used += 1
+        return {"success": True, "data": data, "requests_remaining": self.requests_remaining}
+
+    def check_usage(self):
+        return {"success": True, "requests_remaining": self.requests_remaining, "requests_used": self.requests_used}
+
+    def get_events(self):
+        return self._respond([
+            {key: event[key] for key in ("id", "home_team", "away_team", "commence_time")}
+            for event in self.events
+        ])
+
+    def get_player_props(self, event_id, regions="us", markets="player_points,player_rebounds,player_assists", bookmakers=None):
+        wanted = set(markets.split(","))
+        for event in self.events:
+            if event["id"] == event_id:
+                return self._respond({
+                    **event,
+                    "bookmakers": [
+                        {"title": book["title"], "markets": [m for m in book["markets"] if m["key"] in wanted]}
+                        for book in event["bookmakers"]
+                    ],
+                })
+        return {"success": False, "error": f"Unknown event {event_id}"}
+
+
+class FakeInjuryTracker(espn_injury_tracker.ESPNInjuryTracker):
+    """ESPN tracker whose roster requests return a fixed synthetic report"""
+
+    injuries = {}   # {player_name: {"status", "team", "injury"}}, set by install_fakes()
+
+    def __init__(self, cache_file=None, **kwargs):
+        # No disk cache: every benchmark run starts from the same state
+        super().__init__(cache_file=None, **kwargs)
+
+    def _fetch_team_injuries(self, team_abbr, team_id):
+        return {name: dict(info) for name, info in self.injuries.items() if info["team"] == team_abbr}
+
+
+class FakeScheduleFetcher(nba_schedule_fetcher.NBAScheduleFetcher):
+    """Schedule fetcher reading the synthetic slate from FakeOddsAPIClient"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.odds_client = FakeOddsAPIClient()
+
+
+def synthetic_injuries(league, injury_rate=0.05, seed=None):
+    """
+    Pick a reproducible set of injured players
+
+    Args:
+        league: Dict from synthetic_league.generate_league()
+        injury_rate: Fraction of players on the report
+        seed: Random seed (default: the league's seed)
+
+    Returns:
+        Dict of {player_name: injury_info}
+    """
+    import random
+
+    rng = random.Random(league["seed"] if seed is None else seed)
+    injured = rng.sample(league["players"], int(len(league["players"]) * injury_rate))
+    return {
+        player["name"]: {
+            "status": rng.choice(INJURY_STATUSES),
+            "team": player["team"],
+            "injury": "Synthetic",
+        }
+        for player in injured
+    }
+
+
+def install_fakes(events, injuries, odds_latency=0.0):
+    """
+    Replace the real clients with fakes (call before importing app)
+
+    Args:
+        events: Odds API events from synthetic_league.build_odds_events()
+        injuries: Injury report from synthetic_injuries()
+        odds_latency: Simulated seconds per Odds API request
+    """
+    FakeOddsAPIClient.events = events
+    FakeOddsAPIClient.latency = odds_latency
+    FakeInjuryTracker.injuries = injuries
+
+    odds_api.OddsAPIClient = FakeOddsAPIClient
+    nba_schedule_fetcher.OddsAPIClient = FakeOddsAPIClient
+    nba_schedule_fetcher.NBAScheduleFetcher = FakeScheduleFetcher
+    espn_injury_tracker.ESPNInjuryTracker = FakeInjuryTracker
@@ -0,0 +1,260 @@
+"""
+Synthetic League Generator
+Builds a reproducible statscout database (players, game logs, team quarter
+scores) plus matching Odds API events for benchmarking
+
+Usage:
+    python benchmarks/synthetic_league.py --out /tmp/synthetic.db
+"""
+import argparse
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from espn_injury_tracker import NBA_TEAMS  # noqa: E402
+from nba_schedule_fetcher import TEAM_ABBREV_MAP  # noqa: E402
+from models import Game, Player, TeamGame, get_engine, get_session, init_db  # noqa: E402
+
+SEASON = "2025-26"
+SEASON_START = date(2025, 10, 21)
+
+POSITIONS = ["PG", "SG", "SF", "PF", "C"]
+
+# Odds API market -> Game column
+MARKETS = {
+    "player_points": "points",
+    "player_rebounds": "rebounds",
+    "player_assists": "assists",
+    "player_threes": "three_pm",
+    "player_steals": "steals",
+    "player_blocks": "blocks",
+}
+
+BOOKMAKERS = ["DraftKings", "FanDuel", "BetMGM", "Caesars", "BetRivers", "PointsBet"]
+
+
+def team_full_names():
+    """Map team abbreviations to the full names The Odds API uses"""
+    full_names = {}
+    for full_name, abbrev in TEAM_ABBREV_MAP.items():
+        full_names.setdefault(abbrev, full_name)
+    return full_names
+
+
+def generate_league(teams=30, players_per_team=15, games=82, seed=42):
+    """
+    Generate players, a season schedule and per-game box scores
+
+    Every team plays `games` games: each round the teams are shuffled and
+    paired, one round every other day.
+
+    Args:
+        teams: Number of teams (max 30, even)
+        players_per_team: Roster size per team
+        games: Games per team
+        seed: Random seed (same seed = same league)
+
+    Returns:
+        Dict with "players", "team_games", "games" and "teams"
+    """
+    rng = np.random.default_rng(seed)
+    team_abbrevs = sorted(NBA_TEAMS)[:teams]
+    if len(team_abbrevs) % 2:
+        team_abbrevs = team_abbrevs[:-1]
+
+    # Players with per-stat averages (starters get more minutes and stats)
+    players = []
+    for team in team_abbrevs:
+        for slot in range(players_per_team):
+            role = max(0.25, 1.0 - slot * 0.07)
+            players.append({
+                "name": f"{team} Player {slot + 1:02d}",
+                "team": team,
+                "position": POSITIONS[slot % len(POSITIONS)],
+                "minutes": 34.0 * role,
+                "means": {
+                    "points": rng.uniform(12, 28) * role,
+                    "rebounds": rng.uniform(3, 11) * role,
+                    "assists": rng.uniform(1, 8) * role,
+                    "steals": rng.uniform(0.4, 1.6) * role,
+                    "blocks": rng.uniform(0.2, 1.5) * role,
+                    "three_pm": rng.uniform(0.5, 3.5) * role,
+                },
+            })
+
+    roster = {team: [p for p in players if p["team"] == team] for team in team_abbrevs}
+
+    team_games = []
+    box_scores = []
+    for round_index in range(games):
+        game_date = SEASON_START + timedelta(days=round_index * 2)
+        order = rng.permutation(len(team_abbrevs))
+
+        for pair in range(0, len(order), 2):
+            home = team_abbrevs[order[pair]]
+            away = team_abbrevs[order[pair + 1]]
+            game_id = f"SYN{round_index:03d}{pair // 2:02d}"
+
+            quarters = {team: rng.integers(22, 34, size=4) for team in (home, away)}
+            totals = {team: int(q.sum()) for team, q in quarters.items()}
+            if totals[home] == totals[away]:
+                totals[home] += 2  # No ties (stand-in for overtime)
+
+            for team, opponent, is_home in ((home, away, True), (away, home, False)):
+                q = quarters[team]
+                team_games.append({
+                    "game_id": f"{game_id}_{team}",  # Same format as TeamQuarterFetcher
+                    "team": team,
+                    "opponent": opponent,
+                    "date": game_date,
+                    "is_home": is_home,
+                    "season": SEASON,
+                    "q1_points": int(q[0]),
+                    "q2_points": int(q[1]),
+                    "q3_points": int(q[2]),
+                    "q4_points": int(q[3]),
+                    "ot_points": totals[team] - int(q.sum()),
+                    "total_points": totals[team],
+                    "opponent_points": totals[opponent],
+                    "won": totals[team] > totals[opponent],
+                })
+
+                for player in roster[team]:
+                    stats = {stat: int(rng.poisson(mean)) for stat, mean in player["means"].items()}
+                    stats["three_pm"] = min(stats["three_pm"], stats["points"] // 3)
+                    q_points = rng.multinomial(stats["points"], [0.25] * 4)
+                    box_scores.append({
+                        "player_name": player["name"],
+                        "date": game_date,
+                        "opponent": opponent,
+                        "is_home": is_home,
+                        "minutes": round(float(rng.normal(player["minutes"], 3.0)), 1),
+                        "q1_points": int(q_points[0]),
+                        "q2_points": int(q_points[1]),
+                        "q3_points": int(q_points[2]),
+                        "q4_points": int(q_points[3]),
+                        **stats,
+                    })
+
+    return {
+        "teams": team_abbrevs,
+        "players": players,
+        "team_games": team_games,
+        "games": box_scores,
+        "seed": seed,
+    }
+
+
+def write_database(league, db_path):
+    """
+    Write a generated league to a fresh SQLite database
+
+    Args:
+        league: Dict from generate_league()
+        db_path: File path for the database (overwritten)
+
+    Returns:
+        SQLAlchemy URL of the database
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    url = f"sqlite:///{os.path.abspath(db_path)}"
+    engine = get_engine(url)
+    init_db(engine)
+    session = get_session(engine)
+
+    try:
+        session.bulk_insert_mappings(Player, [
+            {"name": p["name"], "team": p["team"], "position": p["position"]}
+            for p in league["players"]
+        ])
+        session.flush()
+        player_ids = dict(session.query(Player.name, Player.id).all())
+
+        rows = []
+        for game in league["games"]:
+            row = dict(game)
+            row["player_id"] = player_ids[row.pop("player_name")]
+            rows.append(row)
+        session.bulk_insert_mappings(Game, rows)
+        session.bulk_insert_mappings(TeamGame, league["team_games"])
+        session.commit()
+    finally:
+        session.close()
+        engine.dispose()
+
+    return url
+
+
+def build_odds_events(league, bookmakers=3, markets=None, days_ahead=1, seed=None):
+    """
+    Build an upcoming slate in The Odds API event format
+
+    Every team plays once; each player on the slate gets an Over/Under line
+    per market from each bookmaker.
+
+    Args:
+        league: Dict from generate_league()
+        bookmakers: Number of bookmakers quoting each prop
+        markets: Odds API market keys (default: all six)
+        days_ahead: Days from now until tip-off
+        seed: Random seed (default: the league's seed)
+
+    Returns:
+        List of event dicts (with "bookmakers" filled in)
+    """
+    rng = np.random.default_rng(league["seed"] if seed is None else seed)
+    markets = markets or list(MARKETS)
+    full_names = team_full_names()
+    teams = league["teams"]
+    tip_off = datetime.now(timezone.utc).replace(hour=23, minute=0, second=0, microsecond=0) + timedelta(days=days_ahead)
+
+    events = []
+    for index in range(0, len(teams) - 1, 2):
+        home, away = teams[index], teams[index + 1]
+        slate_players = [p for p in league["players"] if p["team"] in (home, away)]
+
+        event_bookmakers = []
+        for title in BOOKMAKERS[:bookmakers]:
+            event_markets = []
+            for market in markets:
+                stat = MARKETS[market]
+                outcomes = []
+                for player in slate_players:
+                    line = max(0.5, round(player["means"][stat] * 2) / 2 - 0.5 + float(rng.choice([0, 0.5, 1.0])))
+                    over = int(rng.integers(-135, -100))
+                    under = int(rng.choice([-115, -110, -105, 100, 105, 110]))
+                    outcomes.append({"name": "Over", "description": player["name"], "price": over, "point": line})
+                    outcomes.append({"name": "Under", "description": player["name"], "price": under, "point": line})
+                event_markets.append({"key": market, "outcomes": outcomes})
+            event_bookmakers.append({"title": title, "markets": event_markets})
+
+        events.append({
+            "id": f"synthetic-event-{index // 2:02d}",
+            "home_team": full_names.get(home, home),
+            "away_team": full_names.get(away, away),
+            "commence_time": (tip_off + timedelta(minutes=30 * (index // 2))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "bookmakers": event_bookmakers,
+        })
+
+    return events
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic statscout database")
+    parser.add_argument("--out", default="synthetic_statscout.db", help="Database file to write")
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--players-per-team", type=int, default=15)
+    parser.add_argument("--games", type=int, default=82)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    league = generate_league(args.teams, args.players_per_team, args.games, args.seed)
+    write_database(league, args.out)
+    print(f"[SUCCESS] Wrote {len(league['players'])} players, {len(league['games'])} games "
+          f"and {len(league['team_games'])} team games to {args.out}")
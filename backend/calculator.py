@@ -3,9 +3,18 @@ StatScout Calculator Module
 Handles all calculations for hit rates, trust scores, and player analytics
 """
 
-import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+
+def _round1(value):
+    """
+    Round to one decimal the way NumPy does
+
+    Used by both the scalar and batch paths so they produce identical scores.
+    Works on scalars and arrays.
+    """
+    return np.round(value, 1)
 
 
 class StatScoutCalculator:
@@ -34,6 +43,9 @@ class StatScoutCalculator:
         # Star player thresholds (points per game to be considered a "star")
         self.star_threshold_ppg = 20.0  # Players averaging 20+ PPG are "stars"
 
+        # (versions key, {team: {injured star: boost}}) - see get_teammate_boost_table
+        self._teammate_boosts = None
+
     def calculate_hit_rate(self, player_stats: List[float], line: float) -> float:
         """
         Calculate the percentage of games where player exceeded the line
@@ -50,7 +62,7 @@ class StatScoutCalculator:
 
         hits = sum(1 for stat in player_stats if stat > line)
         hit_rate = (hits / len(player_stats)) * 100
-        return round(hit_rate, 1)
+        return float(_round1(hit_rate))
 
     def calculate_recent_hit_rate(self, player_stats: List[float], line: float, recent_n: int = 10) -> Dict[str, Any]:
         """
@@ -75,12 +87,12 @@ class StatScoutCalculator:
         recent_hit_rate = (hits / total) * 100 if total > 0 else 0.0
 
         return {
-            "recent_hit_rate": round(recent_hit_rate, 1),
+            "recent_hit_rate": float(_round1(recent_hit_rate)),
             "hits": hits,
             "total": total
         }
     
-    def calculate_recent_form(self, player_stats: List[float], line: float, recent_n: int = 3) -> float:
+    def calculate_recent_form(self, player_stats: List[float], line: float, recent_n: int = 3, stat_window=None) -> float:
         """
         Calculate recent form score based on last N games
         
@@ -88,6 +100,7 @@ class StatScoutCalculator:
             player_stats: List of player's stat values (most recent last)
             line: The over/under betting line
             recent_n: Number of recent games to consider
+            stat_window: Optional StatWindow over the same history (see _window_for)
             
         Returns:
             Recent form score (0-100)
@@ -95,27 +108,49 @@ class StatScoutCalculator:
         if not player_stats or len(player_stats) < recent_n:
             return 50.0  # Neutral score if not enough data
         
-        recent_games = player_stats[-recent_n:]  # Last N games
-        
-        # Calculate average performance vs line in recent games
-        avg_recent = np.mean(recent_games)
-        diff_from_line = avg_recent - line
-        
-        # Convert to a 0-100 score
-        # If averaging 5+ points over line = 100, 5+ under = 0
-        percentage_diff = (diff_from_line / line) * 100
-        
-        # Map to 0-100 scale with 50 as neutral
-        if percentage_diff >= 20:
-            score = 100
-        elif percentage_diff <= -20:
-            score = 0
-        else:
-            # Linear scale: -20% = 0, 0% = 50, +20% = 100
-            score = 50 + (percentage_diff / 20) * 50
-        
-        return round(max(0, min(100, score)), 1)
-    
+        # Calculate average performance vs line in recent games (last N games)
+        avg_recent = self._last_n_mean(player_stats, recent_n, stat_window)
+
+        return float(self._recent_form_score(avg_recent, line))
+
+    def _window_for(self, player_stats, stat_window) -> bool:
+        """
+        Whether a rolling-window index can stand in for player_stats
+
+        The index (DatabaseLoader.get_stat_window) answers last-N sums in
+        constant time but only describes the stored history, so it's used
+        only when it covers the same number of games as the list passed in.
+        """
+        return stat_window is not None and stat_window.count == len(player_stats)
+
+    def _last_n_mean(self, player_stats, n, stat_window=None):
+        """Mean of the last n games (from the rolling-window index when it matches)"""
+        if self._window_for(player_stats, stat_window):
+            return np.float64(stat_window.mean(n))  # NumPy float, like np.mean (x/0 -> inf, not an error)
+        return np.mean(player_stats[-n:])
+
+    def _recent_form_score(self, avg_recent, line):
+        """
+        Convert recent average vs line into a 0-100 form score
+
+        Works on scalars and arrays (shared by the scalar and batch paths).
+        """
+        # If averaging 20%+ over line = 100, 20%+ under = 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage_diff = ((avg_recent - line) / line) * 100
+
+        # Linear scale: -20% = 0, 0% = 50, +20% = 100
+        score = np.where(
+            percentage_diff >= 20, 100.0,
+            np.where(percentage_diff <= -20, 0.0, 50 + (percentage_diff / 20) * 50)
+        )
+
+        # Clamp to 0-100 (same semantics as max(0, min(100, score)), including NaN -> 100)
+        score = np.where(score < 100, score, 100.0)
+        score = np.where(score > 0, score, 0.0)
+
+        return _round1(score)
+
     def calculate_opponent_difficulty(self, opponent_rank: int, total_teams: int = 30) -> float:
         """
         Calculate opponent difficulty score
@@ -133,7 +168,7 @@ class StatScoutCalculator:
         # Inverse rank - playing against #30 defense (worst) = 100, #1 defense (best) = 0
         difficulty_score = ((total_teams - opponent_rank) / (total_teams - 1)) * 100
         
-        return round(difficulty_score, 1)
+        return float(_round1(difficulty_score))
 
     def is_star_player(self, player_stats: List[float], stat_type: str) -> bool:
         """
@@ -168,6 +203,75 @@ class StatScoutCalculator:
         threshold = thresholds.get(stat_type.lower(), float('inf'))
         return avg_stat >= threshold
 
+    def build_teammate_boost_table(self, db_loader) -> Dict[str, Dict[str, float]]:
+        """
+        Work out which injured players are stars, once per injury report
+
+        When a star player is out, teammates get a boost because they'll absorb extra usage.
+        This was critical in cases like Jalen Brunson out → KAT 40pts, Tyler Kolek 20pts.
+
+        Only players who are OUT or DOUBTFUL and average star points count;
+        their contributions are grouped by team so each prop's boost is a
+        dict lookup (see calculate_teammate_boost).
+
+        Args:
+            db_loader: DatabaseLoader instance to check the injured players' stats
+
+        Returns:
+            Dictionary of {team: {injured star name: boost contribution}}
+        """
+        injuries = self.injury_tracker.get_all_injuries()
+        max_boost_per_player = 25.0  # Max +25 points per star player out
+
+        table = {}
+        for injured_player, injury_info in injuries.items():
+            # Only players who are actually OUT
+            if injury_info['status'] not in ['OUT', 'DOUBTFUL']:
+                continue
+
+            # Check if injured player is a star
+            try:
+                injured_stats = db_loader.get_player_stat_history(
+                    injured_player,
+                    'points',  # Use points to determine if they're a star
+                    num_games=15
+                )
+
+                if injured_stats and len(injured_stats) >= 5 and self.is_star_player(injured_stats, "points"):
+                    # Star player is out - boost their teammates' trust scores
+                    if injury_info['status'] == 'OUT':
+                        contribution = max_boost_per_player
+                    else:
+                        contribution = max_boost_per_player * 0.5  # Half boost for doubtful
+                    table.setdefault(injury_info['team'], {})[injured_player] = contribution
+                    print(f"  [Teammate Boost] {injured_player} ({injury_info['status']}) is out - boosting {injury_info['team']} teammates")
+            except Exception as e:
+                # If we can't get their stats, skip them
+                continue
+
+        return table
+
+    def get_teammate_boost_table(self, db_loader) -> Dict[str, Dict[str, float]]:
+        """
+        Teammate boost table for the current injury report and stats
+
+        Rebuilt only when the injury tracker or the game store has a new
+        version, so it's computed once per injury refresh rather than per prop.
+        """
+        injuries = self.injury_tracker.get_all_injuries()
+        key = (
+            getattr(self.injury_tracker, 'version', None), id(injuries),
+            getattr(getattr(db_loader, 'game_store', None), 'version', None)
+        )
+
+        cached = self._teammate_boosts
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        table = self.build_teammate_boost_table(db_loader)
+        self._teammate_boosts = (key, table)
+        return table
+
     def calculate_teammate_boost(
         self,
         player_name: str,
@@ -178,8 +282,8 @@ class StatScoutCalculator:
         """
         Calculate boost to trust score based on injured teammates
 
-        When a star player is out, teammates get a boost because they'll absorb extra usage.
-        This was critical in cases like Jalen Brunson out → KAT 40pts, Tyler Kolek 20pts.
+        Looks the player's team up in the teammate boost table
+        (get_teammate_boost_table), so it's cheap enough for every prop.
 
         Args:
             player_name: Name of player being analyzed
@@ -195,56 +299,17 @@ class StatScoutCalculator:
             return 50.0  # Neutral score
 
         try:
-            # Get all current injuries
-            injuries = self.injury_tracker.get_all_injuries()
-
-            # Find injured teammates on same team
-            injured_teammates = []
-            for injured_player, injury_info in injuries.items():
-                # Skip if it's the player being analyzed
-                if injured_player == player_name:
-                    continue
-
-                # Check if they're on the same team and actually OUT
-                if (injury_info['team'] == team and
-                    injury_info['status'] in ['OUT', 'DOUBTFUL']):
-                    injured_teammates.append({
-                        'name': injured_player,
-                        'status': injury_info['status'],
-                        'injury': injury_info['injury']
-                    })
+            injured_stars = self.get_teammate_boost_table(db_loader).get(team)
 
             # If no injured teammates, return neutral
-            if not injured_teammates:
+            if not injured_stars:
                 return 50.0
 
-            # Calculate boost based on injured teammates
-            boost_score = 50.0  # Start neutral
-            max_boost_per_player = 25.0  # Max +25 points per star player out
-
-            for teammate in injured_teammates:
-                # Check if injured teammate is a star
-                try:
-                    # Get the injured teammate's stats
-                    teammate_stats = db_loader.get_player_stat_history(
-                        teammate['name'],
-                        'points',  # Use points to determine if they're a star
-                        num_games=15
-                    )
-
-                    if teammate_stats and len(teammate_stats) >= 5:
-                        # Check if they're a star scorer
-                        if self.is_star_player(teammate_stats, "points"):
-                            # Star player is out - boost the trust score
-                            if teammate['status'] == 'OUT':
-                                boost_score += max_boost_per_player
-                            elif teammate['status'] == 'DOUBTFUL':
-                                boost_score += max_boost_per_player * 0.5  # Half boost for doubtful
-
-                            print(f"  [Teammate Boost] {teammate['name']} ({teammate['status']}) is out - boosting {player_name}'s trust score")
-                except Exception as e:
-                    # If we can't get teammate stats, skip them
-                    continue
+            # Start neutral and add every injured star except the player himself
+            boost_score = 50.0
+            for injured_player, contribution in injured_stars.items():
+                if injured_player != player_name:
+                    boost_score += contribution
 
             # Cap boost at 100
             return min(100.0, boost_score)
@@ -265,7 +330,8 @@ class StatScoutCalculator:
         db_loader=None,
         rest_days: int = None,
         usage_trend_data: Dict[str, Any] = None,
-        opponent: str = None
+        opponent: str = None,
+        stat_window=None
     ) -> float:
         """
         Calculate overall trust score for a player prop
@@ -282,15 +348,63 @@ class StatScoutCalculator:
             rest_days: Number of rest days (if None, will calculate from db_loader)
             usage_trend_data: Usage trend data (if None, will calculate from db_loader)
             opponent: Opponent team abbreviation (for pace calculation)
+            stat_window: Optional StatWindow over player_stats (for recent form and consistency)
 
         Returns:
             Trust score (0-100)
         """
         # Calculate component scores
         hit_rate = self.calculate_hit_rate(player_stats, line)
-        recent_form = self.calculate_recent_form(player_stats, line)
+        recent_form = self.calculate_recent_form(player_stats, line, stat_window=stat_window)
         opponent_diff = self.calculate_opponent_difficulty(opponent_rank)
 
+        # Teammate boost, rest, usage trend and opponent pace
+        context = self.calculate_context_scores(
+            player_name=player_name,
+            team=team,
+            stat_type=stat_type,
+            db_loader=db_loader,
+            rest_days=rest_days,
+            usage_trend_data=usage_trend_data,
+            opponent=opponent
+        )
+
+        # Calculate consistency factor
+        consistency_data = self.calculate_consistency_score(player_stats, stat_window=stat_window)
+        consistency_score = consistency_data["consistency_score"]
+
+        return float(self._combine_trust_score(
+            hit_rate, recent_form, opponent_diff,
+            context["teammate_boost"], context["rest_score"], context["usage_score"],
+            consistency_score, context["pace_score"], is_home
+        ))
+
+    def calculate_context_scores(
+        self,
+        player_name: str = None,
+        team: str = None,
+        stat_type: str = "Points",
+        db_loader=None,
+        rest_days: int = None,
+        usage_trend_data: Dict[str, Any] = None,
+        opponent: str = None
+    ) -> Dict[str, float]:
+        """
+        Calculate the trust score factors that don't depend on the line
+
+        Args:
+            player_name: Player's name (for teammate boost, rest and usage)
+            team: Player's team (for teammate boost calculation)
+            stat_type: Type of stat being analyzed
+            db_loader: DatabaseLoader instance (for teammate boost, rest, usage and pace)
+            rest_days: Number of rest days (if None, will calculate from db_loader)
+            usage_trend_data: Usage trend data (if None, will calculate from db_loader)
+            opponent: Opponent team abbreviation (for pace calculation)
+
+        Returns:
+            Dictionary with teammate_boost, rest_score, usage_score and pace_score
+            (each 0-100, 50 = neutral/unknown)
+        """
         # Calculate teammate injury boost if we have the required info
         teammate_boost = 50.0  # Default neutral
         if player_name and team and self.injury_tracker:
@@ -327,10 +441,6 @@ class StatScoutCalculator:
                 if usage_analysis["has_data"]:
                     usage_score = usage_analysis["usage_score"]
 
-        # Calculate consistency factor
-        consistency_data = self.calculate_consistency_score(player_stats)
-        consistency_score = consistency_data["consistency_score"]
-
         # Calculate opponent pace factor
         pace_score = 50.0  # Default neutral
         if opponent and db_loader:
@@ -338,6 +448,30 @@ class StatScoutCalculator:
             if pace_data and pace_data.get("has_pace_data"):
                 pace_score = pace_data["pace_score"]
 
+        return {
+            "teammate_boost": teammate_boost,
+            "rest_score": rest_score,
+            "usage_score": usage_score,
+            "pace_score": pace_score
+        }
+
+    def _combine_trust_score(
+        self,
+        hit_rate,
+        recent_form,
+        opponent_diff,
+        teammate_boost,
+        rest_score,
+        usage_score,
+        consistency_score,
+        pace_score,
+        is_home
+    ):
+        """
+        Weighted combination of the component scores into a trust score
+
+        Works on scalars and arrays (shared by the scalar and batch paths).
+        """
         # Adjust neutral defaults (50) to not penalize when data is unavailable
         # When factors default to 50 (unknown), treat them as slightly favorable (60)
         # Rationale: A player with 100% hit rate likely has positive unmeasured factors,
@@ -346,10 +480,10 @@ class StatScoutCalculator:
         NEUTRAL_BOOST = 60.0
 
         # Apply boost only to factors that are at exactly 50 (neutral/unknown)
-        adjusted_teammate = teammate_boost if teammate_boost != 50.0 else NEUTRAL_BOOST
-        adjusted_rest = rest_score if rest_score != 50.0 else NEUTRAL_BOOST
-        adjusted_usage = usage_score if usage_score != 50.0 else NEUTRAL_BOOST
-        adjusted_pace = pace_score if pace_score != 50.0 else NEUTRAL_BOOST
+        adjusted_teammate = np.where(teammate_boost != 50.0, teammate_boost, NEUTRAL_BOOST)
+        adjusted_rest = np.where(rest_score != 50.0, rest_score, NEUTRAL_BOOST)
+        adjusted_usage = np.where(usage_score != 50.0, usage_score, NEUTRAL_BOOST)
+        adjusted_pace = np.where(pace_score != 50.0, pace_score, NEUTRAL_BOOST)
 
         # Weighted average with all factors
         trust_score = (
@@ -364,10 +498,9 @@ class StatScoutCalculator:
         )
 
         # Home court advantage boost (+5 points if at home)
-        if is_home:
-            trust_score = min(100, trust_score + 5)
+        trust_score = np.where(is_home, np.minimum(100, trust_score + 5), trust_score)
 
-        return round(trust_score, 1)
+        return _round1(trust_score)
     
     def detect_streak(self, player_stats: List[float], line: float) -> Dict[str, Any]:
         """
@@ -419,7 +552,8 @@ class StatScoutCalculator:
         opponent: str,
         opponent_rank: int,
         is_home: bool = True,
-        db_loader=None
+        db_loader=None,
+        stat_window=None
     ) -> Dict[str, Any]:
         """
         Complete analysis of a player prop
@@ -434,6 +568,8 @@ class StatScoutCalculator:
             opponent_rank: Opponent's defensive rank
             is_home: Whether playing at home
             db_loader: DatabaseLoader instance for teammate boost calculation
+            stat_window: Optional StatWindow for player_stats (db_loader.get_stat_window),
+                         used for constant-time averages and consistency
 
         Returns:
             Complete analysis dictionary
@@ -443,14 +579,14 @@ class StatScoutCalculator:
         trust_score = self.calculate_trust_score(
             player_stats, line, opponent_rank, is_home,
             player_name=player_name, team=team, stat_type=stat_type, db_loader=db_loader,
-            opponent=opponent
+            opponent=opponent, stat_window=stat_window
         )
         streak_info = self.detect_streak(player_stats, line)
 
         # Calculate averages for different time ranges
-        avg_last_5 = round(np.mean(player_stats[-5:]), 1) if len(player_stats) >= 5 else None
-        avg_last_10 = round(np.mean(player_stats[-10:]), 1) if len(player_stats) >= 10 else None
-        avg_last_15 = round(np.mean(player_stats[-15:]), 1) if len(player_stats) >= 15 else None
+        avg_last_5 = float(_round1(self._last_n_mean(player_stats, 5, stat_window))) if len(player_stats) >= 5 else None
+        avg_last_10 = float(_round1(self._last_n_mean(player_stats, 10, stat_window))) if len(player_stats) >= 10 else None
+        avg_last_15 = float(_round1(self._last_n_mean(player_stats, 15, stat_window))) if len(player_stats) >= 15 else None
 
         # Determine recent form
         if trust_score >= 75:
@@ -490,6 +626,344 @@ class StatScoutCalculator:
             "last_15_games": player_stats[-15:] if len(player_stats) >= 15 else player_stats
         }
 
+    def build_stat_matrix(self, histories: List[List[float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pad stat histories into a matrix for analyze_props_batch
+
+        Rows are right-aligned so the most recent game is always in the last
+        column; missing older games are padded with NaN.
+
+        Args:
+            histories: List of stat value lists (most recent last)
+
+        Returns:
+            Tuple of (stat_matrix, lengths)
+        """
+        lengths = np.array([len(h) for h in histories], dtype=np.int64)
+        width = int(lengths.max()) if len(lengths) else 0
+
+        stat_matrix = np.full((len(histories), width), np.nan, dtype=np.float64)
+        for row, history in enumerate(histories):
+            if len(history):
+                stat_matrix[row, width - len(history):] = history
+
+        return stat_matrix, lengths
+
+    def analyze_props_batch(
+        self,
+        stat_matrix: np.ndarray,
+        lengths: np.ndarray,
+        lines: np.ndarray,
+        opponent_ranks: np.ndarray,
+        is_home: np.ndarray,
+        context_scores: Dict[str, np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Analyze many props at once in a single NumPy pass
+
+        Produces the same numbers as analyze_player_prop for every row.
+
+        Args:
+            stat_matrix: (props x games) matrix from build_stat_matrix
+            lengths: Number of real games in each row
+            lines: Betting line for each row
+            opponent_ranks: Opponent defensive rank for each row
+            is_home: Whether each row's game is at home
+            context_scores: Optional arrays from calculate_context_scores
+                            (teammate_boost, rest_score, usage_score, pace_score);
+                            missing factors default to neutral
+
+        Returns:
+            Dictionary of per-row arrays (hit_rate, recent_hit_rate, trust_score,
+            streak, averages, ...)
+        """
+        stat_matrix = np.asarray(stat_matrix, dtype=np.float64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        lines = np.asarray(lines, dtype=np.float64)
+        opponent_ranks = np.asarray(opponent_ranks)
+        is_home = np.asarray(is_home, dtype=bool)
+        num_props, width = stat_matrix.shape
+
+        # Column position from the end (0 = most recent game) and validity mask
+        games_back = np.arange(width)[::-1]
+        valid = games_back[None, :] < lengths[:, None]
+        values = np.where(valid, stat_matrix, 0.0)
+        over = (stat_matrix > lines[:, None]) & valid
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Season hit rate
+            hits = over.sum(axis=1)
+            hit_rate = _round1(np.where(lengths > 0, (hits / lengths) * 100, 0.0))
+            season_hits = np.floor((hit_rate / 100) * lengths).astype(np.int64)
+
+            # Recent hit rate (last 10 games)
+            recent_total = np.minimum(lengths, 10)
+            recent_hits = (over & (games_back[None, :] < 10)).sum(axis=1)
+            recent_hit_rate = _round1(np.where(recent_total > 0, (recent_hits / recent_total) * 100, 0.0))
+
+            # Recent form (last 3 games vs line)
+            if width >= 3:
+                avg_last_3 = ((values[:, -3] + values[:, -2]) + values[:, -1]) / 3
+            else:
+                avg_last_3 = np.zeros(num_props)
+            recent_form = np.where(lengths >= 3, self._recent_form_score(avg_last_3, lines), 50.0)
+
+            # Averages for different time ranges (NaN when not enough games)
+            averages = {}
+            for n in (5, 10, 15):
+                window_sum = values[:, -n:].sum(axis=1) if width >= n else np.zeros(num_props)
+                averages[n] = np.where(lengths >= n, _round1(window_sum / n), np.nan)
+
+            # Opponent difficulty
+            opponent_diff = np.where(
+                (opponent_ranks <= 0) | (opponent_ranks > 30),
+                50.0,
+                _round1(((30 - opponent_ranks) / 29) * 100)
+            )
+
+            # Consistency (needs 5+ games)
+            consistency, _, _, _ = self._consistency_from_moments(
+                lengths, values.sum(axis=1), (values * values).sum(axis=1)
+            )
+            consistency_score = np.where(lengths >= 5, consistency, 50.0)
+
+        # Line-independent context factors (neutral unless provided)
+        context_scores = context_scores or {}
+        neutral = np.full(num_props, 50.0)
+        trust_score = self._combine_trust_score(
+            hit_rate, recent_form, opponent_diff,
+            np.asarray(context_scores.get("teammate_boost", neutral), dtype=np.float64),
+            np.asarray(context_scores.get("rest_score", neutral), dtype=np.float64),
+            np.asarray(context_scores.get("usage_score", neutral), dtype=np.float64),
+            consistency_score,
+            np.asarray(context_scores.get("pace_score", neutral), dtype=np.float64),
+            is_home
+        )
+
+        # Streak: consecutive games from the most recent one on the same side of the line
+        if width:
+            same_side = (over == over[:, -1:]) & valid
+            streak = np.cumprod(same_side[:, ::-1], axis=1).sum(axis=1)
+            streak_over = over[:, -1]
+        else:
+            streak = np.zeros(num_props, dtype=np.int64)
+            streak_over = np.zeros(num_props, dtype=bool)
+        has_streak = (lengths >= 3) & (streak >= 3)
+        streak = np.where(has_streak, streak, 0)
+        streak_type = np.where(has_streak, np.where(streak_over, "over", "under"), None)
+
+        return {
+            "hit_rate": hit_rate,
+            "season_hits": season_hits,
+            "total_games": lengths,
+            "recent_hit_rate": recent_hit_rate,
+            "recent_hits": recent_hits,
+            "recent_total": recent_total,
+            "trust_score": trust_score,
+            "consistency_score": consistency_score,
+            "avg_last_5": averages[5],
+            "avg_last_10": averages[10],
+            "avg_last_15": averages[15],
+            "streak": streak,
+            "streak_type": streak_type
+        }
+
+    def analyze_props(
+        self,
+        props: List[Dict[str, Any]],
+        context_scores: Dict[str, np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Batch version of analyze_player_prop
+
+        Args:
+            props: List of dicts with player_name, team, stat_type, player_stats,
+                   line, opponent, opponent_rank and is_home
+            context_scores: Optional per-prop context arrays (see analyze_props_batch)
+
+        Returns:
+            List of analysis dictionaries, in the same format as analyze_player_prop
+        """
+        if not props:
+            return []
+
+        stat_matrix, lengths = self.build_stat_matrix([p["player_stats"] for p in props])
+        batch = self.analyze_props_batch(
+            stat_matrix,
+            lengths,
+            np.array([p["line"] for p in props], dtype=np.float64),
+            np.array([p["opponent_rank"] for p in props]),
+            np.array([p["is_home"] for p in props], dtype=bool),
+            context_scores=context_scores
+        )
+
+        # Convert to Python scalars once per column
+        columns = {
+            key: [None if v != v else v for v in values.tolist()] if key.startswith("avg_") else values.tolist()
+            for key, values in batch.items()
+        }
+
+        analyses = []
+        for i, prop in enumerate(props):
+            player_stats = prop["player_stats"]
+            trust_score = columns["trust_score"][i]
+
+            # Determine recent form
+            if trust_score >= 75:
+                recent_form = "hot"
+            elif trust_score <= 55:
+                recent_form = "cold"
+            else:
+                recent_form = "neutral"
+
+            analyses.append({
+                "player_name": prop["player_name"],
+                "team": prop["team"],
+                "stat_type": prop["stat_type"],
+                "line": prop["line"],
+                "hit_rate": columns["hit_rate"][i],
+                "season_hits": columns["season_hits"][i],
+                "total_games": columns["total_games"][i],
+                "recent_hit_rate": columns["recent_hit_rate"][i],
+                "recent_hits": columns["recent_hits"][i],
+                "recent_total": columns["recent_total"][i],
+                "trust_score": trust_score,
+                "recent_form": recent_form,
+                "opponent": prop["opponent"],
+                "opponent_rank": prop["opponent_rank"],
+                "is_home": prop["is_home"],
+                "avg_last_5": columns["avg_last_5"][i],
+                "avg_last_10": columns["avg_last_10"][i],
+                "avg_last_15": columns["avg_last_15"][i],
+                "streak": columns["streak"][i],
+                "streak_type": columns["streak_type"][i],
+                "last_games": player_stats[-10:] if len(player_stats) >= 10 else player_stats,
+                "last_5_games": player_stats[-5:] if len(player_stats) >= 5 else player_stats,
+                "last_15_games": player_stats[-15:] if len(player_stats) >= 15 else player_stats
+            })
+
+        return analyses
+
+    def analyze_line_ladder(
+        self,
+        player_stats: List[float],
+        lines: List[float],
+        opponent_rank: int,
+        is_home: bool = True,
+        context_scores: Dict[str, float] = None,
+        stat_window=None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate one prop at many alternate lines in a single pass
+
+        The history is sorted once; hit counts for every line then come from
+        np.searchsorted on the sorted values (and on the sorted last 10 games).
+        Streaks use the running min/max of the games counted back from the
+        latest one, which are monotonic, so they're binary searches too.
+        Everything that doesn't depend on the line (recent average,
+        consistency, context factors) is computed once.
+
+        Produces the same numbers as analyze_player_prop at each line.
+
+        Args:
+            player_stats: List of stat values (most recent last)
+            lines: Lines to evaluate
+            opponent_rank: Opponent's defensive rank
+            is_home: Whether playing at home
+            context_scores: Output of calculate_context_scores (teammate_boost,
+                            rest_score, usage_score, pace_score); neutral if None
+            stat_window: Optional StatWindow over player_stats (see _window_for)
+
+        Returns:
+            Dictionary with line-independent stats (total_games, averages,
+            consistency_score) and "ladder": one dict per line with hit_rate,
+            season_hits, recent_hit_rate, recent_hits, recent_total,
+            trust_score, recent_form, streak and streak_type
+        """
+        values = np.asarray(player_stats, dtype=np.float64)
+        lines = np.asarray(lines, dtype=np.float64)
+        total_games = len(values)
+        context_scores = context_scores or {}
+
+        # Over counts for every line: games strictly above the line
+        hits = total_games - np.searchsorted(np.sort(values), lines, side='right')
+        recent_values = values[-10:]
+        recent_total = len(recent_values)
+        recent_hits = recent_total - np.searchsorted(np.sort(recent_values), lines, side='right')
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hit_rate = _round1(np.where(total_games > 0, (hits / max(total_games, 1)) * 100, 0.0))
+            recent_hit_rate = _round1(np.where(recent_total > 0, (recent_hits / max(recent_total, 1)) * 100, 0.0))
+
+        # Recent form: last-3 average is line-independent, only the score varies
+        if total_games >= 3:
+            recent_form = self._recent_form_score(self._last_n_mean(player_stats, 3, stat_window), lines)
+        else:
+            recent_form = np.full(len(lines), 50.0)
+
+        opponent_diff = self.calculate_opponent_difficulty(opponent_rank)
+        consistency_score = self.calculate_consistency_score(player_stats, stat_window=stat_window)["consistency_score"]
+
+        trust_score = self._combine_trust_score(
+            hit_rate, recent_form, opponent_diff,
+            context_scores.get("teammate_boost", 50.0),
+            context_scores.get("rest_score", 50.0),
+            context_scores.get("usage_score", 50.0),
+            consistency_score,
+            context_scores.get("pace_score", 50.0),
+            is_home
+        )
+
+        # Streaks: the latest k games are all over the line while their minimum
+        # is above it (all under while their maximum is at or below it)
+        if total_games:
+            newest_first = values[::-1]
+            running_min = np.minimum.accumulate(newest_first)  # Non-increasing
+            running_max = np.maximum.accumulate(newest_first)  # Non-decreasing
+            over_streak = np.searchsorted(-running_min, -lines, side='left')
+            under_streak = np.searchsorted(running_max, lines, side='right')
+            latest_over = values[-1] > lines
+            streak = np.where(latest_over, over_streak, under_streak)
+        else:
+            latest_over = np.zeros(len(lines), dtype=bool)
+            streak = np.zeros(len(lines), dtype=np.int64)
+        has_streak = (total_games >= 3) & (streak >= 3)
+
+        ladder = []
+        for i, line in enumerate(lines.tolist()):
+            score = float(trust_score[i])
+            rate = float(hit_rate[i])
+
+            # Determine recent form
+            if score >= 75:
+                form = "hot"
+            elif score <= 55:
+                form = "cold"
+            else:
+                form = "neutral"
+
+            ladder.append({
+                "line": line,
+                "hit_rate": rate,
+                "season_hits": int((rate / 100) * total_games) if total_games > 0 else 0,
+                "recent_hit_rate": float(recent_hit_rate[i]),
+                "recent_hits": int(recent_hits[i]),
+                "recent_total": recent_total,
+                "trust_score": score,
+                "recent_form": form,
+                "streak": int(streak[i]) if has_streak[i] else 0,
+                "streak_type": ("over" if latest_over[i] else "under") if has_streak[i] else None
+            })
+
+        return {
+            "total_games": total_games,
+            "avg_last_5": float(_round1(self._last_n_mean(player_stats, 5, stat_window))) if total_games >= 5 else None,
+            "avg_last_10": float(_round1(self._last_n_mean(player_stats, 10, stat_window))) if total_games >= 10 else None,
+            "avg_last_15": float(_round1(self._last_n_mean(player_stats, 15, stat_window))) if total_games >= 15 else None,
+            "consistency_score": consistency_score,
+            "ladder": ladder
+        }
+
     def analyze_location_split(self, split_data: Dict[str, Any], is_home: bool, threshold: float = 3.0) -> Dict[str, Any]:
         """
         Analyze home/away split significance
@@ -534,7 +1008,7 @@ class StatScoutCalculator:
             "away_games": split_data["away_games"]
         }
 
-    def calculate_consistency_score(self, player_stats: List[float]) -> Dict[str, Any]:
+    def calculate_consistency_score(self, player_stats: List[float], stat_window=None) -> Dict[str, Any]:
         """
         Calculate player consistency score based on standard deviation
 
@@ -542,6 +1016,7 @@ class StatScoutCalculator:
 
         Args:
             player_stats: List of player's recent stat values
+            stat_window: Optional StatWindow over the same history (sums read from the index)
 
         Returns:
             Dictionary with consistency_score (0-100) and classification
@@ -553,45 +1028,68 @@ class StatScoutCalculator:
                 "classification": "Unknown"
             }
 
-        # Calculate mean and standard deviation
-        mean = np.mean(player_stats)
-        std_dev = np.std(player_stats)
-
-        # Calculate coefficient of variation (CV)
-        # Lower CV = more consistent
-        if mean > 0:
-            cv = (std_dev / mean) * 100
+        # Mean and standard deviation from the sum and sum of squares
+        if self._window_for(player_stats, stat_window):
+            n, sum_x, sum_x2 = stat_window.window(stat_window.count)
+            sum_x, sum_x2 = np.float64(sum_x), np.float64(sum_x2)
         else:
-            cv = 100  # Max variance if mean is 0
-
-        # Convert CV to 0-100 consistency score
-        # CV < 20% = very consistent (score 90-100)
-        # CV 20-40% = consistent (score 70-90)
-        # CV 40-60% = average (score 50-70)
-        # CV > 60% = volatile (score 0-50)
+            values = np.asarray(player_stats, dtype=np.float64)
+            n, sum_x, sum_x2 = len(values), values.sum(), (values * values).sum()
+        consistency_score, cv, std_dev, mean = self._consistency_from_moments(n, sum_x, sum_x2)
 
         if cv <= 20:
-            consistency_score = 100 - (cv / 20) * 10  # 90-100
             classification = "Very Consistent"
         elif cv <= 40:
-            consistency_score = 90 - ((cv - 20) / 20) * 20  # 70-90
             classification = "Consistent"
         elif cv <= 60:
-            consistency_score = 70 - ((cv - 40) / 20) * 20  # 50-70
             classification = "Average"
         else:
-            consistency_score = max(0, 50 - ((cv - 60) / 40) * 50)  # 0-50
             classification = "Volatile"
 
         return {
             "has_data": True,
-            "consistency_score": round(consistency_score, 1),
-            "coefficient_of_variation": round(cv, 1),
-            "std_dev": round(std_dev, 1),
-            "mean": round(mean, 1),
+            "consistency_score": float(consistency_score),
+            "coefficient_of_variation": float(_round1(cv)),
+            "std_dev": float(_round1(std_dev)),
+            "mean": float(_round1(mean)),
             "classification": classification
         }
 
+    def _consistency_from_moments(self, n, sum_x, sum_x2) -> Tuple:
+        """
+        Consistency score from game count, sum and sum of squares
+
+        Works on scalars and arrays (shared by the scalar and batch paths).
+        For integer stats the sums are exact, so both paths agree bit for bit.
+
+        Returns:
+            Tuple of (consistency_score, coefficient_of_variation, std_dev, mean)
+        """
+        mean = sum_x / n
+        std_dev = np.sqrt(np.maximum(sum_x2 / n - mean * mean, 0.0))
+
+        # Calculate coefficient of variation (CV)
+        # Lower CV = more consistent (max variance if mean is 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cv = np.where(mean > 0, (std_dev / mean) * 100, 100.0)
+
+        # Convert CV to 0-100 consistency score
+        # CV < 20% = very consistent (score 90-100)
+        # CV 20-40% = consistent (score 70-90)
+        # CV 40-60% = average (score 50-70)
+        # CV > 60% = volatile (score 0-50)
+        consistency_score = np.select(
+            [cv <= 20, cv <= 40, cv <= 60],
+            [
+                100 - (cv / 20) * 10,
+                90 - ((cv - 20) / 20) * 20,
+                70 - ((cv - 40) / 20) * 20
+            ],
+            np.maximum(0, 50 - ((cv - 60) / 40) * 50)
+        )
+
+        return _round1(consistency_score), cv, std_dev, mean
+
     def calculate_rest_factor(self, rest_days: int, is_back_to_back: bool) -> Dict[str, Any]:
         """
         Calculate impact of rest days on performance
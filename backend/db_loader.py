@@ -3,9 +3,23 @@ StatScout Database Data Loader
 Handles loading and processing player data from SQLite database
 """
 
-from models import get_engine, get_session, Player, Game
-from sqlalchemy import func, text
-from typing import Dict, List, Any
+from models import get_engine, get_session
+from game_store import GameStore, StatWindow, STAT_COLUMNS, COMBINED_STATS
+from sqlalchemy import text
+from typing import Dict, List, Any, Optional
+import numpy as np
+
+
+# Map stat type names (as used by the API) to game columns
+STAT_TYPE_MAP = {
+    'points': 'points',
+    'rebounds': 'rebounds',
+    'assists': 'assists',
+    'steals': 'steals',
+    'blocks': 'blocks',
+    'three_pm': 'three_pm',
+    '3pm': 'three_pm'
+}
 
 
 class DatabaseLoader:
@@ -16,6 +30,10 @@ class DatabaseLoader:
         self.engine = get_engine()
         self.session = get_session(self.engine)
 
+        # Columnar copy of the games table - all per-player accessors read from it
+        # (loaded on first use, so constructing the loader doesn't query)
+        self.game_store = GameStore(self.engine)
+
     def _ensure_session(self):
         """Ensure session is valid, rollback if needed"""
         try:
@@ -36,25 +54,11 @@ class DatabaseLoader:
 
     def get_player_names(self) -> List[str]:
         """Get list of all unique player names"""
-        self._ensure_session()
-        try:
-            players = self.session.query(Player.name).order_by(Player.name).all()
-            return [p.name for p in players]
-        except Exception as e:
-            print(f"[ERROR] Failed to get player names: {e}")
-            self.session.rollback()
-            return []
-    
+        return list(self.game_store.data.names)
+
     def get_teams(self) -> List[str]:
         """Get list of all unique teams"""
-        self._ensure_session()
-        try:
-            teams = self.session.query(Player.team).distinct().order_by(Player.team).all()
-            return [t.team for t in teams]
-        except Exception as e:
-            print(f"[ERROR] Failed to get teams: {e}")
-            self.session.rollback()
-            return []
+        return sorted(set(self.game_store.data.teams))
 
     def get_player_info(self, player_name: str) -> Dict[str, Any]:
         """
@@ -66,73 +70,61 @@ class DatabaseLoader:
         Returns:
             Dictionary with player info
         """
-        self._ensure_session()
-        try:
-            player = self.session.query(Player).filter(Player.name == player_name).first()
+        data = self.game_store.data
+        row = data.player_row(player_name)
 
-            if not player:
-                return None
+        if row is None:
+            return None
 
-            game_count = self.session.query(Game).filter(Game.player_id == player.id).count()
+        games = data.player_slice(player_name)
+        game_count = games.stop - games.start
 
-            # Calculate average minutes per game
-            avg_minutes_result = self.session.query(func.avg(Game.minutes)).filter(
-                Game.player_id == player.id,
-                Game.minutes.isnot(None)
-            ).scalar()
+        # Calculate average minutes per game (ignoring games without minutes data)
+        minutes = data.minutes[games]
+        minutes = minutes[~np.isnan(minutes)]
+        avg_minutes_result = float(minutes.sum()) / len(minutes) if len(minutes) else None
 
-            avg_minutes = round(avg_minutes_result, 1) if avg_minutes_result else 0.0
+        avg_minutes = round(avg_minutes_result, 1) if avg_minutes_result else 0.0
+
+        return {
+            "name": data.names[row],
+            "team": data.teams[row],
+            "position": data.positions[row],
+            "games_played": game_count,
+            "avg_minutes": avg_minutes
+        }
 
-            return {
-                "name": player.name,
-                "team": player.team,
-                "position": player.position,
-                "games_played": game_count,
-                "avg_minutes": avg_minutes
-            }
-        except Exception as e:
-            print(f"[ERROR] Failed to get player info for {player_name}: {e}")
-            self.session.rollback()
-            return None
-    
     def get_player_stat_history(
-        self, 
-        player_name: str, 
-        stat_column: str, 
+        self,
+        player_name: str,
+        stat_column: str,
         num_games: int = None
     ) -> List[float]:
         """
         Get a player's stat history
-        
+
         Args:
             player_name: Player's name
             stat_column: Stat column name (e.g., 'points', 'rebounds')
             num_games: Number of recent games to return (None = all games)
-            
+
         Returns:
             List of stat values (oldest to newest)
         """
-        player = self.session.query(Player).filter(Player.name == player_name).first()
-        
-        if not player:
+        data = self.game_store.data
+        games = data.player_slice(player_name)
+
+        if games is None:
             return []
-        
-        # Query games ordered by date
-        query = self.session.query(Game).filter(
-            Game.player_id == player.id
-        ).order_by(Game.date)
-        
-        games = query.all()
-        
-        # Extract the stat values
-        stat_values = [getattr(game, stat_column) for game in games]
-        
+
+        stat_values = data.stats[stat_column][games]
+
         # Return last N games if specified
         if num_games:
             stat_values = stat_values[-num_games:]
-        
-        return stat_values
-    
+
+        return stat_values.tolist()
+
     def get_combined_stat_history(
         self,
         player_name: str,
@@ -141,38 +133,31 @@ class DatabaseLoader:
     ) -> List[float]:
         """
         Get combined stat history (e.g., points + rebounds + assists)
-        
+
         Args:
             player_name: Player's name
             stat_columns: List of stat columns to combine
             num_games: Number of recent games
-            
+
         Returns:
             List of combined stat values
         """
-        player = self.session.query(Player).filter(Player.name == player_name).first()
-        
-        if not player:
+        data = self.game_store.data
+        games = data.player_slice(player_name)
+
+        if games is None:
             return []
-        
-        # Query games ordered by date
-        query = self.session.query(Game).filter(
-            Game.player_id == player.id
-        ).order_by(Game.date)
-        
-        games = query.all()
-        
+
         # Sum the specified columns for each game
-        combined = []
-        for game in games:
-            total = sum(getattr(game, col) for col in stat_columns)
-            combined.append(total)
-        
+        combined = np.zeros(games.stop - games.start, dtype=np.int64)
+        for col in stat_columns:
+            combined = combined + data.stats[col][games]
+
         if num_games:
             combined = combined[-num_games:]
-        
-        return combined
-    
+
+        return combined.tolist()
+
     def get_all_available_stats(self, player_name: str) -> Dict[str, List[float]]:
         """
         Get all stat types available for a player
@@ -183,31 +168,36 @@ class DatabaseLoader:
         Returns:
             Dictionary mapping stat names to value lists
         """
-        player = self.session.query(Player).filter(Player.name == player_name).first()
+        data = self.game_store.data
+        games = data.player_slice(player_name)
 
-        if not player:
+        if games is None:
             return {}
 
-        # Query all games for this player
-        games = self.session.query(Game).filter(
-            Game.player_id == player.id
-        ).order_by(Game.date).all()
-
+        # Individual stats followed by combined stats (PRA, PA, PR, RA)
         stats_dict = {}
+        for col in STAT_COLUMNS + list(COMBINED_STATS):
+            stats_dict[col] = data.stats[col][games].tolist()
 
-        # Individual stats
-        stat_columns = ['points', 'rebounds', 'assists', 'steals', 'blocks', 'three_pm']
+        return stats_dict
 
-        for col in stat_columns:
-            stats_dict[col] = [getattr(game, col) for game in games]
+    def get_stat_window(self, player_name: str, stat_column: str) -> Optional[StatWindow]:
+        """
+        Get the rolling-window index for one of a player's stats
 
-        # Combined stats
-        stats_dict['PRA'] = [game.points + game.rebounds + game.assists for game in games]
-        stats_dict['PA'] = [game.points + game.assists for game in games]
-        stats_dict['PR'] = [game.points + game.rebounds for game in games]
-        stats_dict['RA'] = [game.rebounds + game.assists for game in games]
+        Covers the same games as get_player_stat_history (or the combined
+        history for PRA/PA/PR/RA), so last-N sums, means and variances are
+        constant time.
 
-        return stats_dict
+        Args:
+            player_name: Player's name
+            stat_column: Stat column or combo name (e.g., 'points', 'PRA')
+
+        Returns:
+            StatWindow, or None if the player is unknown
+        """
+        window = self.game_store.data.rolling_window(player_name)
+        return window.stat(stat_column) if window is not None else None
 
     def get_matchup_history(self, player_name: str, opponent: str) -> Dict[str, Any]:
         """
@@ -220,18 +210,16 @@ class DatabaseLoader:
         Returns:
             Dictionary with matchup stats and game history
         """
-        player = self.session.query(Player).filter(Player.name == player_name).first()
+        data = self.game_store.data
+        games = data.player_slice(player_name)
 
-        if not player:
+        if games is None:
             return None
 
         # Get all games against this opponent
-        games = self.session.query(Game).filter(
-            Game.player_id == player.id,
-            Game.opponent == opponent
-        ).order_by(Game.date).all()
+        idx = np.arange(games.start, games.stop)[data.opponents[games] == opponent]
 
-        if not games:
+        if len(idx) == 0:
             return {
                 "player": player_name,
                 "opponent": opponent,
@@ -240,45 +228,45 @@ class DatabaseLoader:
                 "averages": {}
             }
 
-        # Calculate averages
-        total_points = sum(g.points for g in games)
-        total_rebounds = sum(g.rebounds for g in games)
-        total_assists = sum(g.assists for g in games)
-        total_steals = sum(g.steals for g in games)
-        total_blocks = sum(g.blocks for g in games)
-        total_three_pm = sum(g.three_pm for g in games)
+        columns = {col: data.stats[col][idx].tolist() for col in STAT_COLUMNS}
+        dates = data.dates[idx].astype(str).tolist()
+        is_home = data.is_home[idx].tolist()
+        minutes = data.minutes[idx].tolist()
 
-        games_count = len(games)
+        games_count = len(idx)
 
         # Build game history
         game_history = []
-        for game in games:
+        for i in range(games_count):
             game_history.append({
-                "date": game.date.strftime('%Y-%m-%d'),
-                "is_home": game.is_home,
-                "points": game.points,
-                "rebounds": game.rebounds,
-                "assists": game.assists,
-                "steals": game.steals,
-                "blocks": game.blocks,
-                "three_pm": game.three_pm,
-                "minutes": game.minutes,
-                "PRA": game.points + game.rebounds + game.assists
+                "date": dates[i],
+                "is_home": is_home[i],
+                "points": columns['points'][i],
+                "rebounds": columns['rebounds'][i],
+                "assists": columns['assists'][i],
+                "steals": columns['steals'][i],
+                "blocks": columns['blocks'][i],
+                "three_pm": columns['three_pm'][i],
+                "minutes": None if np.isnan(minutes[i]) else minutes[i],
+                "PRA": columns['points'][i] + columns['rebounds'][i] + columns['assists'][i]
             })
 
+        # Calculate averages
+        totals = {col: sum(values) for col, values in columns.items()}
+
         return {
             "player": player_name,
             "opponent": opponent,
             "games_played": games_count,
             "games": game_history,
             "averages": {
-                "points": round(total_points / games_count, 1),
-                "rebounds": round(total_rebounds / games_count, 1),
-                "assists": round(total_assists / games_count, 1),
-                "steals": round(total_steals / games_count, 1),
-                "blocks": round(total_blocks / games_count, 1),
-                "three_pm": round(total_three_pm / games_count, 1),
-                "PRA": round((total_points + total_rebounds + total_assists) / games_count, 1)
+                "points": round(totals['points'] / games_count, 1),
+                "rebounds": round(totals['rebounds'] / games_count, 1),
+                "assists": round(totals['assists'] / games_count, 1),
+                "steals": round(totals['steals'] / games_count, 1),
+                "blocks": round(totals['blocks'] / games_count, 1),
+                "three_pm": round(totals['three_pm'] / games_count, 1),
+                "PRA": round((totals['points'] + totals['rebounds'] + totals['assists']) / games_count, 1)
             }
         }
 
@@ -294,15 +282,13 @@ class DatabaseLoader:
         Returns:
             Dictionary with home/away averages and counts
         """
-        player = self.session.query(Player).filter(Player.name == player_name).first()
+        data = self.game_store.data
+        games = data.player_slice(player_name)
 
-        if not player:
+        if games is None:
             return None
 
-        # Get all games
-        all_games = self.session.query(Game).filter(Game.player_id == player.id).all()
-
-        if not all_games:
+        if games.stop == games.start:
             return {
                 "has_split": False,
                 "home_games": 0,
@@ -310,43 +296,31 @@ class DatabaseLoader:
             }
 
         # Separate home and away games
-        home_games = [g for g in all_games if g.is_home]
-        away_games = [g for g in all_games if not g.is_home]
+        is_home = data.is_home[games]
+        home_count = int(is_home.sum())
+        away_count = len(is_home) - home_count
 
         # Check minimum game requirement
-        if len(home_games) < min_games or len(away_games) < min_games:
+        if home_count < min_games or away_count < min_games:
             return {
                 "has_split": False,
-                "home_games": len(home_games),
-                "away_games": len(away_games),
+                "home_games": home_count,
+                "away_games": away_count,
                 "min_required": min_games
             }
 
-        # Map stat type to game attribute
-        stat_map = {
-            'points': 'points',
-            'rebounds': 'rebounds',
-            'assists': 'assists',
-            'steals': 'steals',
-            'blocks': 'blocks',
-            'three_pm': 'three_pm',
-            '3pm': 'three_pm'
-        }
-
-        stat_attr = stat_map.get(stat_type.lower(), 'points')
+        stat_attr = STAT_TYPE_MAP.get(stat_type.lower(), 'points')
 
         # Calculate averages
-        home_values = [getattr(g, stat_attr) for g in home_games]
-        away_values = [getattr(g, stat_attr) for g in away_games]
-
-        home_avg = sum(home_values) / len(home_values)
-        away_avg = sum(away_values) / len(away_values)
+        values = data.stats[stat_attr][games]
+        home_avg = int(values[is_home].sum()) / home_count
+        away_avg = int(values[~is_home].sum()) / away_count
         difference = home_avg - away_avg
 
         return {
             "has_split": True,
-            "home_games": len(home_games),
-            "away_games": len(away_games),
+            "home_games": home_count,
+            "away_games": away_count,
             "home_avg": round(home_avg, 1),
             "away_avg": round(away_avg, 1),
             "difference": round(difference, 1),
@@ -366,26 +340,21 @@ class DatabaseLoader:
         """
         from datetime import datetime, timedelta
 
-        player = self.session.query(Player).filter(Player.name == player_name).first()
+        data = self.game_store.data
+        games = data.player_slice(player_name)
 
-        if not player:
+        if games is None:
             return None
 
-        # Get all games sorted by date (most recent first)
-        games = self.session.query(Game).filter(
-            Game.player_id == player.id
-        ).order_by(Game.date.desc()).all()
-
-        if not games:
+        if games.stop == games.start:
             return {
                 "rest_days": None,
                 "last_game_date": None,
                 "is_back_to_back": False
             }
 
-        # Get the most recent game date
-        last_game = games[0]
-        last_game_date = last_game.date
+        # Get the most recent game date (games are sorted by date)
+        last_game_date = data.dates[games.stop - 1].astype(object)
 
         # Determine upcoming game date
         if upcoming_game_date:
@@ -423,52 +392,39 @@ class DatabaseLoader:
         Returns:
             Dictionary with trend direction, percentages, and significance
         """
-        player = self.session.query(Player).filter(Player.name == player_name).first()
+        window = self.game_store.data.rolling_window(player_name)
 
-        if not player:
+        if window is None:
             return None
 
-        # Get all games sorted by date (oldest first for proper baseline)
-        all_games = self.session.query(Game).filter(
-            Game.player_id == player.id
-        ).order_by(Game.date.asc()).all()
+        num_games = window.count
 
-        if len(all_games) < baseline_n:
+        if num_games < baseline_n:
             return {
                 "has_trend": False,
-                "reason": f"Not enough games (need {baseline_n}, have {len(all_games)})"
+                "reason": f"Not enough games (need {baseline_n}, have {num_games})"
             }
 
-        # Map stat type to game attribute
-        stat_map = {
-            'points': 'points',
-            'rebounds': 'rebounds',
-            'assists': 'assists',
-            'steals': 'steals',
-            'blocks': 'blocks',
-            'three_pm': 'three_pm',
-            '3pm': 'three_pm'
-        }
+        stat_attr = STAT_TYPE_MAP.get(stat_type.lower(), 'points')
 
-        stat_attr = stat_map.get(stat_type.lower(), 'points')
+        # Recent games, and the games before them up to baseline_n in total
+        # (constant time from the rolling-window index)
+        recent_count, recent_sum, _ = window.window(stat_attr, recent_n)
+        baseline_count, baseline_sum, _ = window.window(stat_attr, baseline_n - recent_n, skip=recent_n)
 
-        # Get recent games and baseline games
-        recent_games = all_games[-recent_n:]
-        baseline_games = all_games[-baseline_n:-recent_n] if len(all_games) > baseline_n else all_games[:-recent_n]
-
-        if not baseline_games:
+        if baseline_count == 0:
             # If not enough for split, use all except recent as baseline
-            baseline_games = all_games[:-recent_n]
+            baseline_count, baseline_sum, _ = window.window(stat_attr, num_games, skip=recent_n)
 
-        if not baseline_games:
+        if baseline_count == 0:
             return {
                 "has_trend": False,
                 "reason": "Not enough games for baseline comparison"
             }
 
         # Calculate averages
-        recent_avg = sum(getattr(g, stat_attr) for g in recent_games) / len(recent_games)
-        baseline_avg = sum(getattr(g, stat_attr) for g in baseline_games) / len(baseline_games)
+        recent_avg = recent_sum / recent_count
+        baseline_avg = baseline_sum / baseline_count
 
         # Calculate percentage change
         if baseline_avg > 0:
@@ -489,7 +445,7 @@ class DatabaseLoader:
             "pct_change": round(pct_change, 1),
             "is_significant": is_significant,
             "recent_games": recent_n,
-            "baseline_games": len(baseline_games)
+            "baseline_games": baseline_count
         }
 
     def get_team_pace_rating(self, team_abbrev: str, min_games: int = 10) -> Dict[str, Any]:
@@ -505,28 +461,22 @@ class DatabaseLoader:
         Returns:
             Dictionary with pace_rating, games_analyzed, and classification
         """
+        data = self.game_store.data
+
         # Get all games where this team was the opponent
-        opponent_games = self.session.query(Game).filter(
-            Game.opponent == team_abbrev
-        ).all()
+        # (We don't store opponent score, so we estimate from the player's points)
+        opponent_points = data.stats['points'][data.opponents == team_abbrev]
 
-        if len(opponent_games) < min_games:
+        if len(opponent_points) < min_games:
             return {
                 "has_pace_data": False,
-                "reason": f"Not enough games (need {min_games}, have {len(opponent_games)})",
+                "reason": f"Not enough games (need {min_games}, have {len(opponent_points)})",
                 "pace_score": 50.0  # Neutral default
             }
 
-        # Calculate average total points in games involving this team
-        # High-scoring games typically mean faster pace
-        total_points = []
-        for game in opponent_games:
-            # Sum player's points + estimate opponent's points
-            # (We don't store opponent score, so we estimate from game context)
-            total_points.append(game.points)
-
         # Average points scored against this team
-        avg_points_allowed = sum(total_points) / len(total_points)
+        # High-scoring games typically mean faster pace
+        avg_points_allowed = int(opponent_points.sum()) / len(opponent_points)
 
         # NBA average is around 110-115 points per team per game
         # Fast teams (105+ pace): Allow 115+ PPG
@@ -557,7 +507,7 @@ class DatabaseLoader:
             "pace_score": pace_score,
             "classification": classification,
             "avg_points_allowed": round(avg_points_allowed, 1),
-            "games_analyzed": len(opponent_games)
+            "games_analyzed": len(opponent_points)
         }
 
     def get_half_tendency(self, player_name: str, stat_type: str = 'points', min_games: int = 10) -> Dict[str, Any]:
@@ -572,37 +522,25 @@ class DatabaseLoader:
         Returns:
             Dictionary with half splits and tendencies
         """
-        player = self.session.query(Player).filter(Player.name == player_name).first()
+        data = self.game_store.data
+        games = data.player_slice(player_name)
 
-        if not player:
+        if games is None:
             return None
 
-        # Get all games
-        all_games = self.session.query(Game).filter(
-            Game.player_id == player.id
-        ).order_by(Game.date.desc()).all()
+        num_games = games.stop - games.start
 
-        if len(all_games) < min_games:
+        if num_games < min_games:
             return {
                 "has_data": False,
-                "reason": f"Not enough games (need {min_games}, have {len(all_games)})"
+                "reason": f"Not enough games (need {min_games}, have {num_games})"
             }
 
-        # Map stat type to game attribute
-        stat_map = {
-            'points': 'points',
-            'rebounds': 'rebounds',
-            'assists': 'assists',
-            'steals': 'steals',
-            'blocks': 'blocks',
-            'three_pm': 'three_pm',
-            '3pm': 'three_pm'
-        }
-
-        stat_attr = stat_map.get(stat_type.lower(), 'points')
+        stat_attr = STAT_TYPE_MAP.get(stat_type.lower(), 'points')
+        values = data.stats[stat_attr][games]
 
         # Calculate season average
-        season_avg = sum(getattr(g, stat_attr) for g in all_games) / len(all_games)
+        season_avg = int(values.sum()) / num_games
 
         # Estimate first half vs second half
         # Research shows first half is typically 48% of total production
@@ -615,10 +553,10 @@ class DatabaseLoader:
 
         # Analyze variance - do they start slow or strong?
         # Look at games where they exceeded their average
-        above_avg_games = [g for g in all_games if getattr(g, stat_attr) > season_avg]
+        above_avg_games = int((values > season_avg).sum())
 
         # If player frequently exceeds average, they likely have strong finishes
-        strong_finisher = len(above_avg_games) / len(all_games) > 0.5
+        strong_finisher = above_avg_games / num_games > 0.5
 
         return {
             "has_data": True,
@@ -628,7 +566,7 @@ class DatabaseLoader:
             "first_half_pct": first_half_pct,
             "second_half_pct": second_half_pct,
             "strong_finisher": strong_finisher,
-            "games_analyzed": len(all_games)
+            "games_analyzed": num_games
         }
 
     def get_live_projection(
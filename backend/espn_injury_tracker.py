@@ -4,107 +4,252 @@ Fetches injury data from ESPN's public NBA injury API
 More reliable than NBA API for injury status
 """
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import time
+import json
+import os
+import threading
+import rate_limiter
+
+# All 30 NBA teams with their ESPN team IDs
+NBA_TEAMS = {
+    'ATL': 1, 'BOS': 2, 'BKN': 17, 'CHA': 30, 'CHI': 4,
+    'CLE': 5, 'DAL': 6, 'DEN': 7, 'DET': 8, 'GSW': 9,
+    'HOU': 10, 'IND': 11, 'LAC': 12, 'LAL': 13, 'MEM': 29,
+    'MIA': 14, 'MIL': 15, 'MIN': 16, 'NOP': 3, 'NYK': 18,
+    'OKC': 25, 'ORL': 19, 'PHI': 20, 'PHX': 21, 'POR': 22,
+    'SAC': 23, 'SAS': 24, 'TOR': 28, 'UTA': 26, 'WAS': 27
+}
+
+# Parallel roster requests during a sweep
+MAX_WORKERS = 10
+
 
 class ESPNInjuryTracker:
-    def __init__(self):
+    def __init__(self, cache_file="espn_injury_cache.json", max_workers=MAX_WORKERS, fetch_on_read=True,
+                 shared_cache=None):
+        """
+        Args:
+            cache_file: JSON file for warm starts (None = no disk cache)
+            max_workers: Parallel roster requests during a sweep
+            fetch_on_read: When False, reads never start a sweep (a scheduler job refreshes instead)
+            shared_cache: Optional shared_cache.SharedValue; sweeps are published
+                          to it and reads pick up sweeps made by other workers
+        """
         self.cache = {}
         self.cache_timeout = timedelta(hours=2)  # Refresh every 2 hours
         self.last_fetch = None
+        self.version = 0  # Bumped whenever the cached injury report is replaced
         self.espn_base_url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams"
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+        # When False, reads never start a sweep (a scheduler job refreshes instead)
+        self.fetch_on_read = fetch_on_read
+
+        # One pooled session so the 30 roster requests reuse connections
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
+
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+
+        # Warm start from the last sweep saved on disk (survives restarts)
+        cached_injuries, last_fetch = self.load_cache()
+        if cached_injuries is not None:
+            self.cache = cached_injuries
+            self.last_fetch = last_fetch
+            self.version += 1
+            print(f"[Injury Tracker] Loaded {len(cached_injuries)} cached injuries from {last_fetch}")
+
+        # A report already published by another worker wins if it's newer
+        self.shared_cache = shared_cache
+        self._sync_shared(force=True)
+
+    def _sync_shared(self, force=False):
+        """Adopt a newer injury report published by another worker"""
+        if self.shared_cache is None or not self.shared_cache.sync(force=force):
+            return
+
+        shared = self.shared_cache.value or {}
+        last_fetch = datetime.fromisoformat(shared['last_fetch']) if shared.get('last_fetch') else None
+        if last_fetch is None or (self.last_fetch is not None and last_fetch <= self.last_fetch):
+            return
+
+        self.cache = shared.get('injuries', {})
+        self.last_fetch = last_fetch
+        self.version += 1
+
+    def load_cache(self):
+        """Load cached injury data from file"""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return None, None
+
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache_data = json.load(f)
+                last_fetch = datetime.fromisoformat(cache_data['last_fetch'])
+                injuries = cache_data['injuries']
+                return injuries, last_fetch
+        except:
+            return None, None
+
+    def save_cache(self, injuries, last_fetch):
+        """Save injury data to cache file"""
+        if not self.cache_file:
+            return
+
+        cache_data = {
+            'last_fetch': last_fetch.isoformat(),
+            'injuries': injuries
+        }
+        try:
+            # Write then rename so other workers never read a partial file
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(cache_data, f, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            print(f"  [Warning] Could not save injury cache: {e}")
+
+    def is_stale(self):
+        """Check whether the cached injury report needs a refresh"""
+        self._sync_shared()
+        if self.last_fetch is None:
+            return True
+        return datetime.now() - self.last_fetch >= self.cache_timeout
 
     def get_all_injuries(self):
         """
-        Fetch injury data from ESPN team-by-team API
-        This queries all 30 NBA teams to get league-wide injuries
+        Get league-wide injury data
         Returns dict: {player_name: {"status": str, "team": str, "injury": str}}
+
+        Never waits on ESPN: if the cache is stale, the current (possibly
+        empty) cache is returned and a refresh runs in the background
+        (unless fetch_on_read is off).
+        """
+        self._sync_shared()
+        if self.fetch_on_read and self.is_stale():
+            self.refresh_in_background()
+        return self.cache
+
+    def refresh_in_background(self):
+        """Start a background sweep unless one is already running"""
+        with self._refresh_lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self.refresh, daemon=True)
+            self._refresh_thread.start()
+
+    def _fetch_team_injuries(self, team_abbr, team_id):
         """
-        # Check cache first - CRITICAL: Don't fetch on every call!
-        if self.last_fetch is not None:
-            time_since_fetch = datetime.now() - self.last_fetch
-            if time_since_fetch < self.cache_timeout:
-                # Silently use cache - don't spam logs
-                return self.cache
+        Fetch injured players from one team's roster
 
-        print("[Injury Tracker] Fetching fresh injury data from all 30 NBA teams...")
+        Returns:
+            Dict of {player_name: injury_info} for the team
 
-        # All 30 NBA teams with their ESPN team IDs
-        nba_teams = {
-            'ATL': 1, 'BOS': 2, 'BKN': 17, 'CHA': 30, 'CHI': 4,
-            'CLE': 5, 'DAL': 6, 'DEN': 7, 'DET': 8, 'GSW': 9,
-            'HOU': 10, 'IND': 11, 'LAC': 12, 'LAL': 13, 'MEM': 29,
-            'MIA': 14, 'MIL': 15, 'MIN': 16, 'NOP': 3, 'NYK': 18,
-            'OKC': 25, 'ORL': 19, 'PHI': 20, 'PHX': 21, 'POR': 22,
-            'SAC': 23, 'SAS': 24, 'TOR': 28, 'UTA': 26, 'WAS': 27
-        }
+        Raises:
+            Exception: If the roster request failed
+        """
+        # Use roster endpoint to get all players and their injury status
+        url = f"{self.espn_base_url}/{team_id}/roster"
+        response = rate_limiter.get(url, session=self.session, timeout=10)
+
+        if response.status_code != 200:
+            raise Exception(f"API returned {response.status_code}")
 
+        team_data = response.json()
         injuries = {}
 
-        try:
-            # Query each team's roster/injury data
-            for team_abbr, team_id in nba_teams.items():
-                try:
-                    # Use roster endpoint to get all players and their injury status
-                    url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams/{team_id}/roster"
-                    response = requests.get(url, timeout=10)
-
-                    if response.status_code != 200:
-                        print(f"  [Warning] {team_abbr} API returned {response.status_code}")
-                        continue
-
-                    team_data = response.json()
-
-                    # Parse roster for injuries
-                    roster = team_data.get('athletes', [])
-                    for athlete in roster:
-                        # Check if athlete has injury info
-                        injuries_list = athlete.get('injuries', [])
-                        if injuries_list and len(injuries_list) > 0:
-                            # Player is injured - get most recent injury
-                            injury = injuries_list[0]
-
-                            player_name = athlete.get('displayName', 'Unknown')
-                            status = injury.get('status', 'UNKNOWN')
-
-                            # Normalize status to match our expected values
-                            # ESPN uses: "Out", "Day-To-Day", "Questionable", etc.
-                            if 'out' in status.lower():
-                                status = 'OUT'
-                            elif 'questionable' in status.lower():
-                                status = 'QUESTIONABLE'
-                            elif 'doubtful' in status.lower():
-                                status = 'DOUBTFUL'
-                            elif 'day-to-day' in status.lower():
-                                status = 'DAY-TO-DAY'
-                            else:
-                                status = status.upper()
-
-                            # Try to get injury type from athlete details (may not be available)
-                            injury_type = injury.get('longComment', '') or injury.get('shortComment', '') or 'Injury'
-
-                            injuries[player_name] = {
-                                'status': status,
-                                'team': team_abbr,
-                                'injury': injury_type,
-                                'last_updated': datetime.now().isoformat()
-                            }
-                            print(f"  [Injury] {player_name} ({team_abbr}): {status}")
-
-                    # Small delay to avoid rate limiting
-                    time.sleep(0.05)
-
-                except Exception as e:
-                    print(f"  [Warning] Error fetching {team_abbr} injuries: {e}")
-                    continue  # Skip this team and move to next
+        # Parse roster for injuries
+        roster = team_data.get('athletes', [])
+        for athlete in roster:
+            # Check if athlete has injury info
+            injuries_list = athlete.get('injuries', [])
+            if injuries_list and len(injuries_list) > 0:
+                # Player is injured - get most recent injury
+                injury = injuries_list[0]
+
+                player_name = athlete.get('displayName', 'Unknown')
+                status = injury.get('status', 'UNKNOWN')
+
+                # Normalize status to match our expected values
+                # ESPN uses: "Out", "Day-To-Day", "Questionable", etc.
+                if 'out' in status.lower():
+                    status = 'OUT'
+                elif 'questionable' in status.lower():
+                    status = 'QUESTIONABLE'
+                elif 'doubtful' in status.lower():
+                    status = 'DOUBTFUL'
+                elif 'day-to-day' in status.lower():
+                    status = 'DAY-TO-DAY'
+                else:
+                    status = status.upper()
+
+                # Try to get injury type from athlete details (may not be available)
+                injury_type = injury.get('longComment', '') or injury.get('shortComment', '') or 'Injury'
+
+                injuries[player_name] = {
+                    'status': status,
+                    'team': team_abbr,
+                    'injury': injury_type,
+                    'last_updated': datetime.now().isoformat()
+                }
 
-        except Exception as e:
-            print(f"[Error] Failed to fetch ESPN injury data: {e}")
-            return self.cache if self.cache else {}
+        return injuries
+
+    def refresh(self):
+        """
+        Sweep all 30 team rosters in parallel and replace the cache
+
+        Teams whose request fails keep their previous entries, so a single
+        flaky request doesn't mark that team's injured players as active.
+
+        Returns:
+            The injury dict now in the cache
+        """
+        print("[Injury Tracker] Fetching fresh injury data from all 30 NBA teams...")
+
+        def fetch(team):
+            try:
+                return team, self._fetch_team_injuries(team, NBA_TEAMS[team]), None
+            except Exception as e:
+                return team, None, e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(fetch, NBA_TEAMS))
 
-        # Update cache
+        failed_teams = [team for team, _, error in results if error is not None]
+        for team, _, error in results:
+            if error is not None:
+                print(f"  [Warning] Error fetching {team} injuries: {error}")
+
+        if len(failed_teams) == len(NBA_TEAMS):
+            print("[Error] Failed to fetch ESPN injury data (all teams failed)")
+            return self.cache
+
+        injuries = {}
+        for team, team_injuries, error in results:
+            if error is None:
+                injuries.update(team_injuries)
+            else:
+                # Keep the last known injuries for teams we couldn't reach
+                injuries.update({
+                    name: info for name, info in self.cache.items()
+                    if info.get('team') == team
+                })
+
+        # Update cache (swap in the new dict so readers see a complete report)
+        last_fetch = datetime.now()
         self.cache = injuries
-        self.last_fetch = datetime.now()
+        self.last_fetch = last_fetch
+        self.version += 1
+        self.save_cache(injuries, last_fetch)
+        if self.shared_cache is not None:
+            try:
+                self.shared_cache.publish({'injuries': injuries, 'last_fetch': last_fetch.isoformat()})
+            except Exception as e:
+                print(f"  [Warning] Could not publish injury report: {e}")
 
         print(f"[Injury Tracker] Found {len(injuries)} injured players league-wide")
         return injuries
@@ -151,13 +296,14 @@ class ESPNInjuryTracker:
         """Force refresh on next call"""
         self.cache = {}
         self.last_fetch = None
+        self.version += 1
 
     def refresh_nba_data(self):
         """
         Force refresh of injury data (for compatibility with old API)
+        Waits for the sweep to finish, unlike get_all_injuries()
         """
-        self.clear_cache()
-        return self.get_all_injuries()
+        return self.refresh()
 
     def set_manual_status(self, player_name, status):
         """
@@ -178,7 +324,7 @@ if __name__ == "__main__":
     print("ESPN INJURY TRACKER TEST")
     print("=" * 60)
 
-    injuries = tracker.get_all_injuries()
+    injuries = tracker.refresh()
 
     print(f"\nTotal injured players: {len(injuries)}")
     print("\nAll current injuries:")
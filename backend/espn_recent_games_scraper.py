@@ -5,10 +5,15 @@ Used as a fallback when nba_api data lags behind
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import rate_limiter
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-import time
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Set, Tuple
+
+# Box scores fetched in parallel (requests still share the ESPN rate budget)
+MAX_WORKERS = 8
 
 
 class ESPNRecentGamesScraper:
@@ -82,7 +87,7 @@ class ESPNRecentGamesScraper:
         try:
             # Get team schedule
             url = f"{self.base_url}/nba/team/schedule/_/name/{team.lower()}/id/{team_id}"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = rate_limiter.get(url, headers=self.headers, timeout=10)
 
             if response.status_code != 200:
                 print(f"[ESPN] Failed to fetch schedule for {team}")
@@ -142,8 +147,18 @@ class ESPNAPIClient:
         'BOS': 'BOS',
     }
 
-    def __init__(self):
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        """
+        Args:
+            max_workers: Box scores fetched in parallel (the ESPN rate budget still applies)
+        """
         self.base_url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba"
+        self.max_workers = max_workers
+
+        # One pooled session (keep-alive) shared by every request and thread
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
 
     def normalize_team_abbrev(self, abbrev: str) -> str:
         """Normalize team abbreviation to NBA API standard format"""
@@ -161,7 +176,7 @@ class ESPNAPIClient:
         """
         try:
             url = f"{self.base_url}/scoreboard?dates={date_str}"
-            response = requests.get(url, timeout=10)
+            response = rate_limiter.get(url, session=self.session, timeout=10)
 
             if response.status_code == 200:
                 return response.json()
@@ -173,23 +188,17 @@ class ESPNAPIClient:
 
     def get_recent_scoreboards(self, days_back: int = 7) -> List[Dict]:
         """Get scoreboards for last N days"""
-        scoreboards = []
         today = datetime.now()
+        dates = [(today - timedelta(days=i)).strftime("%Y%m%d") for i in range(days_back)]
 
-        for i in range(days_back):
-            date = today - timedelta(days=i)
-            date_str = date.strftime("%Y%m%d")
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(dates) or 1)) as executor:
+            results = list(executor.map(self.get_scoreboard, dates))
 
-            scoreboard = self.get_scoreboard(date_str)
-            if scoreboard and 'events' in scoreboard:
-                scoreboards.append({
-                    'date': date_str,
-                    'games': scoreboard['events']
-                })
-
-            time.sleep(0.5)  # Rate limiting
-
-        return scoreboards
+        return [
+            {'date': date_str, 'games': scoreboard['events']}
+            for date_str, scoreboard in zip(dates, results)
+            if scoreboard and 'events' in scoreboard
+        ]
 
 
     def get_game_box_score(self, game_id: str) -> Dict:
@@ -204,7 +213,7 @@ class ESPNAPIClient:
         """
         try:
             url = f"{self.base_url}/summary?event={game_id}"
-            response = requests.get(url, timeout=10)
+            response = rate_limiter.get(url, session=self.session, timeout=10)
 
             if response.status_code == 200:
                 return response.json()
@@ -214,132 +223,200 @@ class ESPNAPIClient:
             print(f"[ESPN API] Error fetching box score: {e}")
             return {}
 
-    def get_player_stats_from_date(self, date_str: str) -> List[Dict]:
+    @staticmethod
+    def is_final(event: Dict) -> bool:
+        """Whether a scoreboard event is a finished game"""
+        return bool(event.get('status', {}).get('type', {}).get('completed'))
+
+    def parse_box_score(self, box_score: Dict, date_str: str) -> List[Dict]:
         """
-        Get all player stats from games on a specific date
+        Extract player stat lines from a game's box score
 
         Args:
-            date_str: Date in YYYYMMDD format
+            box_score: /summary response for the game
+            date_str: Game date in YYYYMMDD format
 
         Returns:
-            List of player game stats
+            List of player game stats (players who recorded points, rebounds or assists)
         """
-        try:
-            # First get the scoreboard to find games
-            scoreboard = self.get_scoreboard(date_str)
+        player_stats = []
+        game_date = datetime.strptime(date_str, "%Y%m%d").strftime("%Y-%m-%d")
 
-            if not scoreboard or 'events' not in scoreboard:
-                return []
+        # Extract player stats from box score
+        box_score_data = box_score.get('boxscore', {})
+        players = box_score_data.get('players', [])
 
-            all_player_stats = []
-            games = scoreboard['events']
+        # Find opponent teams from header
+        header = box_score.get('header', {})
+        competitions = header.get('competitions', [{}])
+        if not competitions:
+            return []
+
+        competitors = competitions[0].get('competitors', [])
+        home_team = next((c['team']['abbreviation'] for c in competitors if c.get('homeAway') == 'home'), '')
+        away_team = next((c['team']['abbreviation'] for c in competitors if c.get('homeAway') == 'away'), '')
+
+        for team_data in players:
+            team = team_data.get('team', {})
+            team_abbrev = team.get('abbreviation', '')
+
+            is_home = team_abbrev == home_team
+            opponent = away_team if is_home else home_team
+
+            # Get the statistics section
+            statistics = team_data.get('statistics', [])
+            if not statistics:
+                continue
+
+            stat_section = statistics[0]  # First section has the player stats
+
+            # Get stat labels to map indices
+            labels = stat_section.get('labels', [])
+            # Create index map
+            label_map = {label: idx for idx, label in enumerate(labels)}
 
-            print(f"[ESPN] Fetching box scores for {len(games)} games on {date_str}...")
+            # Get indices for our stats
+            pts_idx = label_map.get('PTS', 1)
+            reb_idx = label_map.get('REB', 5)
+            ast_idx = label_map.get('AST', 6)
+            stl_idx = label_map.get('STL', 8)
+            blk_idx = label_map.get('BLK', 9)
+            three_pt_idx = label_map.get('3PT', 3)
 
-            for event in games:
-                game_id = event.get('id', '')
-                if not game_id:
+            # Parse each player
+            athletes = stat_section.get('athletes', [])
+
+            for athlete_data in athletes:
+                athlete = athlete_data.get('athlete', {})
+                player_name = athlete.get('displayName', '')
+
+                # Skip if player didn't play
+                if athlete_data.get('didNotPlay'):
                     continue
 
-                # Get detailed box score
-                box_score = self.get_game_box_score(game_id)
-                time.sleep(0.5)  # Rate limiting
+                # Get the stats array
+                stats = athlete_data.get('stats', [])
+                if not stats:
+                    continue
 
-                if not box_score:
+                # ESPN stats format: ['MIN', 'PTS', 'FG', '3PT', 'FT', 'REB', 'AST', 'TO', 'STL', 'BLK', ...]
+                try:
+                    points = int(stats[pts_idx]) if pts_idx < len(stats) and stats[pts_idx] != '--' else 0
+                    rebounds = int(stats[reb_idx]) if reb_idx < len(stats) and stats[reb_idx] != '--' else 0
+                    assists = int(stats[ast_idx]) if ast_idx < len(stats) and stats[ast_idx] != '--' else 0
+                    steals = int(stats[stl_idx]) if stl_idx < len(stats) and stats[stl_idx] != '--' else 0
+                    blocks = int(stats[blk_idx]) if blk_idx < len(stats) and stats[blk_idx] != '--' else 0
+
+                    # 3PM - extract from 3PT stat (format: "made-attempted")
+                    three_pm = 0
+                    if three_pt_idx < len(stats) and stats[three_pt_idx] != '--':
+                        three_pt_str = str(stats[three_pt_idx])
+                        if '-' in three_pt_str:
+                            three_pm = int(three_pt_str.split('-')[0])
+
+                except (ValueError, IndexError) as e:
+                    print(f"[ESPN] Error parsing stats for {player_name}: {e}")
                     continue
 
-                # Extract player stats from box score
-                box_score_data = box_score.get('boxscore', {})
-                players = box_score_data.get('players', [])
+                # Only add if player actually played
+                if points > 0 or rebounds > 0 or assists > 0:
+                    player_stats.append({
+                        'player_name': player_name,
+                        'team': self.normalize_team_abbrev(team_abbrev),
+                        'date': game_date,
+                        'opponent': self.normalize_team_abbrev(opponent),
+                        'is_home': is_home,
+                        'points': points,
+                        'rebounds': rebounds,
+                        'assists': assists,
+                        'steals': steals,
+                        'blocks': blocks,
+                        'three_pm': three_pm
+                    })
+
+        return player_stats
+
+    def iter_box_scores(
+        self,
+        dates: List[str],
+        skip_event_ids: Optional[Set[str]] = None,
+        final_only: bool = True
+    ) -> Iterator[Tuple[str, str, List[Dict]]]:
+        """
+        Fetch and parse every game's box score across a date range concurrently
+
+        Scoreboards for all dates are fetched in parallel, then every event's
+        box score goes into one bounded pool, so a week of games is fetched
+        as a single batch rather than date by date. Results are yielded as
+        they complete (not in date order).
 
-                # Find opponent teams from header
-                header = box_score.get('header', {})
-                competitions = header.get('competitions', [{}])
-                if not competitions:
+        Args:
+            dates: Dates in YYYYMMDD format
+            skip_event_ids: ESPN event IDs to leave out (e.g. already ingested)
+            final_only: Only fetch finished games (an in-progress box score
+                        would be stored as the player's final line)
+
+        Yields:
+            Tuples of (event_id, date_str, player_stats); box scores that
+            couldn't be fetched are skipped, and player_stats is empty when
+            one had no stat lines to parse
+        """
+        skip_event_ids = skip_event_ids or set()
+        if not dates:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(dates))) as executor:
+            scoreboards = list(executor.map(self.get_scoreboard, dates))
+
+        events = []
+        for date_str, scoreboard in zip(dates, scoreboards):
+            for event in (scoreboard or {}).get('events', []):
+                event_id = event.get('id', '')
+                if not event_id or event_id in skip_event_ids:
+                    continue
+                if final_only and not self.is_final(event):
+                    continue
+                events.append((event_id, date_str))
+
+        if not events:
+            return
+
+        print(f"[ESPN] Fetching {len(events)} box scores across {len(dates)} days "
+              f"({self.max_workers} workers)...")
+
+        def fetch(event):
+            event_id, date_str = event
+            box_score = self.get_game_box_score(event_id)
+            if not box_score:
+                return event_id, date_str, None
+            return event_id, date_str, self.parse_box_score(box_score, date_str)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(events))) as executor:
+            futures = [executor.submit(fetch, event) for event in events]
+            for future in as_completed(futures):
+                try:
+                    event_id, date_str, player_stats = future.result()
+                except Exception as e:
+                    print(f"[ESPN API] Error parsing box score: {e}")
+                    continue
+                if player_stats is None:
                     continue
+                yield event_id, date_str, player_stats
 
-                competitors = competitions[0].get('competitors', [])
-                home_team = next((c['team']['abbreviation'] for c in competitors if c.get('homeAway') == 'home'), '')
-                away_team = next((c['team']['abbreviation'] for c in competitors if c.get('homeAway') == 'away'), '')
-
-                for team_data in players:
-                    team = team_data.get('team', {})
-                    team_abbrev = team.get('abbreviation', '')
-
-                    is_home = team_abbrev == home_team
-                    opponent = away_team if is_home else home_team
-
-                    # Get the statistics section
-                    statistics = team_data.get('statistics', [])
-                    if not statistics:
-                        continue
-
-                    stat_section = statistics[0]  # First section has the player stats
-
-                    # Get stat labels to map indices
-                    labels = stat_section.get('labels', [])
-                    # Create index map
-                    label_map = {label: idx for idx, label in enumerate(labels)}
-
-                    # Get indices for our stats
-                    pts_idx = label_map.get('PTS', 1)
-                    reb_idx = label_map.get('REB', 5)
-                    ast_idx = label_map.get('AST', 6)
-                    stl_idx = label_map.get('STL', 8)
-                    blk_idx = label_map.get('BLK', 9)
-                    three_pt_idx = label_map.get('3PT', 3)
-
-                    # Parse each player
-                    athletes = stat_section.get('athletes', [])
-
-                    for athlete_data in athletes:
-                        athlete = athlete_data.get('athlete', {})
-                        player_name = athlete.get('displayName', '')
-
-                        # Skip if player didn't play
-                        if athlete_data.get('didNotPlay'):
-                            continue
-
-                        # Get the stats array
-                        stats = athlete_data.get('stats', [])
-                        if not stats:
-                            continue
-
-                        # ESPN stats format: ['MIN', 'PTS', 'FG', '3PT', 'FT', 'REB', 'AST', 'TO', 'STL', 'BLK', ...]
-                        try:
-                            points = int(stats[pts_idx]) if pts_idx < len(stats) and stats[pts_idx] != '--' else 0
-                            rebounds = int(stats[reb_idx]) if reb_idx < len(stats) and stats[reb_idx] != '--' else 0
-                            assists = int(stats[ast_idx]) if ast_idx < len(stats) and stats[ast_idx] != '--' else 0
-                            steals = int(stats[stl_idx]) if stl_idx < len(stats) and stats[stl_idx] != '--' else 0
-                            blocks = int(stats[blk_idx]) if blk_idx < len(stats) and stats[blk_idx] != '--' else 0
-
-                            # 3PM - extract from 3PT stat (format: "made-attempted")
-                            three_pm = 0
-                            if three_pt_idx < len(stats) and stats[three_pt_idx] != '--':
-                                three_pt_str = str(stats[three_pt_idx])
-                                if '-' in three_pt_str:
-                                    three_pm = int(three_pt_str.split('-')[0])
-
-                        except (ValueError, IndexError) as e:
-                            print(f"[ESPN] Error parsing stats for {player_name}: {e}")
-                            continue
-
-                        # Only add if player actually played
-                        if points > 0 or rebounds > 0 or assists > 0:
-                            all_player_stats.append({
-                                'player_name': player_name,
-                                'team': self.normalize_team_abbrev(team_abbrev),
-                                'date': datetime.strptime(date_str, "%Y%m%d").strftime("%Y-%m-%d"),
-                                'opponent': self.normalize_team_abbrev(opponent),
-                                'is_home': is_home,
-                                'points': points,
-                                'rebounds': rebounds,
-                                'assists': assists,
-                                'steals': steals,
-                                'blocks': blocks,
-                                'three_pm': three_pm
-                            })
+    def get_player_stats_from_date(self, date_str: str) -> List[Dict]:
+        """
+        Get all player stats from games on a specific date
+
+        Args:
+            date_str: Date in YYYYMMDD format
 
+        Returns:
+            List of player game stats
+        """
+        try:
+            all_player_stats = []
+            for _, _, player_stats in self.iter_box_scores([date_str], final_only=False):
+                all_player_stats.extend(player_stats)
             return all_player_stats
 
         except Exception as e:
@@ -0,0 +1,506 @@
+"""
+StatScout Game Store
+Columnar in-memory copy of the games table for fast per-player lookups
+
+The whole games table is loaded in one scan at startup into NumPy arrays
+(one per column), sorted by player and date. Each player owns a contiguous
+slice described by an offset/length pair, so every DatabaseLoader accessor
+becomes an array slice instead of an ORM query.
+"""
+
+import copy
+import threading
+import time
+import weakref
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from models import Player, Game
+
+
+# Raw stat columns kept as integer arrays
+STAT_COLUMNS = ['points', 'rebounds', 'assists', 'steals', 'blocks', 'three_pm']
+
+# Combined stats exposed alongside the raw columns
+COMBINED_STATS = {
+    'PRA': ['points', 'rebounds', 'assists'],
+    'PA': ['points', 'assists'],
+    'PR': ['points', 'rebounds'],
+    'RA': ['rebounds', 'assists'],
+}
+
+# Stats covered by the rolling-window index (raw columns, then combos)
+ROLLING_STATS = STAT_COLUMNS + list(COMBINED_STATS)
+
+# Seconds between first-load attempts after a failure (e.g. database briefly unreachable)
+LOAD_RETRY_SECONDS = 10.0
+_ROLLING_INDEX = {stat: i for i, stat in enumerate(ROLLING_STATS)}
+
+# Every live store, so ingestion jobs can refresh them after committing
+_stores = weakref.WeakSet()
+
+# Shared "games changed" marker, so other worker processes reload too
+_games_marker = None
+
+
+def _get_games_marker():
+    global _games_marker
+    if _games_marker is None:
+        from shared_cache import SharedValue
+        _games_marker = SharedValue("games")
+    return _games_marker
+
+
+class RollingWindow:
+    """
+    Prefix sums and prefix sums of squares of one player's stats
+
+    Row k of the prefix table holds the totals of the player's first k games
+    for every stat in ROLLING_STATS, so the sum, mean or variance of any run
+    of consecutive games (last N, or N games before the last M) is two row
+    lookups. Stats are integers, so the sums are exact.
+
+    Windows are immutable once published: extended() returns a new window,
+    sharing the prefix table with this one when there's spare room at the end.
+    """
+
+    def __init__(self, prefix: np.ndarray, count: int):
+        """
+        Args:
+            prefix: (capacity + 1) x 2*len(ROLLING_STATS) int64 table; sums in the
+                    first half of the columns, sums of squares in the second
+            count: Number of games filled in (rows 0..count are valid)
+        """
+        self._prefix = prefix
+        self.count = count
+        # Rows filled in the shared table (only the newest window may extend in place)
+        self._filled = [count]
+
+    def extended(self, values: np.ndarray) -> 'RollingWindow':
+        """
+        Window with more games appended (amortized O(1) per game)
+
+        Args:
+            values: (new games x len(ROLLING_STATS)) int64 matrix, oldest first
+
+        Returns:
+            New RollingWindow; this one is unchanged
+        """
+        new_count = self.count + len(values)
+        prefix = self._prefix
+
+        if new_count >= len(prefix) or self._filled[0] != self.count:
+            # Out of room (or another window already extended this table): grow by doubling
+            prefix = np.zeros((max(2 * len(prefix), new_count + 1), prefix.shape[1]), dtype=np.int64)
+            prefix[:self.count + 1] = self._prefix[:self.count + 1]
+
+        width = len(ROLLING_STATS)
+        last = prefix[self.count]
+        prefix[self.count + 1:new_count + 1, :width] = last[:width] + np.cumsum(values, axis=0)
+        prefix[self.count + 1:new_count + 1, width:] = last[width:] + np.cumsum(values * values, axis=0)
+
+        window = RollingWindow(prefix, new_count)
+        if prefix is self._prefix:
+            # Share the fill marker so older windows know the table moved on
+            self._filled[0] = new_count
+            window._filled = self._filled
+        return window
+
+    def window(self, stat: str, n: int, skip: int = 0) -> tuple:
+        """
+        Totals of up to n consecutive games ending `skip` games before the latest
+
+        Args:
+            stat: Stat name from ROLLING_STATS
+            n: Games in the window (clipped to the games available)
+            skip: Most recent games to leave out (0 = window ends with the latest game)
+
+        Returns:
+            Tuple of (games, sum, sum of squares) as Python ints
+        """
+        column = _ROLLING_INDEX[stat]
+        end = max(self.count - skip, 0)
+        start = max(end - max(n, 0), 0)
+        upper = self._prefix[end]
+        lower = self._prefix[start]
+        width = len(ROLLING_STATS)
+        return (
+            end - start,
+            int(upper[column] - lower[column]),
+            int(upper[width + column] - lower[width + column])
+        )
+
+    def mean(self, stat: str, n: int, skip: int = 0) -> Optional[float]:
+        """Mean of a window (see window()), or None if it has no games"""
+        games, total, _ = self.window(stat, n, skip)
+        return total / games if games else None
+
+    def variance(self, stat: str, n: int, skip: int = 0) -> Optional[float]:
+        """Population variance of a window (see window()), or None if it has no games"""
+        games, total, total_sq = self.window(stat, n, skip)
+        if not games:
+            return None
+        mean = total / games
+        return max(total_sq / games - mean * mean, 0.0)
+
+    def stat(self, stat: str) -> 'StatWindow':
+        """View of this window for a single stat"""
+        return StatWindow(self, stat)
+
+
+class StatWindow:
+    """One stat's view of a RollingWindow (what the calculator is handed)"""
+
+    __slots__ = ('rolling', 'stat')
+
+    def __init__(self, rolling: RollingWindow, stat: str):
+        self.rolling = rolling
+        self.stat = stat
+
+    @property
+    def count(self) -> int:
+        """Number of games in the history"""
+        return self.rolling.count
+
+    def window(self, n: int, skip: int = 0) -> tuple:
+        """(games, sum, sum of squares) of up to n games ending `skip` games before the latest"""
+        return self.rolling.window(self.stat, n, skip)
+
+    def mean(self, n: int, skip: int = 0) -> Optional[float]:
+        """Mean of a window, or None if it has no games"""
+        return self.rolling.mean(self.stat, n, skip)
+
+    def variance(self, n: int, skip: int = 0) -> Optional[float]:
+        """Population variance of a window, or None if it has no games"""
+        return self.rolling.variance(self.stat, n, skip)
+
+
+class GameColumns:
+    """Immutable columnar snapshot of the players and games tables"""
+
+    def __init__(self, players: List[tuple], games: List[tuple], version: int):
+        """
+        Build the snapshot from raw rows
+
+        Args:
+            players: (id, name, team, position) rows ordered by name
+            games: (player_id, date, opponent, is_home, minutes, *STAT_COLUMNS)
+                   rows ordered by player_id, date, id
+            version: Version number of this snapshot
+        """
+        self.version = version
+
+        # Player metadata (kept in name order, like Player queries ordered by name)
+        self.player_ids = [p[0] for p in players]
+        self.row_by_player_id = {player_id: idx for idx, player_id in enumerate(self.player_ids)}
+        self.names = [p[1] for p in players]
+        self.teams = [p[2] for p in players]
+        self.positions = [p[3] for p in players]
+        self.name_index = {name: idx for idx, name in enumerate(self.names)}
+
+        n_games = len(games)
+        columns = list(zip(*games)) if games else [()] * (5 + len(STAT_COLUMNS))
+
+        game_player_ids = np.array(columns[0], dtype=np.int64)
+        self.dates = np.array(columns[1], dtype='datetime64[D]') if n_games else np.array([], dtype='datetime64[D]')
+        self.opponents = np.array(columns[2], dtype=object)
+        self.is_home = np.array(columns[3], dtype=bool)
+        self.minutes = np.array(
+            [np.nan if m is None else m for m in columns[4]], dtype=np.float64
+        )
+        self.stats = {
+            col: np.array(columns[5 + i], dtype=np.int64)
+            for i, col in enumerate(STAT_COLUMNS)
+        }
+        for combo, parts in COMBINED_STATS.items():
+            self.stats[combo] = sum(self.stats[p] for p in parts) if n_games else np.array([], dtype=np.int64)
+
+        # Per-player offset/length index into the game arrays
+        self.offsets = np.zeros(len(players), dtype=np.int64)
+        self.lengths = np.zeros(len(players), dtype=np.int64)
+
+        if n_games:
+            # Games are sorted by player_id, so each player's rows are contiguous
+            boundaries = np.flatnonzero(np.diff(game_player_ids)) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [n_games]))
+
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                row = self.row_by_player_id.get(int(game_player_ids[start]))
+                if row is None:
+                    continue  # Orphaned games (no matching player)
+                self.offsets[row] = start
+                self.lengths[row] = end - start
+
+        # Rolling-window index: one prefix table per player, cut from a single
+        # cumulative sum over all games
+        width = len(ROLLING_STATS)
+        values = np.column_stack([self.stats[stat] for stat in ROLLING_STATS]) if n_games \
+            else np.zeros((0, width), dtype=np.int64)
+        totals = np.zeros((n_games + 1, 2 * width), dtype=np.int64)
+        np.cumsum(values, axis=0, out=totals[1:, :width])
+        np.cumsum(values * values, axis=0, out=totals[1:, width:])
+
+        self.rolling = []
+        for start, length in zip(self.offsets.tolist(), self.lengths.tolist()):
+            prefix = totals[start:start + length + 1] - totals[start]
+            self.rolling.append(RollingWindow(prefix, length))
+
+    def player_slice(self, player_name: str) -> Optional[slice]:
+        """Get the slice of game rows for a player, or None if unknown"""
+        row = self.name_index.get(player_name)
+        if row is None:
+            return None
+        start = int(self.offsets[row])
+        return slice(start, start + int(self.lengths[row]))
+
+    def player_row(self, player_name: str) -> Optional[int]:
+        """Get the player's row in the metadata arrays, or None if unknown"""
+        return self.name_index.get(player_name)
+
+    def rolling_window(self, player_name: str) -> Optional[RollingWindow]:
+        """Get the player's rolling-window index, or None if unknown"""
+        row = self.name_index.get(player_name)
+        return None if row is None else self.rolling[row]
+
+    def with_games(self, games: List[dict], version: int) -> Optional['GameColumns']:
+        """
+        Build a new snapshot with games appended to their players' histories
+
+        Only the appended rows are processed (no database scan): the column
+        arrays get the new rows inserted at the end of each player's slice,
+        offsets are shifted past the insert points and only the affected
+        players' rolling windows are extended. This snapshot is unchanged.
+
+        Args:
+            games: Dicts with player_id, date, opponent, is_home, minutes and
+                   the STAT_COLUMNS values (as written to the games table)
+            version: Version number of the new snapshot
+
+        Returns:
+            The new snapshot, or None if a game can't be appended (unknown
+            player, or not newer than the player's latest stored game) and a
+            full reload is needed
+        """
+        by_row = {}
+        for game in games:
+            row = self.row_by_player_id.get(game['player_id'])
+            if row is None:
+                return None
+            by_row.setdefault(row, []).append(game)
+
+        n_games = len(self.dates)
+        positions = []
+        new_games = []
+        # Process players in insert-position order (players without games go last)
+        insert_order = sorted(by_row, key=lambda r: (
+            (int(self.offsets[r] + self.lengths[r]), 0, r) if self.lengths[r] else (n_games, 1, r)
+        ))
+        for row in insert_order:
+            player_games = sorted(by_row[row], key=lambda g: g['date'])
+            length = int(self.lengths[row])
+            if length and np.datetime64(player_games[0]['date'], 'D') <= self.dates[self.offsets[row] + length - 1]:
+                return None
+            # Players without games get their slice at the end of the arrays
+            position = int(self.offsets[row]) + length if length else n_games
+            positions.extend([position] * len(player_games))
+            new_games.extend((row, game) for game in player_games)
+
+        data = copy.copy(self)
+        data.version = version
+
+        data.dates = np.insert(self.dates, positions, np.array([g['date'] for _, g in new_games], dtype='datetime64[D]'))
+        data.opponents = np.insert(self.opponents, positions, np.array([g['opponent'] for _, g in new_games], dtype=object))
+        data.is_home = np.insert(self.is_home, positions, np.array([bool(g['is_home']) for _, g in new_games], dtype=bool))
+        data.minutes = np.insert(self.minutes, positions, np.array(
+            [np.nan if g.get('minutes') is None else float(g['minutes']) for _, g in new_games], dtype=np.float64
+        ))
+
+        new_stats = {
+            col: np.array([int(g.get(col) or 0) for _, g in new_games], dtype=np.int64)
+            for col in STAT_COLUMNS
+        }
+        for combo, parts in COMBINED_STATS.items():
+            new_stats[combo] = sum(new_stats[p] for p in parts)
+        data.stats = {stat: np.insert(self.stats[stat], positions, new_stats[stat]) for stat in self.stats}
+
+        # Existing slices move right by the number of rows inserted at or before their start
+        positions = np.array(positions, dtype=np.int64)
+        data.offsets = self.offsets + np.searchsorted(positions, self.offsets, side='right')
+        data.lengths = self.lengths.copy()
+        data.rolling = list(self.rolling)
+
+        values = np.column_stack([new_stats[stat] for stat in ROLLING_STATS])
+        index = 0
+        for row in insert_order:
+            count = len(by_row[row])
+            if not self.lengths[row]:
+                # Inserted item k lands at its position + k
+                data.offsets[row] = positions[index] + index
+            data.lengths[row] += count
+            data.rolling[row] = self.rolling[row].extended(values[index:index + count])
+            index += count
+
+        return data
+
+
+class GameStore:
+    """Loads and serves the columnar game snapshot"""
+
+    def __init__(self, engine):
+        """
+        Initialize the store (loads on first read, or when load() is called)
+
+        Args:
+            engine: SQLAlchemy engine to read from
+        """
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._data = GameColumns([], [], version=0)
+        self._loaded = False
+        self._first_load_lock = threading.Lock()
+        self._retry_at = 0.0  # monotonic time of the next first-load attempt
+        _stores.add(self)
+
+    @property
+    def data(self) -> GameColumns:
+        """Current snapshot (grab once per operation for a consistent view)"""
+        if not self._loaded and time.monotonic() >= self._retry_at:
+            self._load_first()
+        return self._data
+
+    @property
+    def loaded(self) -> bool:
+        """Whether a snapshot has been loaded (never triggers a load)"""
+        return self._loaded
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot (bumped on every refresh)"""
+        return self.data.version
+
+    def _load_first(self):
+        """Load on first read, so creating a store never touches the database"""
+        with self._first_load_lock:
+            if self._loaded or time.monotonic() < self._retry_at:
+                return
+            try:
+                self.load()
+            except Exception as e:
+                # Serve the empty store for now and try again after a pause
+                # (not on every read, and not never)
+                self._retry_at = time.monotonic() + LOAD_RETRY_SECONDS
+                print(f"[ERROR] Failed to load game store (retrying in {LOAD_RETRY_SECONDS:.0f}s): {e}")
+
+    def load(self) -> GameColumns:
+        """
+        Load players and games in one scan each and swap in the new snapshot
+
+        The new snapshot is fully built before it replaces the old one, so
+        readers never observe a half-loaded store.
+
+        Returns:
+            The new snapshot
+        """
+        players_query = select(
+            Player.id, Player.name, Player.team, Player.position
+        ).order_by(Player.name)
+
+        games_query = select(
+            Game.player_id, Game.date, Game.opponent, Game.is_home, Game.minutes,
+            *[getattr(Game, col) for col in STAT_COLUMNS]
+        ).order_by(Game.player_id, Game.date, Game.id)
+
+        # Note the other workers' latest update first; everything up to it is in this load
+        _sync_games_marker(force=True)
+
+        with self._lock:
+            with self.engine.connect() as conn:
+                players = conn.execute(players_query).all()
+                games = conn.execute(games_query).all()
+
+            data = GameColumns(players, games, version=self._data.version + 1)
+            self._data = data
+            self._loaded = True
+
+        print(f"[INFO] Game store loaded: {len(data.names)} players, {len(data.dates)} games")
+        return data
+
+    def refresh(self) -> GameColumns:
+        """Reload the store from the database (atomic swap)"""
+        return self.load()
+
+    def append_games(self, games: List[dict]) -> GameColumns:
+        """
+        Add newly committed games without reloading the games table
+
+        Falls back to a full load() when the games can't simply be appended
+        (see GameColumns.with_games).
+
+        Args:
+            games: Dicts with player_id, date, opponent, is_home, minutes and stats
+
+        Returns:
+            The new snapshot
+        """
+        with self._lock:
+            data = self._data.with_games(games, version=self._data.version + 1)
+            if data is not None:
+                self._data = data
+
+        if data is None:
+            return self.load()
+
+        print(f"[INFO] Game store appended {len(games)} games ({len(data.dates)} total)")
+        return data
+
+
+def notify_games_changed(new_games: List[dict] = None):
+    """
+    Refresh every live game store in this process
+
+    Call after committing new games so request handlers see them.
+
+    Args:
+        new_games: The rows that were inserted, if known (appended to the
+                   stores in place instead of reloading the games table)
+    """
+    for store in list(_stores):
+        try:
+            if new_games:
+                store.append_games(new_games)
+            else:
+                store.refresh()
+        except Exception as e:
+            print(f"[WARNING] Failed to refresh game store: {e}")
+
+    # Tell the other worker processes (they reload in sync_game_stores)
+    try:
+        _get_games_marker().publish({"updated_at": time.time()})
+    except Exception as e:
+        print(f"[WARNING] Could not publish games update: {e}")
+
+
+def _sync_games_marker(force: bool = False) -> bool:
+    try:
+        return _get_games_marker().sync(force=force)
+    except Exception as e:
+        print(f"[WARNING] Could not check for games updates: {e}")
+        return False
+
+
+def sync_game_stores():
+    """
+    Reload this process's game stores if another process committed games
+
+    Cheap enough to call on every request (the shared version check is
+    throttled by SharedValue).
+    """
+    if _sync_games_marker():
+        for store in list(_stores):
+            try:
+                store.refresh()
+            except Exception as e:
+                print(f"[WARNING] Failed to refresh game store: {e}")
@@ -0,0 +1,195 @@
+"""
+HTTP response cache for the read endpoints
+Serves repeat GETs from memory, answers If-None-Match with 304 and keeps
+gzip/brotli copies of each body
+
+Responses are cached per route + query args + data version (e.g. the prop
+board versions for /api/players), so an entry stays valid until the data it
+was built from changes. A request whose version is unchanged never reaches
+the view: a matching If-None-Match costs a dict lookup and returns 304, and
+anything else is served from the stored body. Bodies are compressed once
+per entry, not once per request.
+
+ETags are a hash of the body, so they're strong, identical across gunicorn
+workers for identical bodies, and never match a different body.
+Brotli is used when the brotli package is installed.
+
+Each worker keeps its own cache, capped at RESPONSE_CACHE_MB (default 16)
+so it fits the per-worker memory budget in render.yaml.
+"""
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Don't compress bodies smaller than this (bytes)
+MIN_COMPRESS_SIZE = 500
+
+# Response cache size per worker process (MB)
+RESPONSE_CACHE_MB = int(os.getenv("RESPONSE_CACHE_MB", "16"))
+
+
+class CachedBody:
+    """One cached response body plus its compressed variants"""
+
+    def __init__(self, body: bytes, mimetype: str):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.encoded = {}  # content-encoding -> compressed body
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(b) for b in self.encoded.values())
+
+    def variant(self, encoding: str) -> bytes:
+        """Body compressed with encoding ('gzip' or 'br'), compressed on first use"""
+        data = self.encoded.get(encoding)
+        if data is None:
+            with self._lock:
+                data = self.encoded.get(encoding)
+                if data is None:
+                    if encoding == 'br':
+                        data = brotli.compress(self.body, quality=5)
+                    else:
+                        data = gzip.compress(self.body, compresslevel=6)
+                    self.encoded[encoding] = data
+        return data
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU of CachedBody entries
+
+    Keys are tuples ending in the data version. Storing a key drops the
+    entry for the same request under an older version, so superseded
+    bodies don't sit in memory until LRU pressure pushes them out.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MB * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Total body bytes (including compressed copies) to keep
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._current = {}  # key without version -> key of the latest entry
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry: CachedBody):
+        with self._lock:
+            superseded = self._current.get(key[:-1])
+            if superseded is not None and superseded != key:
+                self._entries.pop(superseded, None)
+            self._current[key[:-1]] = key
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        total = sum(e.size for e in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            key, evicted = self._entries.popitem(last=False)
+            if self._current.get(key[:-1]) == key:
+                del self._current[key[:-1]]
+            total -= evicted.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current.clear()
+
+
+response_cache = ResponseCache()
+
+
+def _choose_encoding(request, size: int):
+    if size < MIN_COMPRESS_SIZE:
+        return None
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _respond(entry: CachedBody, max_age: int):
+    """Build the response for a cache entry (304 if the client has it)"""
+    from flask import Response, request
+
+    encoding = _choose_encoding(request, len(entry.body))
+    etag = f"{entry.etag}-{encoding}" if encoding else entry.etag
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        body = entry.variant(encoding) if encoding else entry.body
+        response = Response(body, mimetype=entry.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f"public, max-age={max_age}, must-revalidate"
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    return response
+
+
+def cached(version, max_age: int = 0, cache: ResponseCache = None):
+    """
+    Cache a GET view's successful responses per data version
+
+    Args:
+        version: Callable returning the version of the data the view reads
+                 (must be cheap - it runs on every request - and must not
+                 touch the database); None disables caching for the request
+        max_age: Cache-Control max-age in seconds (0 = always revalidate)
+        cache: ResponseCache to use (default: the shared response_cache)
+
+    Returns:
+        Decorator for a Flask view function
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import make_response, request
+
+            data_version = version()
+            if data_version is None:
+                return view(*args, **kwargs)
+
+            store = cache or response_cache
+            key = (
+                request.endpoint,
+                request.path,
+                tuple(sorted(request.args.items(multi=True))),
+                request.headers.get('Accept', ''),
+                data_version
+            )
+            entry = store.get(key)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                # Errors and streamed bodies go out as they are
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                entry = CachedBody(response.get_data(), response.mimetype)
+                store.put(key, entry)
+
+            return _respond(entry, max_age)
+        return wrapper
+    return decorator
@@ -5,7 +5,7 @@ Uses NBA API to track inactive players and player status
 from datetime import datetime, timedelta
 from nba_api.stats.endpoints import LeagueGameFinder
 from nba_api.stats.static import players as nba_players
-import time
+import rate_limiter
 
 class InjuryTracker:
     def __init__(self):
@@ -184,6 +184,7 @@ class CombinedInjuryTracker:
             today = datetime.now().strftime('%Y-%m-%d')
 
             # Find games for today
+            rate_limiter.acquire(rate_limiter.NBA_STATS)
             game_finder = LeagueGameFinder(
                 date_from_nullable=today,
                 date_to_nullable=today,
@@ -205,8 +206,7 @@ class CombinedInjuryTracker:
             # For each game, get inactive players
             for game_id in game_ids:
                 try:
-                    time.sleep(0.6)  # Rate limiting
-
+                    rate_limiter.acquire(rate_limiter.NBA_STATS)
                     summary = BoxScoreSummaryV3(game_id=game_id)
                     inactive_df = summary.inactive_players.get_data_frame()
 
@@ -0,0 +1,283 @@
+"""
+Lightweight instrumentation for the Flask API
+Records per-route latency, SQL query counts/durations and calculator time,
+exposed at /api/metrics in Prometheus text format
+
+Recording a sample is a dict lookup, a bisect and a locked increment, so
+this is cheap enough to leave on in production. Metrics are per process
+(each gunicorn worker reports its own).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Histogram buckets (seconds / counts)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets and optional labels"""
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for label_values, series in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, label_values, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values, ("le", "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "statscout_http_request_duration_seconds", "Wall time per request",
+    labels=("route", "method", "status"))
+REQUEST_QUERIES = Histogram(
+    "statscout_http_request_db_queries", "SQL queries executed per request",
+    labels=("route",), buckets=COUNT_BUCKETS)
+REQUEST_COMPONENT_SECONDS = Histogram(
+    "statscout_http_request_component_seconds",
+    "Time per request spent in a component (db, calculator, json, ...)",
+    labels=("route", "component"))
+DB_QUERY_SECONDS = Histogram(
+    "statscout_db_query_duration_seconds", "SQL statement execution time",
+    labels=("operation",), buckets=QUERY_BUCKETS)
+SECTION_SECONDS = Histogram(
+    "statscout_section_duration_seconds", "Time per call of an instrumented section",
+    labels=("section",))
+REQUEST_ERRORS = Counter(
+    "statscout_http_request_exceptions_total", "Requests that raised an unhandled exception",
+    labels=("route",))
+
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "statscout_rate_limit_wait_seconds", "Time spent waiting for an upstream host's rate limit",
+    labels=("host",))
+RATE_LIMIT_THROTTLED = Counter(
+    "statscout_rate_limit_throttled_total", "Upstream responses asking us to slow down (429/Retry-After)",
+    labels=("host",))
+
+REGISTRY = [REQUEST_SECONDS, REQUEST_QUERIES, REQUEST_COMPONENT_SECONDS,
+            DB_QUERY_SECONDS, SECTION_SECONDS, REQUEST_ERRORS,
+            RATE_LIMIT_WAIT_SECONDS, RATE_LIMIT_THROTTLED]
+
+# Per-thread request accumulators (None outside a request)
+_local = threading.local()
+
+
+def _add_component_time(component, seconds):
+    components = getattr(_local, "components", None)
+    if components is not None:
+        components[component] = components.get(component, 0.0) + seconds
+
+
+def render():
+    """Render every metric in Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def timed(section):
+    """
+    Time a block as a named section
+
+    Records the section histogram and, inside a request, adds the time to
+    that request's component breakdown.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        SECTION_SECONDS.observe(elapsed, section)
+        _add_component_time(section, elapsed)
+
+
+def time_methods(obj, section, method_names):
+    """
+    Wrap methods on an instance so each call is timed as a section
+
+    Args:
+        obj: Object whose bound methods are replaced
+        section: Section label (e.g. "calculator")
+        method_names: Names of the methods to wrap
+    """
+    for method_name in method_names:
+        method = getattr(obj, method_name)
+
+        def make_wrapper(method, label):
+            @wraps(method)
+            def wrapper(*args, **kwargs):
+                with timed(label):
+                    return method(*args, **kwargs)
+            return wrapper
+
+        setattr(obj, method_name, make_wrapper(method, f"{section}.{method_name}"))
+
+
+_engines_instrumented = False
+
+
+def instrument_engines():
+    """
+    Count and time SQL statements on every SQLAlchemy engine
+
+    Listens on the Engine class, so engines created later by
+    models.get_engine() are covered too.
+    """
+    global _engines_instrumented
+    if _engines_instrumented:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statscout_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("statscout_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        DB_QUERY_SECONDS.observe(elapsed, operation)
+
+        if getattr(_local, "components", None) is not None:
+            _local.query_count += 1
+            _add_component_time("db", elapsed)
+
+    _engines_instrumented = True
+
+
+def init_app(app):
+    """
+    Instrument a Flask app and register GET /api/metrics
+
+    Args:
+        app: Flask application
+    """
+    from flask import Response, request
+    from flask.json.provider import DefaultJSONProvider
+
+    class TimedJSONProvider(DefaultJSONProvider):
+        """JSON provider that records serialization time"""
+
+        def dumps(self, obj, **kwargs):
+            with timed("json"):
+                return super().dumps(obj, **kwargs)
+
+    app.json = TimedJSONProvider(app)
+    instrument_engines()
+
+    def route_label():
+        return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+    @app.before_request
+    def start_request_timer():
+        _local.start = time.perf_counter()
+        _local.query_count = 0
+        _local.components = {}
+
+    @app.after_request
+    def record_request(response):
+        start = getattr(_local, "start", None)
+        components = getattr(_local, "components", None)
+        if start is None or components is None:
+            return response
+
+        route = route_label()
+        if route != "/api/metrics":
+            REQUEST_SECONDS.observe(time.perf_counter() - start, route, request.method, str(response.status_code))
+            REQUEST_QUERIES.observe(_local.query_count, route)
+            for component, seconds in components.items():
+                REQUEST_COMPONENT_SECONDS.observe(seconds, route, component)
+        return response
+
+    @app.teardown_request
+    def finish_request(error=None):
+        if error is not None and getattr(_local, "components", None) is not None:
+            REQUEST_ERRORS.inc(route_label())
+        _local.start = None
+        _local.components = None
+
+    @app.route('/api/metrics', methods=['GET'])
+    def metrics_endpoint():
+        return Response(render(), content_type=PROMETHEUS_CONTENT_TYPE)
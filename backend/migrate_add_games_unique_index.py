@@ -0,0 +1,18 @@
+"""
+Add unique (player_id, date) index to games table
+Removes duplicate games first (keeps the oldest row)
+Works against DATABASE_URL (PostgreSQL) or the local SQLite database
+"""
+from models import get_engine, ensure_games_unique_index
+
+engine = get_engine()
+
+print("Adding unique (player_id, date) index to games table...")
+removed = ensure_games_unique_index(engine)
+
+if removed:
+    print(f"Removed {removed} duplicate games")
+else:
+    print("No duplicate games found")
+
+print("\nMigration complete!")
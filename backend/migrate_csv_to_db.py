@@ -7,7 +7,7 @@ import sys
 import io
 import pandas as pd
 from datetime import datetime
-from models import get_engine, get_session, init_db, drop_all_tables, Player, Game
+from models import get_engine, get_session, init_db, drop_all_tables, Player, Game, bulk_upsert_games
 
 # Force UTF-8 output for Windows console
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -69,29 +69,24 @@ def migrate_csv_to_database(csv_path='data/player_stats.csv', reset_db=True):
         
         # Insert games
         print("\n Inserting game statistics...")
-        games_inserted = 0
-        
-        for _, row in df.iterrows():
-            game = Game(
-                player_id=player_map[row['player_name']],
-                date=row['date'],
-                opponent=row['opponent'],
-                is_home=bool(row['is_home']),
-                points=int(row['points']),
-                rebounds=int(row['rebounds']),
-                assists=int(row['assists']),
-                steals=int(row['steals']),
-                blocks=int(row['blocks']),
-                three_pm=int(row['three_pm'])
-            )
-            session.add(game)
-            games_inserted += 1
-            
-            # Commit in batches for better performance
-            if games_inserted % 100 == 0:
-                session.commit()
-                print(f"   {games_inserted} games inserted...")
-        
+        game_rows = [
+            {
+                'player_id': player_map[row['player_name']],
+                'date': row['date'],
+                'opponent': row['opponent'],
+                'is_home': bool(row['is_home']),
+                'points': int(row['points']),
+                'rebounds': int(row['rebounds']),
+                'assists': int(row['assists']),
+                'steals': int(row['steals']),
+                'blocks': int(row['blocks']),
+                'three_pm': int(row['three_pm'])
+            }
+            for _, row in df.iterrows()
+        ]
+
+        # Batched multi-row inserts (duplicate player/date rows are skipped)
+        games_inserted = bulk_upsert_games(session, game_rows)
         session.commit()
         print(f" {games_inserted} total games inserted")
         
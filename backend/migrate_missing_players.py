@@ -5,7 +5,7 @@ import sys
 import io
 import pandas as pd
 from datetime import datetime
-from models import get_engine, get_session, init_db, Player, Game
+from models import get_engine, get_session, init_db, Player, Game, bulk_upsert_games
 
 # Force UTF-8 output
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -53,39 +53,26 @@ def migrate_missing_players():
         session.commit()
         print(f"[SUCCESS] Added {players_added} new players")
 
-        # Add games
-        games_added = 0
+        # Add games (games already in the database are skipped by the unique index)
+        game_rows = []
         for idx, row in df.iterrows():
             # Convert date string to date object
             game_date = datetime.strptime(row['date'], '%Y-%m-%d').date()
 
-            # Check if game already exists
-            existing_game = session.query(Game).filter_by(
-                player_id=player_map[row['player_name']],
-                date=game_date,
-                opponent=row['opponent']
-            ).first()
-
-            if not existing_game:
-                game = Game(
-                    player_id=player_map[row['player_name']],
-                    date=game_date,
-                    opponent=row['opponent'],
-                    is_home=bool(row['is_home']),
-                    points=int(row['points']),
-                    rebounds=int(row['rebounds']),
-                    assists=int(row['assists']),
-                    steals=int(row['steals']),
-                    blocks=int(row['blocks']),
-                    three_pm=int(row['three_pm'])
-                )
-                session.add(game)
-                games_added += 1
-
-                # Progress update every 50 games
-                if games_added % 50 == 0:
-                    print(f"[INFO] Progress: {games_added}/{len(df)} games inserted...")
-
+            game_rows.append({
+                'player_id': player_map[row['player_name']],
+                'date': game_date,
+                'opponent': row['opponent'],
+                'is_home': bool(row['is_home']),
+                'points': int(row['points']),
+                'rebounds': int(row['rebounds']),
+                'assists': int(row['assists']),
+                'steals': int(row['steals']),
+                'blocks': int(row['blocks']),
+                'three_pm': int(row['three_pm'])
+            })
+
+        games_added = bulk_upsert_games(session, game_rows)
         session.commit()
         print(f"[SUCCESS] Inserted {games_added} new games")
 
@@ -5,7 +5,7 @@ Run this script after setting up PostgreSQL on Render
 
 import os
 import sys
-from models import get_engine, get_session, Base, Player, Game, TeamGame
+from models import get_engine, get_session, Base, Player, Game, TeamGame, bulk_upsert_games
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -89,37 +89,34 @@ def migrate_data(sqlite_path='sqlite:///statscout.db', postgres_url=None):
 
         # Get player ID mapping (SQLite ID -> PostgreSQL ID)
         print(f"\n[5/5] Migrating games...")
-        sqlite_players = {p.name: p.id for p in sqlite_session.query(Player).all()}
+        sqlite_players = {p.id: p.name for p in sqlite_session.query(Player).all()}
         postgres_players = {p.name: p.id for p in postgres_session.query(Player).all()}
 
         # Migrate Games
         games = sqlite_session.query(Game).all()
+        game_rows = [
+            {
+                'player_id': postgres_players[sqlite_players[game.player_id]],
+                'date': game.date,
+                'opponent': game.opponent,
+                'is_home': game.is_home,
+                'points': game.points,
+                'rebounds': game.rebounds,
+                'assists': game.assists,
+                'steals': game.steals,
+                'blocks': game.blocks,
+                'three_pm': game.three_pm,
+                'minutes': game.minutes
+            }
+            for game in games
+        ]
+
+        batch_size = 1000
+        for start in range(0, len(game_rows), batch_size):
+            bulk_upsert_games(postgres_session, game_rows[start:start + batch_size])
+            postgres_session.commit()  # Commit in batches
+            print(f"  ✓ Migrated {min(start + batch_size, game_count)}/{game_count} games...")
 
-        for i, game in enumerate(games, 1):
-            # Get corresponding PostgreSQL player ID
-            player_name = sqlite_session.query(Player).filter(Player.id == game.player_id).first().name
-            new_player_id = postgres_players[player_name]
-
-            new_game = Game(
-                player_id=new_player_id,
-                date=game.date,
-                opponent=game.opponent,
-                is_home=game.is_home,
-                points=game.points,
-                rebounds=game.rebounds,
-                assists=game.assists,
-                steals=game.steals,
-                blocks=game.blocks,
-                three_pm=game.three_pm,
-                minutes=game.minutes
-            )
-            postgres_session.add(new_game)
-
-            if i % 100 == 0:
-                print(f"  ✓ Migrated {i}/{game_count} games...")
-                postgres_session.commit()  # Commit in batches
-
-        postgres_session.commit()
         print(f"  ✓ All {game_count} games migrated")
 
         # Migrate TeamGames
@@ -3,9 +3,10 @@ StatScout Database Models
 Defines the database schema using SQLAlchemy
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, Date, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, Date, DateTime, ForeignKey, Index, insert, inspect, select, text, tuple_
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
+from datetime import datetime, timedelta
 
 Base = declarative_base()
 
@@ -29,6 +30,10 @@ class Player(Base):
 class Game(Base):
     """Individual game statistics table"""
     __tablename__ = 'games'
+    __table_args__ = (
+        # One row per player per game date (ingestion dedupes against this)
+        Index('uq_games_player_date', 'player_id', 'date', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     player_id = Column(Integer, ForeignKey('players.id'), nullable=False, index=True)
@@ -148,6 +153,140 @@ class TeamGame(Base):
         return None
 
 
+class TeamQuarterSummary(Base):
+    """
+    Running quarter totals per team and season (maintained by TeamQuarterFetcher)
+
+    Stores sums and counts rather than averages so each new TeamGame can be
+    folded in without rescanning. One row per split: 'all', 'home', 'away'
+    and 'vs_<OPP>' (head-to-head).
+    """
+    __tablename__ = 'team_quarter_summary'
+
+    team = Column(String, primary_key=True)
+    season = Column(String, primary_key=True)
+    split = Column(String, primary_key=True)
+
+    games = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    points_sum = Column(Integer, nullable=False, default=0)
+    opponent_points_sum = Column(Integer, nullable=False, default=0)
+
+    # Quarter totals (count = games with a non-zero value for that quarter)
+    q1_sum = Column(Integer, nullable=False, default=0)
+    q1_count = Column(Integer, nullable=False, default=0)
+    q2_sum = Column(Integer, nullable=False, default=0)
+    q2_count = Column(Integer, nullable=False, default=0)
+    q3_sum = Column(Integer, nullable=False, default=0)
+    q3_count = Column(Integer, nullable=False, default=0)
+    q4_sum = Column(Integer, nullable=False, default=0)
+    q4_count = Column(Integer, nullable=False, default=0)
+
+    # Half / three-quarter totals (count = games with those quarters recorded)
+    first_half_sum = Column(Integer, nullable=False, default=0)
+    first_half_count = Column(Integer, nullable=False, default=0)
+    second_half_sum = Column(Integer, nullable=False, default=0)
+    second_half_count = Column(Integer, nullable=False, default=0)
+    three_quarter_sum = Column(Integer, nullable=False, default=0)
+    three_quarter_count = Column(Integer, nullable=False, default=0)
+    reached_100_by_q3 = Column(Integer, nullable=False, default=0)
+
+    # Lead-after-quarter records (needs both sides of the game)
+    led_after_q1 = Column(Integer, nullable=False, default=0)
+    won_led_after_q1 = Column(Integer, nullable=False, default=0)
+    led_at_half = Column(Integer, nullable=False, default=0)
+    won_led_at_half = Column(Integer, nullable=False, default=0)
+    led_after_q3 = Column(Integer, nullable=False, default=0)
+    won_led_after_q3 = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TeamQuarterSummary(team='{self.team}', season='{self.season}', split='{self.split}')>"
+
+
+class IngestedEvent(Base):
+    """
+    ESPN game whose box score has been stored (maintained by add_espn_recent_games)
+
+    Finished games don't change, so events listed here are skipped on later
+    runs instead of being fetched again.
+    """
+    __tablename__ = 'espn_ingested_events'
+
+    event_id = Column(String, primary_key=True)  # ESPN event ID
+    date = Column(Date, nullable=False, index=True)
+    player_games = Column(Integer, nullable=False, default=0)  # Stat lines found in the box score
+
+    def __repr__(self):
+        return f"<IngestedEvent(event_id='{self.event_id}', date='{self.date}')>"
+
+
+class UpdateJob(Base):
+    """
+    Progress of one stats update run (checkpointed by update_all_players)
+
+    The run goes through phases 'nba_api' -> 'espn' -> 'done'. In
+    per-player mode last_player_id records the last player finished, so a
+    run that dies part way resumes after that player instead of starting
+    over.
+    """
+    __tablename__ = 'update_jobs'
+
+    # A running job with no checkpoint for this long is assumed dead
+    STALE_AFTER = timedelta(minutes=15)
+
+    id = Column(Integer, primary_key=True)
+    season = Column(String, nullable=False)
+    mode = Column(String, nullable=False)  # 'league' or 'player'
+    status = Column(String, nullable=False, index=True)  # 'running', 'completed' or 'failed'
+    phase = Column(String, nullable=False)  # 'nba_api', 'espn' or 'done'
+    error = Column(String, nullable=True)
+
+    # Checkpoint for per-player mode (players are processed in id order)
+    last_player_id = Column(Integer, nullable=False, default=0)
+    players_total = Column(Integer, nullable=False, default=0)
+    players_done = Column(Integer, nullable=False, default=0)
+
+    # Running totals (carried over when a run is resumed)
+    players_updated = Column(Integer, nullable=False, default=0)
+    new_games = Column(Integer, nullable=False, default=0)
+    espn_games = Column(Integer, nullable=False, default=0)
+    resumed = Column(Integer, nullable=False, default=0)  # Times picked up after a failure
+
+    started_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)  # Heartbeat (every checkpoint)
+    finished_at = Column(DateTime, nullable=True)
+
+    def is_stale(self, now=None) -> bool:
+        """Whether a 'running' job has stopped checkpointing (its process died)"""
+        now = now or datetime.now()
+        return self.status == 'running' and now - self.updated_at > self.STALE_AFTER
+
+    def to_dict(self):
+        """Job progress as a JSON-serializable dict"""
+        return {
+            "job_id": self.id,
+            "season": self.season,
+            "mode": self.mode,
+            "status": self.status,
+            "phase": self.phase,
+            "error": self.error,
+            "stale": self.is_stale(),
+            "players_total": self.players_total,
+            "players_done": self.players_done,
+            "last_player_id": self.last_player_id,
+            "players_updated": self.players_updated,
+            "new_games": self.new_games,
+            "espn_games": self.espn_games,
+            "resumed": self.resumed,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f"<UpdateJob(id={self.id}, status='{self.status}', phase='{self.phase}')>"
+
+
 # Database connection and session management
 def get_engine(db_path=None):
     """
@@ -192,6 +331,145 @@ def drop_all_tables(engine):
     print("  All tables dropped")
 
 
+# Columns identifying a game row (matches the uq_games_player_date index)
+GAME_KEY_COLUMNS = ['player_id', 'date']
+
+
+def ensure_games_unique_index(engine):
+    """
+    Create the unique (player_id, date) index on games if it is missing
+
+    Existing duplicate rows are removed first (the lowest id is kept),
+    otherwise the index can't be created. A no-op (one inspection) when
+    the index already exists.
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        Number of duplicate rows removed
+    """
+    with engine.begin() as conn:
+        removed = 0
+        if not has_games_unique_index(conn):
+            removed = _create_games_unique_index(conn)
+    _indexed_databases.add(str(engine.url))
+    return removed
+
+
+def _create_games_unique_index(conn):
+    """Dedupe games and create uq_games_player_date on an open connection"""
+    result = conn.execute(text("""
+        DELETE FROM games
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM games GROUP BY player_id, date
+        )
+    """))
+    removed = result.rowcount or 0
+
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_games_player_date ON games (player_id, date)"
+    ))
+    return removed
+
+
+# Database URLs whose games table is known to have the unique index
+_indexed_databases = set()
+
+
+def has_games_unique_index(conn) -> bool:
+    """Whether the games table has a unique index/constraint on (player_id, date)"""
+    inspector = inspect(conn)
+    key = set(GAME_KEY_COLUMNS)
+    unique_sets = [
+        set(index['column_names']) for index in inspector.get_indexes('games') if index.get('unique')
+    ] + [
+        set(constraint['column_names']) for constraint in inspector.get_unique_constraints('games')
+    ]
+    return key in unique_sets
+
+
+def bulk_upsert_games(session, rows, update=False, batch_size=500):
+    """
+    Insert game rows, letting the database skip or update duplicates
+
+    Uses INSERT ... ON CONFLICT (player_id, date) on SQLite and PostgreSQL,
+    so deduplication is one statement per batch instead of one query per
+    game. Other databases fall back to one existence query per batch.
+    Does not commit.
+
+    Args:
+        session: Database session
+        rows: List of dicts with Game column values (must include player_id and date)
+        update: Overwrite the stats of existing games instead of skipping them
+        batch_size: Rows per statement
+
+    Returns:
+        Number of rows inserted or updated
+    """
+    if not rows:
+        return 0
+
+    # executemany needs every row to have the same keys
+    columns = []
+    for row in rows:
+        for column in row:
+            if column not in columns:
+                columns.append(column)
+    rows = [{column: row.get(column) for column in columns} for row in rows]
+
+    bind = session.get_bind()
+    dialect = bind.dialect.name
+
+    # ON CONFLICT needs the unique index, which create_all doesn't add to
+    # tables created before it existed
+    if dialect in ('postgresql', 'sqlite') and str(bind.url) not in _indexed_databases:
+        if not has_games_unique_index(session.connection()):
+            raise RuntimeError(
+                "games table has no unique (player_id, date) index - "
+                "run migrate_add_games_unique_index.py first"
+            )
+        _indexed_databases.add(str(bind.url))
+
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    written = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+
+        if dialect_insert is None:
+            # Generic fallback: drop rows whose key already exists
+            keys = [(row['player_id'], row['date']) for row in batch]
+            existing = set(session.execute(
+                select(Game.player_id, Game.date).where(tuple_(Game.player_id, Game.date).in_(keys))
+            ).all())
+            batch = [row for row in batch if (row['player_id'], row['date']) not in existing]
+            if batch:
+                session.execute(insert(Game), batch)
+                written += len(batch)
+            continue
+
+        stmt = dialect_insert(Game)
+        if update:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=GAME_KEY_COLUMNS,
+                set_={column: stmt.excluded[column] for column in columns if column not in GAME_KEY_COLUMNS}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=GAME_KEY_COLUMNS)
+
+        # RETURNING only yields rows that were actually written
+        result = session.execute(stmt.returning(Game.id), batch)
+        written += len(result.all())
+
+    return written
+
+
 # Example usage
 if __name__ == "__main__":
     # Create database and tables
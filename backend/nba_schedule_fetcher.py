@@ -7,7 +7,6 @@ import io
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import time
-import pytz
 
 # Force UTF-8 output
 if not isinstance(sys.stdout, io.TextIOWrapper) or sys.stdout.encoding != 'utf-8':
@@ -58,12 +57,47 @@ TEAM_ABBREV_MAP = {
 class NBAScheduleFetcher:
     """Fetches upcoming NBA games and schedules using The Odds API"""
 
-    def __init__(self):
-        """Initialize the schedule fetcher"""
+    def __init__(self, fetch_on_read: bool = True, shared_cache=None):
+        """
+        Initialize the schedule fetcher
+
+        Args:
+            fetch_on_read: Fetch from the API when a read finds the cache
+                           stale. Set False when a background job refreshes
+                           the cache, so reads never block on HTTP.
+            shared_cache: Optional shared_cache.SharedValue; fetched schedules
+                          are published to it and reads pick up schedules
+                          fetched by other workers
+        """
         self.games_cache = []
         self.cache_timestamp = None
         self.cache_duration = 3600  # Cache for 1 hour
+        self.version = 0  # Bumped whenever the cached schedule is replaced
+        self.fetch_on_read = fetch_on_read
         self.odds_client = OddsAPIClient()
+        self.shared_cache = shared_cache
+        self._sync_shared(force=True)
+
+    def _sync_shared(self, force: bool = False):
+        """Adopt a newer schedule published by another worker"""
+        if self.shared_cache is None or not self.shared_cache.sync(force=force):
+            return
+
+        shared = self.shared_cache.value or {}
+        timestamp = shared.get('timestamp')
+        if not timestamp or (self.cache_timestamp and timestamp <= self.cache_timestamp):
+            return
+
+        self.games_cache = shared.get('games', [])
+        self.cache_timestamp = timestamp
+        self.version += 1
+
+    def is_stale(self) -> bool:
+        """Check whether the cached schedule needs a refresh"""
+        self._sync_shared()
+        if not self.cache_timestamp or not self.games_cache:
+            return True
+        return (time.time() - self.cache_timestamp) >= self.cache_duration
 
     def _convert_team_name_to_abbrev(self, full_name: str) -> str:
         """Convert full team name to abbreviation"""
@@ -79,12 +113,10 @@ class NBAScheduleFetcher:
         Returns:
             List of game dictionaries with matchup info
         """
-        # Check cache
+        # Check cache (read-only mode always serves the cache)
+        self._sync_shared()
         current_time = time.time()
-        if (not refresh_cache and
-            self.cache_timestamp and
-            self.games_cache and
-            (current_time - self.cache_timestamp) < self.cache_duration):
+        if not refresh_cache and (not self.fetch_on_read or not self.is_stale()):
             return self.games_cache
 
         try:
@@ -111,6 +143,7 @@ class NBAScheduleFetcher:
                 try:
                     game_datetime = datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
                     # Convert to Eastern Time
+                    import pytz  # Deferred: only needed once games are fetched
                     et_tz = pytz.timezone('America/New_York')
                     game_datetime_et = game_datetime.astimezone(et_tz)
                     game_date_str = game_datetime_et.strftime("%b %d, %Y")
@@ -138,6 +171,13 @@ class NBAScheduleFetcher:
             # Update cache
             self.games_cache = games
             self.cache_timestamp = current_time
+            self.version += 1
+
+            if self.shared_cache is not None:
+                try:
+                    self.shared_cache.publish({'games': games, 'timestamp': current_time})
+                except Exception as e:
+                    print(f"[WARNING] Could not publish schedule: {e}")
 
             return games
 
@@ -6,15 +6,40 @@ Fetches real historical game data using nba_api (official NBA stats, no auth req
 import sys
 import io
 from nba_api.stats.static import players
-from nba_api.stats.endpoints import playergamelog, boxscoretraditionalv2
+from nba_api.stats.endpoints import playergamelog, boxscoretraditionalv2, leaguegamelog
 import pandas as pd
-import time
-from datetime import datetime
+import rate_limiter
+from datetime import datetime, date
 from typing import List, Dict, Optional
 
 # Force UTF-8 output for Windows console
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+# Counting stat columns parsed from game logs (games table names)
+GAME_STAT_COLUMNS = ['points', 'rebounds', 'assists', 'steals', 'blocks', 'three_pm']
+
+
+def game_log_rows(batch: pd.DataFrame, player_ids: pd.Series) -> List[Dict]:
+    """
+    Game rows (games table columns, plain Python values) from a parsed game log
+
+    Args:
+        batch: Output of NBAStatsFetcher.parse_game_log (rows with a valid game_date)
+        player_ids: Our player id for each batch row (same index)
+
+    Returns:
+        List of dicts ready for bulk_upsert_games
+    """
+    columns = {
+        'player_id': player_ids.astype(int).tolist(),
+        'date': batch['game_date'].dt.date.tolist(),
+        'opponent': batch['opponent'].tolist(),
+        'is_home': batch['is_home'].astype(bool).tolist(),
+        **{name: batch[name].tolist() for name in GAME_STAT_COLUMNS},
+        'minutes': batch['minutes'].tolist()
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
 
 class NBAStatsFetcher:
     """Fetch real NBA player game logs using nba_api"""
@@ -90,6 +115,7 @@ class NBAStatsFetcher:
             print(f"[INFO] Fetching game logs for player ID {player_id}...")
 
             # Get player game logs
+            rate_limiter.acquire(rate_limiter.NBA_STATS)
             gamelog = playergamelog.PlayerGameLog(
                 player_id=player_id,
                 season=season,
@@ -178,6 +204,127 @@ class NBAStatsFetcher:
             'minutes': minutes_played
         }
 
+    @classmethod
+    def parse_game_log(cls, game_logs_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Parse an nba_api game log into database columns, vectorized
+
+        Matchups, dates and minutes are parsed once per column with pandas
+        string/date operations (same rules as format_game_for_database)
+        instead of row by row, so even a league-wide log parses in a few
+        milliseconds.
+
+        Args:
+            game_logs_df: DataFrame from nba_api (PlayerGameLog or LeagueGameLog)
+
+        Returns:
+            DataFrame (same index) with columns:
+            - nba_player_id: PLAYER_ID (None if the log has no such column)
+            - team: normalized TEAM_ABBREVIATION (None if missing)
+            - game_date: datetime64 ("MON DD, YYYY" or "YYYY-MM-DD"; NaT if
+              unparseable), date_str: "YYYY-MM-DD"
+              (the raw value if unparseable)
+            - opponent, is_home (bool), points, rebounds, assists, steals,
+              blocks, three_pm (int) and minutes (float)
+        """
+        def column(name, default):
+            if name in game_logs_df:
+                return game_logs_df[name]
+            return pd.Series(default, index=game_logs_df.index, dtype=object)
+
+        # Matchup format: "LAL vs. GSW" (home) or "LAL @ GSW" (away)
+        matchup = column('MATCHUP', '').fillna('').astype(str)
+        home = matchup.str.contains(' vs. ', regex=False)
+        away = ~home & matchup.str.contains(' @ ', regex=False)
+        opponent = matchup.str.split(r' vs\. | @ ', n=1, regex=True).str[1].str.strip()
+        opponent = opponent.where(home | away, 'UNK').replace(cls.TEAM_ABBREV_MAP)
+
+        # Parse date: PlayerGameLog uses "OCT 22, 2024", LeagueGameLog "2024-10-22"
+        # (unparseable values are kept as-is in date_str)
+        game_date_str = column('GAME_DATE', '').fillna('').astype(str)
+        game_date = pd.to_datetime(game_date_str, format='%b %d, %Y', errors='coerce')
+        unparsed = game_date.isna()
+        if unparsed.any():
+            game_date[unparsed] = pd.to_datetime(game_date_str[unparsed], format='%Y-%m-%d', errors='coerce')
+        date_str = game_date.dt.strftime('%Y-%m-%d').where(game_date.notna(), game_date_str)
+
+        # Parse minutes (can be a string like "32:15" or just a number)
+        minutes_raw = column('MIN', 0)
+        minutes_str = minutes_raw.astype(str)
+        clock = minutes_str.str.split(':')
+        clock_minutes = (
+            pd.to_numeric(clock.str[0], errors='coerce') +
+            pd.to_numeric(clock.str[1], errors='coerce') / 60
+        ).where(clock.str.len() == 2, 0.0)
+        minutes_played = pd.to_numeric(minutes_raw, errors='coerce').where(
+            ~minutes_str.str.contains(':', regex=False), clock_minutes
+        ).fillna(0.0).astype(float)
+
+        team = column('TEAM_ABBREVIATION', None)
+        if 'TEAM_ABBREVIATION' in game_logs_df:
+            team = team.replace(cls.TEAM_ABBREV_MAP)
+
+        def counts(name):
+            return pd.to_numeric(column(name, 0), errors='coerce').fillna(0).astype(int)
+
+        return pd.DataFrame({
+            'nba_player_id': column('PLAYER_ID', None),
+            'team': team,
+            'game_date': game_date,
+            'date_str': date_str,
+            'opponent': opponent,
+            'is_home': ~away,
+            'points': counts('PTS'),
+            'rebounds': counts('REB'),
+            'assists': counts('AST'),
+            'steals': counts('STL'),
+            'blocks': counts('BLK'),
+            'three_pm': counts('FG3M'),
+            'minutes': minutes_played
+        }, index=game_logs_df.index)
+
+    def format_games_for_database(
+        self,
+        game_logs_df: pd.DataFrame,
+        player_name: str,
+        team: str,
+        position: str
+    ) -> List[Dict]:
+        """
+        Format a whole nba_api game log for our database schema
+
+        Same output as format_game_for_database for every row, built from
+        parse_game_log.
+
+        Args:
+            game_logs_df: DataFrame from nba_api (PlayerGameLog or LeagueGameLog)
+            player_name: Player's name
+            team: Player's team abbreviation
+            position: Player's position
+
+        Returns:
+            List of formatted game dictionaries (in DataFrame order)
+        """
+        if game_logs_df.empty:
+            return []
+
+        batch = self.parse_game_log(game_logs_df)
+        columns = ['date_str', 'opponent', 'is_home'] + GAME_STAT_COLUMNS + ['minutes']
+        return [
+            {
+                'player_name': player_name,
+                'team': team,
+                'position': position,
+                'date': date_value,
+                'opponent': opponent,
+                'is_home': 1 if is_home else 0,
+                **dict(zip(GAME_STAT_COLUMNS, stats)),
+                'minutes': minutes
+            }
+            for date_value, opponent, is_home, *stats, minutes
+            in zip(*(batch[name].tolist() for name in columns))
+        ]
+
     def get_quarter_splits_for_game(self, game_id: str, player_name: str) -> Optional[Dict]:
         """
         Fetch quarter-by-quarter stats for a specific game
@@ -190,9 +337,8 @@ class NBAStatsFetcher:
             Dictionary with quarter splits or None if unavailable
         """
         try:
-            time.sleep(0.6)  # Rate limiting
-
             # Fetch box score with quarter data
+            rate_limiter.acquire(rate_limiter.NBA_STATS)
             boxscore = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id)
             player_stats = boxscore.get_data_frames()[0]  # Player stats dataframe
 
@@ -239,10 +385,7 @@ class NBAStatsFetcher:
         if not player_id:
             return []
 
-        # Respect API rate limits (be nice to NBA servers)
-        time.sleep(0.6)
-
-        # Get game logs
+        # Get game logs (rate limited per request, see rate_limiter)
         game_logs_df = self.get_player_game_logs(player_id, season)
         if game_logs_df.empty:
             return []
@@ -256,12 +399,80 @@ class NBAStatsFetcher:
             current_team = team  # Fallback to provided team
 
         # Format for our database
-        formatted_games = []
-        for _, game_row in game_logs_df.iterrows():
-            formatted = self.format_game_for_database(game_row, player_name, current_team, position)
-            formatted_games.append(formatted)
+        return self.format_games_for_database(game_logs_df, player_name, current_team, position)
 
-        return formatted_games
+    def build_player_id_map(self, player_names: List[str]) -> Dict[int, str]:
+        """
+        Map NBA player IDs to our player names (same matching as find_player_id)
+
+        Args:
+            player_names: Player names from our database
+
+        Returns:
+            Dictionary of {nba_player_id: player_name}
+        """
+        exact = {}
+        for player in self.all_players:
+            exact.setdefault(player['full_name'].lower(), player['id'])
+
+        id_map = {}
+        for name in player_names:
+            name_lower = name.lower()
+            player_id = exact.get(name_lower)
+
+            if player_id is None:
+                # Try partial match if exact match fails
+                for player in self.all_players:
+                    if name_lower in player['full_name'].lower():
+                        player_id = player['id']
+                        break
+
+            if player_id is None:
+                print(f"[WARNING] Player '{name}' not found")
+                continue
+
+            id_map[player_id] = name
+
+        return id_map
+
+    def fetch_league_game_logs(
+        self,
+        season: str = "2025-26",
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch every player's game logs for a date range in one request
+
+        Args:
+            season: Season string (e.g., "2025-26")
+            date_from: First game date to include (None = season start)
+            date_to: Last game date to include (None = today)
+
+        Returns:
+            DataFrame with one row per player per game (includes PLAYER_ID,
+            PLAYER_NAME, TEAM_ABBREVIATION), or None if the request failed
+        """
+        try:
+            print(f"[INFO] Fetching league game log for {season} "
+                  f"({date_from or 'season start'} to {date_to or 'today'})...")
+
+            rate_limiter.acquire(rate_limiter.NBA_STATS)
+            gamelog = leaguegamelog.LeagueGameLog(
+                season=season,
+                season_type_all_star='Regular Season',
+                player_or_team_abbreviation='P',
+                date_from_nullable=date_from.strftime('%m/%d/%Y') if date_from else '',
+                date_to_nullable=date_to.strftime('%m/%d/%Y') if date_to else ''
+            )
+
+            df = gamelog.get_data_frames()[0]
+            print(f"[SUCCESS] Retrieved {len(df)} player games")
+            return df
+
+        except Exception as e:
+            print(f"[ERROR] Error fetching league game log: {e}")
+            return None
 
 
 def fetch_all_players_data(output_file: str = "real_player_stats.csv"):
@@ -418,9 +629,6 @@ def fetch_all_players_data(output_file: str = "real_player_stats.csv"):
         else:
             print(f"[WARNING] No games found for {player['name']}")
 
-        # Be nice to the NBA API (rate limiting)
-        time.sleep(0.6)
-
     # Save to CSV
     if all_games:
         df = pd.DataFrame(all_games)
@@ -4,7 +4,12 @@ Fetches real betting lines from The Odds API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime
 import sys
@@ -32,14 +37,102 @@ if not API_KEY:
 # Sport key for NBA
 SPORT_KEY = "basketball_nba"
 
+# Concurrent fetch settings
+MAX_WORKERS = 8           # Parallel event requests during a full slate refresh
+MAX_RETRIES = 2           # Retries per request (after the first attempt)
+RETRY_BACKOFF = 0.5       # Base backoff in seconds (doubles each retry)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
 
 class OddsAPIClient:
     """Client for The Odds API"""
     
-    def __init__(self, api_key: str = API_KEY):
+    def __init__(self, api_key: str = API_KEY, max_workers: int = MAX_WORKERS):
         """Initialize the odds API client"""
         self.api_key = api_key
         self.base_url = BASE_URL
+        self.max_workers = max_workers
+
+        # One pooled session (keep-alive) shared by every request and thread
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+
+        # Quota tracking from response headers (updated from worker threads)
+        self._usage_lock = threading.Lock()
+        self.requests_remaining = None
+        self.requests_used = None
+        self._concurrent_fetches = 0
+
+    def _record_usage(self, response) -> None:
+        """
+        Track quota headers from a response
+
+        During a concurrent fetch, responses can arrive out of order, so the
+        lowest remaining count and highest used count seen are kept (those
+        are the latest). Serial requests simply overwrite the values, which
+        lets the counts recover after the monthly quota reset.
+        """
+        remaining = response.headers.get('x-requests-remaining')
+        used = response.headers.get('x-requests-used')
+
+        with self._usage_lock:
+            try:
+                remaining = int(float(remaining)) if remaining is not None else None
+                used = int(float(used)) if used is not None else None
+            except ValueError:
+                return  # Malformed header - keep previous values
+
+            if self._concurrent_fetches == 0:
+                self.requests_remaining = remaining if remaining is not None else self.requests_remaining
+                self.requests_used = used if used is not None else self.requests_used
+                return
+
+            if remaining is not None and (self.requests_remaining is None or remaining < self.requests_remaining):
+                self.requests_remaining = remaining
+            if used is not None and (self.requests_used is None or used > self.requests_used):
+                self.requests_used = used
+
+    def _request(self, path: str, params: Dict, timeout: int = 10, retries: int = MAX_RETRIES):
+        """
+        GET an API path with retry and exponential backoff
+
+        Retries connection errors, timeouts, 429 and 5xx responses. A 429
+        Retry-After header is honored when present.
+
+        Args:
+            path: Path under the API base URL
+            params: Query parameters
+            timeout: Per-attempt timeout in seconds
+            retries: Number of retries after the first attempt
+
+        Returns:
+            The final response
+
+        Raises:
+            requests.RequestException: If every attempt failed to connect
+        """
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.get(f"{self.base_url}{path}", params=params, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    raise
+                response = None
+
+            if response is not None:
+                self._record_usage(response)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    return response
+
+            delay = RETRY_BACKOFF * (2 ** attempt) * (1 + random.random() * 0.25)
+            retry_after = response.headers.get('Retry-After') if response is not None else None
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            time.sleep(delay)
         
     def check_usage(self) -> Dict:
         """
@@ -50,10 +143,7 @@ class OddsAPIClient:
         """
         try:
             # Make a simple request to check quota
-            response = requests.get(
-                f"{self.base_url}/sports",
-                params={"apiKey": self.api_key}
-            )
+            response = self._request("/sports", {"apiKey": self.api_key}, retries=0)
             
             remaining = response.headers.get('x-requests-remaining', 'Unknown')
             used = response.headers.get('x-requests-used', 'Unknown')
@@ -82,11 +172,7 @@ class OddsAPIClient:
                 "apiKey": self.api_key
             }
 
-            response = requests.get(
-                f"{self.base_url}/sports/{SPORT_KEY}/events",
-                params=params,
-                timeout=10
-            )
+            response = self._request(f"/sports/{SPORT_KEY}/events", params)
 
             remaining = response.headers.get('x-requests-remaining', 'Unknown')
 
@@ -140,11 +226,7 @@ class OddsAPIClient:
             if bookmakers:
                 params["bookmakers"] = bookmakers
 
-            response = requests.get(
-                f"{self.base_url}/sports/{SPORT_KEY}/events/{event_id}/odds",
-                params=params,
-                timeout=10
-            )
+            response = self._request(f"/sports/{SPORT_KEY}/events/{event_id}/odds", params)
 
             # Check remaining requests
             remaining = response.headers.get('x-requests-remaining', 'Unknown')
@@ -173,15 +255,21 @@ class OddsAPIClient:
         self,
         regions: str = "us",
         markets: str = "player_points,player_rebounds,player_assists",
-        bookmakers: Optional[str] = None
+        bookmakers: Optional[str] = None,
+        concurrent: bool = True
     ) -> Dict:
         """
         Get player props for all upcoming NBA games
 
+        Events are fetched in parallel over the pooled session, so a full
+        slate takes about as long as the slowest single event. Events that
+        still fail after retries are reported in failed_events and skipped.
+
         Args:
             regions: Geographic region (us, uk, eu, au)
             markets: Comma-separated list of markets
             bookmakers: Optional specific bookmakers to query
+            concurrent: Fetch events in parallel (False = one at a time)
 
         Returns:
             Dictionary with all props data
@@ -201,29 +289,51 @@ class OddsAPIClient:
                 "message": "No upcoming games found"
             }
 
-        # Get props for each event
-        all_props = []
-
-        for event in events:
-            event_id = event.get("id")
-            if not event_id:
-                continue
+        event_ids = [event.get("id") for event in events if event.get("id")]
 
-            props_response = self.get_player_props(
+        def fetch(event_id):
+            return self.get_player_props(
                 event_id=event_id,
                 regions=regions,
                 markets=markets,
                 bookmakers=bookmakers
             )
 
+        # Get props for each event (results keep event order)
+        if concurrent and len(event_ids) > 1:
+            with self._usage_lock:
+                self._concurrent_fetches += 1
+            try:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(event_ids))) as executor:
+                    responses = list(executor.map(fetch, event_ids))
+            finally:
+                with self._usage_lock:
+                    self._concurrent_fetches -= 1
+        else:
+            responses = [fetch(event_id) for event_id in event_ids]
+
+        all_props = []
+        failed_events = []
+
+        for event_id, props_response in zip(event_ids, responses):
             if props_response.get("success"):
                 all_props.append(props_response.get("data"))
+            else:
+                failed_events.append({
+                    "event_id": event_id,
+                    "error": props_response.get("error")
+                })
+
+        if failed_events:
+            print(f"[WARNING] Odds fetch failed for {len(failed_events)} of {len(event_ids)} events")
 
         return {
             "success": True,
             "data": all_props,
             "events_count": len(events),
-            "props_count": len(all_props)
+            "props_count": len(all_props),
+            "failed_events": failed_events,
+            "requests_remaining": self.requests_remaining
         }
     
     def parse_player_props(self, api_response: Dict) -> List[Dict]:
@@ -4,10 +4,10 @@ Fetches real-time player prop odds from major sportsbooks
 """
 
 import os
-import requests
 from datetime import date, datetime
 from typing import List, Dict, Optional, Any
-import time
+
+import rate_limiter
 
 
 class VegasOddsFetcher:
@@ -23,23 +23,7 @@ class VegasOddsFetcher:
         self.api_key = api_key or os.environ.get('BALLDONTLIE_API_KEY')
         self.base_url = "https://api.balldontlie.io"
         self.headers = {"Authorization": self.api_key} if self.api_key else {}
-
-        # Rate limiting (free tier: 5 requests/minute)
-        self.min_request_interval = 12  # 12 seconds = 5 requests/minute
-
-        self.last_request_time = 0
-
-    def _rate_limit(self):
-        """Enforce rate limiting to stay within API limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            print(f"  [Rate Limit] Sleeping {sleep_time:.1f}s...")
-            time.sleep(sleep_time)
-
-        self.last_request_time = time.time()
+        # Requests go through rate_limiter (free tier: 5 requests/minute)
 
     def get_todays_games(self) -> List[Dict[str, Any]]:
         """
@@ -53,12 +37,10 @@ class VegasOddsFetcher:
             return []
 
         try:
-            self._rate_limit()
-
             today = date.today().isoformat()
             url = f"{self.base_url}/nba/v1/games"
 
-            response = requests.get(
+            response = rate_limiter.get(
                 url,
                 headers=self.headers,
                 params={"dates[]": today},
@@ -100,15 +82,13 @@ class VegasOddsFetcher:
             return []
 
         try:
-            self._rate_limit()
-
             url = f"{self.base_url}/v2/odds/player_props"
 
             params = {"game_id": game_id}
             if prop_type:
                 params["prop_type"] = prop_type
 
-            response = requests.get(
+            response = rate_limiter.get(
                 url,
                 headers=self.headers,
                 params=params,
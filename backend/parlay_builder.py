@@ -3,7 +3,9 @@ StatScout Parlay Builder
 Generates optimized parlays based on trust scores and target odds
 """
 from typing import List, Dict, Any, Optional
-import itertools
+import bisect
+import heapq
+import math
 import random
 
 
@@ -148,89 +150,239 @@ class ParlayBuilder:
 
         return props
 
+    def _log_odds_window(self, low_american: int, high_american: int) -> tuple:
+        """
+        Convert an American odds range into a log-decimal-odds window
+
+        The window is slightly wider than the exact range (decimal_to_american
+        truncates), so it is only used for pruning - complete parlays are
+        checked against the exact American odds.
+
+        Args:
+            low_american: Lowest acceptable American odds
+            high_american: Highest acceptable American odds
+
+        Returns:
+            (low, high) bounds on the sum of log decimal odds
+        """
+        # American odds between -100 and +100 never occur: +100 is decimal 2.0
+        if low_american >= 100:
+            low_decimal = low_american / 100 + 1
+        elif low_american <= -100:
+            low_decimal = 100 / (abs(low_american) + 1) + 1
+        else:
+            low_decimal = 2.0
+
+        if high_american >= 100:
+            high_decimal = (high_american + 1) / 100 + 1
+        elif high_american <= -100:
+            high_decimal = 100 / abs(high_american) + 1
+        else:
+            high_decimal = 2.0
+
+        epsilon = 1e-9
+        return math.log(low_decimal) - epsilon, math.log(high_decimal) + epsilon
+
+    def _search_order(self, props: List[Dict], seed: Optional[int] = None) -> List[int]:
+        """
+        Order props by trust score (descending) for the search
+
+        Args:
+            props: Props to order
+            seed: Optional seed - shuffles props with equal trust scores so
+                  different seeds give different (reproducible) suggestions
+
+        Returns:
+            Prop indices in search order
+        """
+        indices = list(range(len(props)))
+        tiebreak = [0] * len(props)
+        if seed is not None:
+            rng = random.Random(seed)
+            tiebreak = [rng.random() for _ in indices]
+        indices.sort(key=lambda i: (-props[i].get('trust_score', 0), tiebreak[i]))
+        return indices
+
+    def _search_parlays(
+        self,
+        legs: List[Dict],
+        log_odds: List[float],
+        window: tuple,
+        accept,
+        min_legs: int,
+        max_legs: int,
+        max_results: int,
+        max_nodes: int
+    ) -> List[List[int]]:
+        """
+        Branch-and-bound search for the highest-trust parlays in an odds window
+
+        Legs must be sorted by trust score (descending). For every leg count,
+        a depth-first search picks legs in index order and prunes a branch when:
+        - the cheapest or priciest way to fill the remaining legs (suffix
+          min/max sums of log decimal odds) cannot land inside the window, or
+        - the best possible average trust (next legs in trust order) cannot
+          beat the worst parlay currently kept in the top-K heap.
+
+        Args:
+            legs: Props sorted by trust score (descending)
+            log_odds: Log decimal odds of each leg
+            window: (low, high) bounds on the summed log decimal odds
+            accept: Exact check applied to each complete parlay
+            min_legs: Minimum number of legs
+            max_legs: Maximum number of legs
+            max_results: Number of parlays to keep (top-K by average trust)
+            max_nodes: Search node budget (stops early when exhausted)
+
+        Returns:
+            Parlays as index lists, best average trust first
+        """
+        n = len(legs)
+        low, high = window
+        trust = [leg.get('trust_score', 0) for leg in legs]
+
+        # Prefix sums of trust: trust of legs i..i+r-1 is the best any r legs
+        # from suffix i can add (legs are in descending trust order)
+        trust_prefix = [0.0]
+        for value in trust:
+            trust_prefix.append(trust_prefix[-1] + value)
+
+        # suffix_min[i][r] / suffix_max[i][r]: smallest / largest sum of r log
+        # odds among legs i..n-1
+        suffix_min = [[0.0] for _ in range(n + 1)]
+        suffix_max = [[0.0] for _ in range(n + 1)]
+        smallest = []
+        largest = []
+        for i in range(n - 1, -1, -1):
+            bisect.insort(smallest, log_odds[i])
+            bisect.insort(largest, -log_odds[i])
+            del smallest[max_legs:]
+            del largest[max_legs:]
+            for r in range(1, len(smallest) + 1):
+                suffix_min[i].append(suffix_min[i][r - 1] + smallest[r - 1])
+                suffix_max[i].append(suffix_max[i][r - 1] - largest[r - 1])
+
+        heap = []  # (avg_trust, -sequence, indices) - heap[0] is the worst kept
+        nodes = 0
+        sequence = 0
+
+        def search(num_legs, start, chosen, odds_sum, trust_sum):
+            nonlocal nodes, sequence
+            remaining = num_legs - len(chosen)
+
+            for i in range(start, n - remaining + 1):
+                nodes += 1
+                if nodes > max_nodes:
+                    return False
+
+                # Trust bound (decreasing in i, so no later leg can do better)
+                best_avg = (trust_sum + trust_prefix[i + remaining] - trust_prefix[i]) / num_legs
+                if len(heap) >= max_results and best_avg <= heap[0][0]:
+                    break
+
+                # Odds bounds for filling the rest from legs after i
+                new_sum = odds_sum + log_odds[i]
+                rest = remaining - 1
+                if new_sum + suffix_min[i + 1][rest] > high or new_sum + suffix_max[i + 1][rest] < low:
+                    continue
+
+                chosen.append(i)
+                if rest == 0:
+                    combo = [legs[j] for j in chosen]
+                    if accept(combo):
+                        entry = (round((trust_sum + trust[i]) / num_legs, 6), -sequence, list(chosen))
+                        sequence += 1
+                        if len(heap) < max_results:
+                            heapq.heappush(heap, entry)
+                        elif entry > heap[0]:
+                            heapq.heapreplace(heap, entry)
+                elif not search(num_legs, i + 1, chosen, new_sum, trust_sum + trust[i]):
+                    chosen.pop()
+                    return False
+                chosen.pop()
+
+            return True
+
+        for num_legs in range(min_legs, max_legs + 1):
+            if not search(num_legs, 0, [], 0.0, 0.0):
+                print(f"[WARNING] Parlay search stopped after {max_nodes} nodes (returning best found)")
+                break
+
+        return [entry[2] for entry in sorted(heap, reverse=True)]
+
     def find_parlay_combinations(
         self,
         props: List[Dict],
         target_odds: int,
         min_legs: int = 2,
         max_legs: int = 6,
-        max_combinations: int = 1000
+        max_results: int = 50,
+        max_nodes: int = 200000,
+        seed: Optional[int] = None
     ) -> List[List[Dict]]:
         """
-        Find parlay combinations that hit target odds
+        Find the highest-trust parlays that hit target odds
+
+        Uses a bounded search over leg combinations instead of enumerating
+        them, so large prop pools stay fast.
 
         Args:
             props: Available props to choose from
             target_odds: Target American odds (e.g., +400)
             min_legs: Minimum number of props in parlay
             max_legs: Maximum number of props in parlay
-            max_combinations: Max combinations to try (performance limit)
+            max_results: Max parlays to return (top-K by average trust)
+            max_nodes: Search node budget (performance limit)
+            seed: Optional seed for reproducible tie-breaking between props
+                  with equal trust scores
 
         Returns:
-            List of valid parlay combinations
+            List of valid parlay combinations (best average trust first)
         """
-        valid_parlays = []
-        closest_parlays = []  # Track top 10 closest for fallback
+        min_legs = max(1, min_legs)
+        max_legs = min(max_legs, len(props))
+        if not props or min_legs > max_legs:
+            return []
+
+        order = self._search_order(props, seed)
+        legs = [props[i] for i in order]
+        log_odds = [math.log(self.american_to_decimal(leg['odds'])) for leg in legs]
 
         # More flexible tolerance: ±100 for lower odds, ±200 for higher odds
         tolerance = 100 if target_odds < 500 else 200
 
-        # Try different parlay sizes (start from target, work outward for efficiency)
-        # Estimate best leg count based on average odds
-        avg_american_odds = sum(p.get('american_odds', -110) for p in props[:10]) / min(10, len(props))
-        estimated_legs = max(min_legs, min(max_legs, int(target_odds / max(abs(avg_american_odds) - 100, 50))))
-
-        # Try estimated size first, then expand
-        leg_order = [estimated_legs]
-        for offset in range(1, max(estimated_legs - min_legs, max_legs - estimated_legs) + 1):
-            if estimated_legs - offset >= min_legs:
-                leg_order.append(estimated_legs - offset)
-            if estimated_legs + offset <= max_legs:
-                leg_order.append(estimated_legs + offset)
-
-        for num_legs in leg_order:
-            if num_legs < min_legs or num_legs > max_legs:
-                continue
-
-            # Early exit if we have enough valid parlays
-            if len(valid_parlays) >= 20:
+        def within_tolerance(combo):
+            return abs(self.calculate_parlay_odds(combo) - target_odds) <= tolerance
+
+        window = self._log_odds_window(target_odds - tolerance, target_odds + tolerance)
+        found = self._search_parlays(
+            legs, log_odds, window, within_tolerance,
+            min_legs, max_legs, max_results, max_nodes
+        )
+
+        if found:
+            return [[legs[i] for i in combo] for combo in found]
+
+        # No parlays within tolerance: widen the window around the target until
+        # something fits, then return the closest 5
+        center = sum(window) / 2
+        half_width = max((window[1] - window[0]) / 2, 0.05)
+        reachable_low = min(log_odds) * min_legs
+        reachable_high = max(log_odds) * max_legs
+
+        while not found:
+            half_width *= 2
+            widened = (center - half_width, center + half_width)
+            found = self._search_parlays(
+                legs, log_odds, widened, lambda combo: True,
+                min_legs, max_legs, max_results, max_nodes
+            )
+            if widened[0] <= reachable_low and widened[1] >= reachable_high:
                 break
 
-            # Generate combinations - use iterator for memory efficiency
-            total_combos = len(list(itertools.combinations(range(len(props)), num_legs)))
-
-            # Limit samples based on leg count to avoid timeout
-            sample_limit = min(max_combinations // max(1, num_legs - 2), total_combos)
-
-            if total_combos > sample_limit:
-                # Random sampling for large combo sets
-                indices_list = random.sample(list(itertools.combinations(range(len(props)), num_legs)), sample_limit)
-                combinations = [[props[i] for i in indices] for indices in indices_list]
-            else:
-                combinations = list(itertools.combinations(props, num_legs))
-
-            # Check each combination
-            for combo in combinations:
-                combo_list = list(combo)
-                parlay_odds = self.calculate_parlay_odds(combo_list)
-                odds_distance = abs(parlay_odds - target_odds)
-
-                if odds_distance <= tolerance:
-                    valid_parlays.append(combo_list)
-                else:
-                    # Track closest parlays for fallback (keep only top 10)
-                    if len(closest_parlays) < 10:
-                        closest_parlays.append((combo_list, odds_distance))
-                        closest_parlays.sort(key=lambda x: x[1])
-                    elif odds_distance < closest_parlays[-1][1]:
-                        closest_parlays[-1] = (combo_list, odds_distance)
-                        closest_parlays.sort(key=lambda x: x[1])
-
-        # If no parlays found within tolerance, return closest 5
-        if not valid_parlays and closest_parlays:
-            valid_parlays = [p[0] for p in closest_parlays[:5]]
-
-        return valid_parlays
+        closest = [[legs[i] for i in combo] for combo in found]
+        closest.sort(key=lambda combo: abs(self.calculate_parlay_odds(combo) - target_odds))
+        return closest[:5]
 
     def generate_parlay(
         self,
@@ -241,7 +393,8 @@ class ParlayBuilder:
         selected_games: Optional[List[str]] = None,
         num_suggestions: int = 1,
         min_legs: int = 2,
-        max_legs: int = 6
+        max_legs: int = 6,
+        seed: Optional[int] = None
     ) -> List[Dict]:
         """
         Generate parlay suggestions
@@ -255,6 +408,7 @@ class ParlayBuilder:
             num_suggestions: Number of parlay suggestions to return
             min_legs: Minimum number of legs in parlay (default 2)
             max_legs: Maximum number of legs in parlay (default 6)
+            seed: Optional seed for reproducible tie-breaking between props
 
         Returns:
             List of parlay suggestions, each with legs and metadata
@@ -292,7 +446,8 @@ class ParlayBuilder:
             filtered_props,
             target_odds=target_odds,
             min_legs=min_legs,
-            max_legs=max_legs
+            max_legs=max_legs,
+            seed=seed
         )
 
         if not valid_parlays:
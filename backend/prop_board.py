@@ -0,0 +1,637 @@
+"""
+StatScout Prop Board
+Materialized prop board shared by /api/players and /api/parlay/generate
+
+The board is built once and kept keyed by the versions of its four inputs:
+player stats (game store), odds cache, injury report and schedule. When only
+one input changes, only the rows that depend on the changed data are
+recomputed:
+
+- stats change      -> full rebuild (candidate props may have changed)
+- odds change       -> rows whose odds key gained, lost or changed lines
+- schedule change   -> rows for teams whose next game changed
+- injury change     -> rows for players whose injury status changed, plus
+                       their teammates (the teammate boost depends on who
+                       is out)
+
+Requests read the finished snapshot, so a warm board costs a dict lookup.
+A stale board can also be streamed (iter_players): rows are handed out a
+chunk at a time while the rest of the board is still being computed.
+"""
+
+import queue
+import random
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+
+# Team color mapping (for frontend display)
+TEAM_COLORS = {
+    "LAL": "#552583", "GSW": "#1D428A", "BOS": "#007A33", "MIL": "#00471B",
+    "DAL": "#00538C", "DEN": "#0E2240", "PHX": "#E56020", "PHI": "#006BB6",
+    "MIA": "#98002E", "CHI": "#CE1141", "BKN": "#000000", "MIN": "#0C2340",
+    "SAC": "#5A2D81", "POR": "#E03A3E", "LAC": "#C8102E", "UTA": "#002B5C",
+    "MEM": "#5D76A9", "NOP": "#0C2340", "SAS": "#C4CED4", "HOU": "#CE1141",
+    "OKC": "#007AC1", "ATL": "#E03A3E", "CLE": "#860038", "IND": "#002D62",
+    "DET": "#C8102E", "TOR": "#CE1141", "WAS": "#002B5C", "CHA": "#1D1160",
+    "ORL": "#0077C0", "NYK": "#006BB6"
+}
+
+# Betting lines for each stat type (these would come from an API in production)
+STAT_LINES = {
+    "Points": lambda avg: round(avg * 2) / 2,  # Round to nearest .5
+    "Rebounds": lambda avg: round(avg * 2) / 2,
+    "Assists": lambda avg: round(avg * 2) / 2,
+    "Steals": lambda avg: round(avg * 2) / 2,
+    "Blocks": lambda avg: round(avg * 2) / 2,
+    "3PM": lambda avg: round(avg * 2) / 2,
+    "PRA": lambda avg: round(avg * 2) / 2,  # Points + Rebounds + Assists
+    "PA": lambda avg: round(avg * 2) / 2,   # Points + Assists
+    "PR": lambda avg: round(avg * 2) / 2,   # Points + Rebounds
+    "RA": lambda avg: round(avg * 2) / 2    # Rebounds + Assists
+}
+
+# Injury statuses that keep a player out of the parlay pool
+PARLAY_EXCLUDED_STATUSES = ['OUT', 'QUESTIONABLE', 'DOUBTFUL']
+
+# Injury fields that affect board rows (ignores fetch timestamps)
+INJURY_FIELDS = ('status', 'team', 'injury', 'source')
+
+# Rows computed per batch when the board is streamed while it's built
+STREAM_CHUNK_SIZE = 200
+
+# /api/players fields that can be sorted on server side
+SORT_FIELDS = ('trustScore', 'hitRate', 'recentHitRate', 'avgLastN', 'line')
+
+
+def default_line(stat_type: str, avg_stat: float) -> float:
+    """Calculated line used when no sportsbook line is available"""
+    return STAT_LINES.get(stat_type, lambda x: round(x - 0.5, 1))(avg_stat)
+
+
+def display_stat_name(stat_type: str) -> str:
+    """Format a stat column name for display (three_pm -> 3PM, PRA, Points)"""
+    if stat_type == 'three_pm':
+        return '3PM'
+    elif len(stat_type) <= 3:
+        return stat_type.upper()
+    return stat_type.title()
+
+
+def get_opponent_def_stat(stat_type: str) -> str:
+    """Generate opponent defensive stat string"""
+    if stat_type == "Points":
+        return f"{random.randint(105, 120)}.{random.randint(0, 9)} PPG"
+    elif stat_type == "Rebounds":
+        return f"{random.randint(40, 50)}.{random.randint(0, 9)} RPG"
+    elif stat_type == "Assists":
+        return f"{random.randint(20, 28)}.{random.randint(0, 9)} APG"
+    elif stat_type == "3PM":
+        return f"{random.randint(10, 15)}.{random.randint(0, 9)} 3PM"
+    else:
+        return f"{random.randint(30, 60)}.{random.randint(0, 9)} Total"
+
+
+def sort_key(row: Dict[str, Any], field: str) -> Tuple:
+    """
+    Total ordering key for sorting board rows by a field
+
+    Ties are broken by player name and stat type (unique per board), so a
+    key identifies a position in the sorted board - used as the pagination
+    cursor. Missing values sort as lowest.
+    """
+    value = row.get(field)
+    return (float('-inf') if value is None else value, row["name"], row["statType"])
+
+
+def _changed_odds_keys(old: Dict, new: Dict) -> Set[str]:
+    """Odds keys that were added, removed or whose lines changed"""
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+def _injury_fields(entry: Optional[Dict]) -> Optional[Tuple]:
+    """Comparable view of an injury entry"""
+    if entry is None:
+        return None
+    return tuple(entry.get(field) for field in INJURY_FIELDS)
+
+
+def _changed_injuries(old: Dict, new: Dict) -> Tuple[Set[str], Set[str]]:
+    """
+    Players whose injury entry changed, and the teams they play for
+
+    Returns:
+        (changed player names, affected team abbreviations)
+    """
+    players = set()
+    teams = set()
+    for name in old.keys() | new.keys():
+        before, after = old.get(name), new.get(name)
+        if _injury_fields(before) != _injury_fields(after):
+            players.add(name)
+            for entry in (before, after):
+                if entry and entry.get('team'):
+                    teams.add(entry['team'])
+    return players, teams
+
+
+class _BoardView:
+    """Rows of one board view plus the inputs they were computed from"""
+
+    def __init__(self, name: str, teammate_scope: bool):
+        """
+        Args:
+            name: View name (for logging)
+            teammate_scope: Whether injury changes also dirty the player's
+                            teammates (needed when rows use the teammate boost)
+        """
+        self.name = name
+        self.teammate_scope = teammate_scope
+        self.key = None
+        self.stats_version = None
+        self.odds = {}
+        self.team_games = {}
+        self.injuries = {}
+        self.rows = {}  # (player_name, stat_type) -> row, or None when excluded
+        self.snapshot = []
+        self.orderings = {}  # (field, descending) -> (snapshot, sorted rows)
+
+
+class PropBoard:
+    """Versioned, incrementally maintained prop board"""
+
+    def __init__(self, loader, calc, injury_tracker, schedule_fetcher, odds_cache, refresh_odds=None):
+        """
+        Initialize the board (rows are built on first read)
+
+        Args:
+            loader: DatabaseLoader (its game store version is the stats version)
+            calc: StatScoutCalculator used for the batch analysis
+            injury_tracker: ESPNInjuryTracker with a version counter
+            schedule_fetcher: NBAScheduleFetcher with a version counter
+            odds_cache: Shared odds cache dict ({"data", "version", ...})
+            refresh_odds: Optional callable that refreshes odds_cache if stale
+        """
+        self.loader = loader
+        self.calc = calc
+        self.injury_tracker = injury_tracker
+        self.schedule_fetcher = schedule_fetcher
+        self.odds_cache = odds_cache
+        self.refresh_odds = refresh_odds
+
+        self._lock = threading.Lock()
+        self._candidates_version = None
+        self._candidates = {}  # (player_name, stat_type) -> candidate inputs, in board order
+        self._team_keys = {}   # team -> candidate keys
+        self._player_keys = {}  # player_name -> candidate keys
+
+        self._players_view = _BoardView('players', teammate_scope=True)
+        self._parlay_view = _BoardView('parlay', teammate_scope=True)
+
+    # ---------- Public API ----------
+
+    def versions(self) -> Tuple[int, int, int, int]:
+        """Current (stats, odds, injury, schedule) versions"""
+        return (
+            self.loader.game_store.version,
+            self.odds_cache.get("version", 0),
+            getattr(self.injury_tracker, 'version', 0),
+            getattr(self.schedule_fetcher, 'version', 0)
+        )
+
+    def current_versions(self) -> Tuple[int, int, int, int]:
+        """Versions the next read will be keyed by (lets stale sources refresh first)"""
+        self._refresh_sources()
+        return self.versions()
+
+    def get_players(self) -> List[Dict[str, Any]]:
+        """
+        Get the /api/players board rows (numbered from 1, unfiltered)
+
+        Returns:
+            List of frontend prop dicts (shared snapshot - do not mutate)
+        """
+        return self._read(self._players_view, self._compute_player_rows)
+
+    def get_players_sorted(self, field: str, descending: bool = True) -> List[Dict[str, Any]]:
+        """
+        Get the /api/players board rows sorted by a field (see sort_key)
+
+        Each ordering is sorted once per board snapshot.
+
+        Args:
+            field: One of SORT_FIELDS
+            descending: Highest first
+
+        Returns:
+            List of frontend prop dicts (shared - do not mutate)
+        """
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Can't sort by {field}")
+
+        snapshot = self.get_players()
+        view = self._players_view
+        cached = view.orderings.get((field, descending))
+        if cached is not None and cached[0] is snapshot:
+            return cached[1]
+
+        ordered = sorted(snapshot, key=lambda row: sort_key(row, field), reverse=descending)
+        view.orderings[(field, descending)] = (snapshot, ordered)
+        return ordered
+
+    def iter_players(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the /api/players board rows as soon as they're available
+
+        A current board is read straight from its snapshot. Otherwise the
+        update runs in a background thread and each chunk of rows is yielded
+        as soon as it's computed, so the first rows can go out before the
+        whole board is done. Rows come out in the same order (and with the
+        same ids) as get_players().
+
+        Args:
+            chunk_size: Rows computed per batch while the board is built
+
+        Yields:
+            Frontend prop dicts (shared - do not mutate)
+        """
+        self._refresh_sources()
+        view = self._players_view
+        if view.key == self.versions():
+            yield from view.snapshot
+            return
+
+        chunks = queue.Queue()
+
+        def build():
+            try:
+                snapshot = self._read(view, self._compute_player_rows,
+                                      on_rows=lambda rows: chunks.put(('rows', rows)),
+                                      chunk_size=chunk_size)
+                chunks.put(('done', snapshot))
+            except Exception as e:
+                chunks.put(('error', e))
+
+        threading.Thread(target=build, name="prop-board-stream", daemon=True).start()
+
+        streamed = False
+        while True:
+            kind, item = chunks.get()
+            if kind == 'rows':
+                streamed = True
+                yield from item
+            elif kind == 'error':
+                raise item
+            else:
+                # Another request brought the board up to date first
+                if not streamed:
+                    yield from item
+                return
+
+    def get_parlay_pool(self) -> List[Dict[str, Any]]:
+        """
+        Get the props available for parlay building
+
+        Injured (OUT/QUESTIONABLE/DOUBTFUL) players and props without a
+        scheduled game are excluded.
+
+        Returns:
+            List of parlay leg dicts (shared snapshot - do not mutate)
+        """
+        return self._read(self._parlay_view, self._compute_parlay_rows)
+
+    def invalidate(self):
+        """Drop every materialized row (next read rebuilds from scratch)"""
+        with self._lock:
+            self._candidates_version = None
+            self._players_view = _BoardView('players', teammate_scope=True)
+            self._parlay_view = _BoardView('parlay', teammate_scope=True)
+
+    # ---------- Snapshot maintenance ----------
+
+    def _refresh_sources(self):
+        """Let the TTL caches behind each input refresh themselves if stale"""
+        if self.refresh_odds:
+            self.refresh_odds()
+        self.injury_tracker.get_all_injuries()
+        self.schedule_fetcher.get_upcoming_games()
+
+    def _read(self, view: _BoardView, compute_rows, on_rows: Callable = None,
+              chunk_size: int = None) -> List[Dict[str, Any]]:
+        """
+        Return the view's snapshot, bringing it up to date if needed
+
+        Args:
+            view: Board view to read
+            compute_rows: Row builder for the view
+            on_rows: Called with each chunk of snapshot rows while the
+                     view is rebuilt (not called if it was already current)
+            chunk_size: Rows per chunk passed to on_rows
+        """
+        self._refresh_sources()
+
+        key = self.versions()
+        if view.key == key:
+            return view.snapshot
+
+        with self._lock:
+            key = self.versions()
+            if view.key != key:
+                self._update_view(view, key, compute_rows, on_rows, chunk_size)
+            return view.snapshot
+
+    def _load_candidates(self, stats_version: int):
+        """Collect every (player, stat) with enough games for a prop"""
+        if self._candidates_version == stats_version:
+            return
+
+        candidates = {}
+        team_keys = {}
+        player_keys = {}
+
+        for player_name in self.loader.get_player_names():
+            player_info = self.loader.get_player_info(player_name)
+            if not player_info:
+                continue
+
+            team = player_info["team"]
+            all_stats = self.loader.get_all_available_stats(player_name)
+
+            for stat_type, stat_values in all_stats.items():
+                if len(stat_values) < 5:  # Need at least 5 games
+                    continue
+
+                display_stat_type = display_stat_name(stat_type)
+                key = (player_name, display_stat_type)
+                candidates[key] = {
+                    "player_name": player_name,
+                    "team": team,
+                    "position": player_info["position"],
+                    "avg_minutes": player_info.get("avg_minutes", 0),
+                    "stat_type": display_stat_type,
+                    "stat_values": stat_values,
+                    "avg_stat": sum(stat_values) / len(stat_values),
+                    "odds_key": f"{player_name}_{display_stat_type}"
+                }
+                team_keys.setdefault(team, []).append(key)
+                player_keys.setdefault(player_name, []).append(key)
+
+        self._candidates = candidates
+        self._team_keys = team_keys
+        self._player_keys = player_keys
+        self._candidates_version = stats_version
+
+    def _update_view(self, view: _BoardView, key: Tuple, compute_rows, on_rows: Callable = None,
+                     chunk_size: int = None):
+        """Recompute the rows of a view whose inputs changed (see _read)"""
+        stats_version = key[0]
+        self._load_candidates(stats_version)
+
+        odds = self.odds_cache.get("data", {})
+        injuries = self.injury_tracker.get_all_injuries()
+        team_games = {
+            team: self.schedule_fetcher.get_player_next_game(team)
+            for team in self._team_keys
+        }
+
+        if view.stats_version != stats_version:
+            # New stats: every row (and the candidate list itself) may differ
+            dirty = set(self._candidates)
+            view.rows = {}
+        else:
+            dirty = set()
+
+            if odds is not view.odds:
+                changed = _changed_odds_keys(view.odds, odds)
+                dirty.update(k for k, c in self._candidates.items() if c["odds_key"] in changed)
+
+            for team, next_game in team_games.items():
+                if view.team_games.get(team) != next_game:
+                    dirty.update(self._team_keys.get(team, []))
+
+            if injuries is not view.injuries:
+                players, teams = _changed_injuries(view.injuries, injuries)
+                for player_name in players:
+                    dirty.update(self._player_keys.get(player_name, []))
+                if view.teammate_scope:
+                    for team in teams:
+                        dirty.update(self._team_keys.get(team, []))
+
+        # Rebuild the snapshot in board order, computing dirty rows as they
+        # come up (in one batch unless someone is streaming the chunks)
+        candidate_keys = list(self._candidates)
+        chunk_size = chunk_size if on_rows else len(candidate_keys)
+        snapshot = []
+        for start in range(0, len(candidate_keys), max(chunk_size, 1)):
+            block = candidate_keys[start:start + chunk_size]
+            block_dirty = [k for k in block if k in dirty]
+            if block_dirty:
+                view.rows.update(compute_rows(block_dirty, odds, team_games, injuries))
+
+            rows = self._snapshot_rows(view, block, first_id=len(snapshot) + 1)
+            snapshot.extend(rows)
+            if on_rows and rows:
+                on_rows(rows)
+
+        view.stats_version = stats_version
+        view.odds = odds
+        view.team_games = team_games
+        view.injuries = injuries
+        view.snapshot = snapshot
+        view.key = key
+
+        print(f"[INFO] Prop board '{view.name}' updated: {len(dirty)} of "
+              f"{len(self._candidates)} rows recomputed (versions {key})")
+
+    def _snapshot_rows(self, view: _BoardView, keys: List[Tuple], first_id: int) -> List[Dict[str, Any]]:
+        """Assemble the served rows for a run of candidate keys (board order)"""
+        rows = [view.rows[k] for k in keys if view.rows.get(k) is not None]
+
+        if view is self._players_view:
+            return [{"id": idx, **row} for idx, row in enumerate(rows, start=first_id)]
+        return rows
+
+    # ---------- Row computation ----------
+
+    def _compute_player_rows(self, keys, odds, team_games, injuries) -> Dict[Tuple, Dict]:
+        """Build /api/players rows for the given candidate keys"""
+        props = []
+        metas = []
+        teammate_boosts = []
+
+        for key in keys:
+            candidate = self._candidates[key]
+            display_stat_type = candidate["stat_type"]
+
+            # Try to get real betting lines from odds API
+            bookmaker_lines = odds.get(candidate["odds_key"], [])
+            if bookmaker_lines:
+                # Use the first bookmaker's line as the primary line
+                line = bookmaker_lines[0]["line"]
+            else:
+                # Fallback to calculated line based on average
+                line = default_line(display_stat_type, candidate["avg_stat"])
+            is_real_line = bool(bookmaker_lines)
+
+            next_game = team_games.get(candidate["team"])
+            if next_game:
+                # Use real game data
+                opponent = next_game['opponent']
+                is_home = next_game['is_home']
+                game_date = next_game['game_date']
+                game_time = next_game['game_time']
+            else:
+                # No game found in betting lines - show placeholder
+                opponent = "TBD"
+                is_home = True
+                game_date = "TBD"
+                game_time = "TBD"
+
+            # Teammate boost is a lookup in the calculator's per-injury-report table
+            teammate_boosts.append(self.calc.calculate_teammate_boost(
+                candidate["player_name"], candidate["team"], display_stat_type, self.loader
+            ))
+            props.append({
+                "player_name": candidate["player_name"],
+                "team": candidate["team"],
+                "stat_type": display_stat_type,
+                "player_stats": candidate["stat_values"],
+                "line": line,
+                "opponent": opponent,
+                "opponent_rank": random.randint(5, 25),  # Still mock for now
+                "is_home": is_home
+            })
+            metas.append({
+                "is_real_line": is_real_line,
+                "bookmaker_lines": bookmaker_lines,
+                "game_date": game_date,
+                "game_time": game_time
+            })
+
+        analyses = self.calc.analyze_props(props, context_scores={'teammate_boost': teammate_boosts})
+
+        rows = {}
+        for key, prop, meta, analysis in zip(keys, props, metas, analyses):
+            candidate = self._candidates[key]
+            team = prop["team"]
+            injury = injuries.get(prop["player_name"]) or {"status": "ACTIVE"}
+
+            # Format for frontend
+            rows[key] = {
+                "name": prop["player_name"],
+                "team": team,
+                "teamColor": TEAM_COLORS.get(team, "#000000"),
+                "position": candidate["position"],
+                "statType": prop["stat_type"],
+                "line": prop["line"],
+                "isRealLine": meta["is_real_line"],  # Flag if line is from real odds API
+                "bookmakerLines": meta["bookmaker_lines"],  # All available bookmaker lines
+                "hitRate": analysis["hit_rate"],
+                "season_hits": analysis.get("season_hits"),
+                "total_games": analysis.get("total_games"),
+                "recent_hit_rate": analysis.get("recent_hit_rate"),
+                "recent_hits": analysis.get("recent_hits"),
+                "recent_total": analysis.get("recent_total"),
+                "trustScore": analysis["trust_score"],
+                "lastGames": analysis["last_games"],
+                "last5Games": analysis["last_5_games"],
+                "last15Games": analysis["last_15_games"],
+                "recentForm": analysis["recent_form"],
+                "opponent": prop["opponent"],
+                "opponentRank": prop["opponent_rank"],
+                "opponentDefStat": get_opponent_def_stat(prop["stat_type"]),
+                "gameDate": meta["game_date"],
+                "gameTime": meta["game_time"],
+                "isHome": prop["is_home"],
+                "avgLastN": analysis["avg_last_10"],
+                "streak": analysis["streak"],
+                "streakType": analysis["streak_type"],
+                "avgMinutes": candidate["avg_minutes"],
+                "injuryStatus": injury["status"],
+                "injurySource": injury.get("source", "default")
+            }
+
+        return rows
+
+    def _compute_parlay_rows(self, keys, odds, team_games, injuries) -> Dict[Tuple, Optional[Dict]]:
+        """Build parlay pool rows for the given candidate keys (None = excluded)"""
+        rows = {}
+        included = []
+        props = []
+        context_scores = {
+            'teammate_boost': [],
+            'rest_score': [],
+            'usage_score': [],
+            'pace_score': []
+        }
+
+        for key in keys:
+            candidate = self._candidates[key]
+            player_name = candidate["player_name"]
+            team = candidate["team"]
+            display_stat_type = candidate["stat_type"]
+
+            next_game = team_games.get(team)
+            if not next_game:
+                rows[key] = None  # Skip props without scheduled games
+                continue
+
+            injury_status = injuries.get(player_name)
+            if injury_status and injury_status.get('status', '') in PARLAY_EXCLUDED_STATUSES:
+                rows[key] = None  # Don't include injured players in parlay pool
+                continue
+
+            # Try to use real odds, fallback to calculated lines
+            line = None
+            odds_value = -110  # Default odds
+
+            bookmaker_lines = odds.get(candidate["odds_key"])
+            if bookmaker_lines:
+                first_bookmaker = bookmaker_lines[0]
+                line = first_bookmaker.get("line")
+                odds_value = first_bookmaker.get("over_odds") or -110
+
+            if line is None:
+                line = default_line(display_stat_type, candidate["avg_stat"])
+
+            opponent = next_game['opponent']
+
+            # Line-independent factors (teammate boost, rest, usage, pace)
+            context = self.calc.calculate_context_scores(
+                player_name=player_name,
+                team=team,
+                stat_type=display_stat_type,
+                db_loader=self.loader,
+                opponent=opponent
+            )
+            for factor, score in context.items():
+                context_scores[factor].append(score)
+
+            included.append(key)
+            props.append({
+                'player_name': player_name,
+                'team': team,
+                'stat_type': display_stat_type,
+                'player_stats': candidate["stat_values"],
+                'line': line,
+                'opponent': opponent,
+                'opponent_rank': 15,  # Default middle-of-pack
+                'is_home': next_game['is_home'],
+                'odds': odds_value
+            })
+
+        analyses = self.calc.analyze_props(props, context_scores=context_scores)
+
+        for key, prop, analysis in zip(included, props, analyses):
+            rows[key] = {
+                'player_name': prop['player_name'],
+                'team': prop['team'],
+                'opponent': prop['opponent'],
+                'stat_type': prop['stat_type'],
+                'line': prop['line'],
+                'odds': prop['odds'],
+                'trust_score': analysis['trust_score'],
+                'is_home': prop['is_home']
+            }
+
+        return rows
@@ -0,0 +1,216 @@
+"""
+StatScout Rate Limiter
+One token bucket per upstream host, shared by every fetcher in the process
+
+Callers take a token before each request instead of sleeping a fixed
+interval, so time spent on the request itself counts towards the spacing
+and several threads can share a host's budget safely. Buckets are keyed by
+host (subdomains share their parent's budget, e.g. every *.espn.com host).
+
+When a host answers 429 (or 503 with Retry-After) its bucket pauses for the
+Retry-After time and halves its rate; the rate then creeps back to the
+configured budget as requests succeed.
+
+Wait times and throttled responses are exported at /api/metrics.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import metrics
+
+# Hosts with a request budget
+NBA_STATS = "stats.nba.com"
+ESPN = "espn.com"
+BALLDONTLIE = "api.balldontlie.io"
+
+# host -> (requests per second, burst)
+HOST_BUDGETS: Dict[str, Tuple[float, float]] = {
+    NBA_STATS: (1 / 0.6, 2),   # stats.nba.com blocks clients that go much faster
+    ESPN: (20.0, 20),          # Public site APIs, generous
+    BALLDONTLIE: (5 / 60, 1),  # Free tier: 5 requests/minute
+}
+
+# Pause when a throttled response has no usable Retry-After (seconds)
+DEFAULT_RETRY_AFTER = 5.0
+
+# Status codes treated as "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+
+class TokenBucket:
+    """Thread-safe token bucket with reservation (callers queue fairly)"""
+
+    def __init__(self, host: str, rate: float, burst: float):
+        """
+        Args:
+            host: Host the budget applies to (metrics label)
+            rate: Sustained requests per second
+            burst: Requests allowed back to back after an idle period
+        """
+        self.host = host
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()  # Tokens accrue from here (future while paused)
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens now and return how long the caller must wait to use them
+
+        Tokens may go negative: each caller is handed the next free slot,
+        so concurrent callers are spaced out instead of racing.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = max(self._updated - now, 0.0) + max(-self._tokens, 0.0) / self.rate
+
+            # Additive recovery after a throttle (back to the budget in ~20 requests)
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+        return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until a request may be sent
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        metrics.RATE_LIMIT_WAIT_SECONDS.observe(wait, self.host)
+        return wait
+
+    def throttled(self, retry_after: Optional[float] = None):
+        """The host asked us to slow down: pause, then continue at half rate"""
+        pause = DEFAULT_RETRY_AFTER if retry_after is None else max(retry_after, 0.0)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._updated = max(self._updated, now + pause)
+            self._tokens = min(self._tokens, 0.0)
+            self.rate = max(self.base_rate / 8, self.rate / 2)
+        metrics.RATE_LIMIT_THROTTLED.inc(self.host)
+        print(f"[WARNING] {self.host} throttled us, pausing {pause:.1f}s (now {self.rate:.2f} req/s)")
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _budget_host(host: str) -> Optional[str]:
+    """The HOST_BUDGETS key that covers a host (exact or parent domain)"""
+    host = host.lower()
+    while host:
+        if host in HOST_BUDGETS:
+            return host
+        _, _, host = host.partition('.')
+    return None
+
+
+def get_bucket(host_or_url: str) -> Optional[TokenBucket]:
+    """
+    Bucket for a host (or a URL's host)
+
+    Returns:
+        TokenBucket, or None if the host has no budget
+    """
+    host = urlparse(host_or_url).hostname if "://" in host_or_url else host_or_url
+    key = _budget_host(host or "")
+    if key is None:
+        return None
+
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(key)
+            if bucket is None:
+                rate, burst = HOST_BUDGETS[key]
+                bucket = _buckets[key] = TokenBucket(key, rate, burst)
+    return bucket
+
+
+def acquire(host_or_url: str) -> float:
+    """
+    Wait for the host's next request slot (no-op for hosts without a budget)
+
+    Returns:
+        Seconds waited
+    """
+    bucket = get_bucket(host_or_url)
+    return bucket.acquire() if bucket else 0.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header (seconds or HTTP date) as seconds from now"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def report(host_or_url: str, response) -> bool:
+    """
+    Feed a response back to the host's bucket
+
+    Args:
+        host_or_url: Host or URL the request went to
+        response: requests.Response
+
+    Returns:
+        True if the host asked us to slow down (the request should be retried)
+    """
+    status = getattr(response, "status_code", None)
+    if status not in THROTTLE_STATUSES:
+        return False
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if status == 503 and retry_after is None:
+        return False  # Plain outage, not throttling
+    bucket = get_bucket(host_or_url)
+    if bucket:
+        bucket.throttled(retry_after)
+    return True
+
+
+def get(url: str, session=None, retries: int = 2, **kwargs):
+    """
+    Rate-limited GET that backs off and retries when throttled
+
+    Args:
+        url: Request URL (its host picks the bucket)
+        session: requests.Session to use (default: requests module)
+        retries: Extra attempts after a throttled response
+        **kwargs: Passed to get()
+
+    Returns:
+        requests.Response (the last one if every attempt was throttled)
+    """
+    if session is None:
+        import requests as session
+
+    for attempt in range(retries + 1):
+        acquire(url)
+        response = session.get(url, **kwargs)
+        if not report(url, response) or attempt == retries:
+            return response
+    return response
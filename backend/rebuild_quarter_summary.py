@@ -0,0 +1,21 @@
+"""
+Rebuild the team_quarter_summary table from team_games
+Run after editing team_games outside TeamQuarterFetcher (e.g. a bulk import)
+"""
+import sys
+from models import get_engine, get_session, init_db
+from team_quarter_summary import rebuild_team_quarter_summary, notify_summary_changed
+
+season = sys.argv[1] if len(sys.argv) > 1 else "2025-26"
+
+engine = get_engine()
+init_db(engine)  # Ensure the summary table exists
+session = get_session(engine)
+
+try:
+    rows = rebuild_team_quarter_summary(session, season)
+    session.commit()
+    notify_summary_changed()
+    print(f"[SUCCESS] Rebuilt {rows} team quarter summary rows for {season}")
+finally:
+    session.close()
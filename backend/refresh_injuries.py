@@ -8,10 +8,9 @@ print("MANUAL INJURY DATA REFRESH")
 print("=" * 60)
 
 tracker = ESPNInjuryTracker()
-tracker.clear_cache()
-print("\nCache cleared, fetching fresh data...")
+print("\nFetching fresh data...")
 
-injuries = tracker.get_all_injuries()
+injuries = tracker.refresh_nba_data()
 
 print(f"\n{'=' * 60}")
 print(f"Total injuries found: {len(injuries)}")
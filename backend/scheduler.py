@@ -2,10 +2,13 @@
 Automated Task Scheduler
 Schedules daily stats updates and other background tasks
 """
-from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime
+from typing import Callable
 import sys
 import io
+import threading
+
+from shared_cache import LeaderLock
 
 # Force UTF-8 output
 if not isinstance(sys.stdout, io.TextIOWrapper) or sys.stdout.encoding != 'utf-8':
@@ -39,6 +42,8 @@ def scheduled_update():
 
 def init_scheduler():
     """Initialize and start the background scheduler"""
+    # Imported here so only the worker that runs the jobs pays for APScheduler
+    from apscheduler.schedulers.background import BackgroundScheduler
 
     scheduler = BackgroundScheduler()
 
@@ -62,6 +67,126 @@ def init_scheduler():
     return scheduler
 
 
+def add_refresh_job(
+    scheduler,
+    refresh: Callable,
+    seconds: int,
+    job_id: str,
+    name: str,
+    run_now: bool = True
+):
+    """
+    Register a cache refresh job on the scheduler
+
+    Refresh functions decide for themselves whether a fetch is due (TTL,
+    active hours, API quota), so the job interval is just how often they
+    are asked.
+
+    Args:
+        scheduler: Scheduler returned by init_scheduler()
+        refresh: Callable that refreshes one cache
+        seconds: Interval between runs
+        job_id: Unique job ID
+        name: Human-readable job name
+        run_now: Also run once immediately (warms the cache at startup)
+    """
+    def run_refresh():
+        try:
+            refresh()
+        except Exception as e:
+            print(f"[ERROR] {name} failed: {e}")
+
+    job_kwargs = {}
+    if run_now:
+        job_kwargs["next_run_time"] = datetime.now()
+
+    scheduler.add_job(
+        run_refresh,
+        trigger='interval',
+        seconds=seconds,
+        id=job_id,
+        name=name,
+        replace_existing=True,
+        max_instances=1,  # Never overlap runs of the same refresh
+        coalesce=True,    # Collapse missed runs into one
+        **job_kwargs
+    )
+
+    print(f"[INFO] {name} scheduled every {seconds // 60} minutes")
+
+
+class LeaderScheduler:
+    """
+    Runs the background jobs in exactly one worker process
+
+    Every gunicorn worker creates one of these; a lease in the shared cache
+    (see shared_cache.LeaderLock) decides which of them actually starts the
+    APScheduler instance. The others keep checking the lease and take over
+    if the leader's lapses. Refresh jobs publish to the shared cache, so
+    every worker serves what the leader fetched.
+    """
+
+    def __init__(self, lock_name: str = "scheduler", lease_seconds: int = 60, backend=None):
+        """
+        Args:
+            lock_name: Leader lock name in the shared cache
+            lease_seconds: Lease length; renewed every third of it
+            backend: CacheBackend (default: shared_cache.get_backend())
+        """
+        self.lock = LeaderLock(lock_name, backend=backend, ttl=lease_seconds)
+        self.renew_interval = lease_seconds / 3
+        self.scheduler = None  # BackgroundScheduler while this process leads
+        self._refresh_jobs = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.scheduler is not None
+
+    def add_refresh_job(self, refresh: Callable, seconds: int, job_id: str, name: str, run_now: bool = True):
+        """Register a refresh job (see add_refresh_job); only the leader runs it"""
+        with self._lock:
+            self._refresh_jobs.append((refresh, seconds, job_id, name, run_now))
+            if self.scheduler is not None:
+                add_refresh_job(self.scheduler, refresh, seconds, job_id, name, run_now)
+
+    def start(self):
+        """Try for the lease and keep renewing it, in a daemon thread (never blocks startup)"""
+        self._thread = threading.Thread(target=self._run, name="leader-lease", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        self._check_lease()
+        while not self._stop.wait(self.renew_interval):
+            self._check_lease()
+
+    def _check_lease(self):
+        leader = self.lock.renew()
+        with self._lock:
+            if leader and self.scheduler is None:
+                print("[INFO] This worker holds the scheduler lease, starting background jobs")
+                self.scheduler = init_scheduler()
+                for job in self._refresh_jobs:
+                    add_refresh_job(self.scheduler, *job)
+            elif not leader and self.scheduler is not None:
+                print("[WARNING] Lost the scheduler lease, stopping background jobs")
+                self.scheduler.shutdown(wait=False)
+                self.scheduler = None
+
+    def shutdown(self, wait: bool = True):
+        """Stop the jobs and give the lease to another worker"""
+        self._stop.set()
+        if self._thread and wait:
+            self._thread.join()
+        with self._lock:
+            if self.scheduler is not None:
+                self.scheduler.shutdown(wait=wait)
+                self.scheduler = None
+        self.lock.release()
+
+
 # For testing: run an update immediately
 if __name__ == "__main__":
     print("Running immediate update for testing...")
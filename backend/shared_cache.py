@@ -0,0 +1,460 @@
+"""
+StatScout Shared Cache
+Process-shared key/value store for the odds, injury and schedule caches
+
+With several gunicorn workers each process has its own module globals, so
+caches kept in memory would be fetched once per worker (multiplying API
+quota use) and background jobs would run N times. Caches are published to a
+shared backend instead, and a leader lock picks the one worker that runs
+the scheduler jobs.
+
+Backends:
+- SQLiteCacheBackend: a SQLite file shared by every worker on the machine
+  (default)
+- RedisCacheBackend: any Redis-compatible client (redis-py, or MemoryRedis,
+  an in-process stand-in that works offline)
+
+Select one with the CACHE_URL environment variable:
+    sqlite:///path/to/cache.db   (default: statscout_cache.db)
+    redis://host:6379/0          (needs the redis package)
+    memory://                    (MemoryRedis, single process only)
+
+Values are stored as JSON with a version number that is bumped on every
+write, so readers can check cheaply whether anything changed.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Tuple
+
+DEFAULT_CACHE_DB = "statscout_cache.db"
+
+
+class CacheBackend(ABC):
+    """Interface shared by the cache backends"""
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[int, Any]:
+        """
+        Read a value
+
+        Returns:
+            Tuple of (version, value); (0, None) if the key was never set
+        """
+
+    @abstractmethod
+    def version(self, key: str) -> int:
+        """Current version of a key (0 if never set); cheaper than get()"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> int:
+        """
+        Store a JSON-serializable value and bump its version
+
+        Returns:
+            The new version
+        """
+
+    @abstractmethod
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        Take or renew a lock that expires after ttl seconds
+
+        Returns:
+            True if owner holds the lock now
+        """
+
+    @abstractmethod
+    def release_lock(self, name: str, owner: str):
+        """Release a lock if owner holds it"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache in a SQLite file (WAL mode, one connection per thread)"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_DB):
+        """
+        Args:
+            path: Database file shared by every worker
+        """
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, version INTEGER NOT NULL, value TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_locks ("
+                "name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Tuple[int, Any]:
+        row = self._connection().execute(
+            "SELECT version, value FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return 0, None
+        return row[0], json.loads(row[1])
+
+    def version(self, key: str) -> int:
+        row = self._connection().execute(
+            "SELECT version FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def set(self, key: str, value: Any) -> int:
+        payload = json.dumps(value)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO cache_entries (key, version, value) VALUES (?, 1, ?) "
+                "ON CONFLICT(key) DO UPDATE SET version = version + 1, value = excluded.value",
+                (key, payload)
+            )
+            version = conn.execute("SELECT version FROM cache_entries WHERE key = ?", (key,)).fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return version
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Take the lock if it's free, expired or already ours
+            conn.execute(
+                "INSERT INTO cache_locks (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE cache_locks.owner = excluded.owner OR cache_locks.expires_at < ?",
+                (name, owner, now + ttl, now)
+            )
+            holder = conn.execute("SELECT owner FROM cache_locks WHERE name = ?", (name,)).fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return holder == owner
+
+    def release_lock(self, name: str, owner: str):
+        self._connection().execute(
+            "DELETE FROM cache_locks WHERE name = ? AND owner = ?", (name, owner)
+        )
+
+
+# Lua scripts RedisCacheBackend runs, so each read-modify-write is atomic
+# on the server (MemoryRedis implements the same scripts in Python)
+
+# KEYS: value key, version key; ARGV: value JSON. Returns the new version
+SET_VERSIONED_SCRIPT = """
+local version = redis.call('incr', KEYS[2])
+redis.call('set', KEYS[1], '{"version": ' .. version .. ', "value": ' .. ARGV[1] .. '}')
+return version
+"""
+
+# KEYS: lock key; ARGV: owner, ttl seconds. Takes a free lock or renews
+# our own; returns 1 if owner holds it afterwards
+ACQUIRE_LOCK_SCRIPT = """
+local holder = redis.call('get', KEYS[1])
+if holder == false or holder == ARGV[1] then
+    redis.call('set', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# KEYS: lock key; ARGV: owner. Deletes the lock only if owner holds it
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class MemoryRedis:
+    """
+    In-process stand-in for the subset of the Redis API RedisCacheBackend uses
+
+    Same semantics as a real server for get/set (with nx, xx and ex), incr
+    and delete, and eval of the scripts above, so the Redis backend can be
+    exercised without a server. Only shared within one process.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def get(self, key):
+        with self._lock:
+            return self._data[key] if self._alive(key) else None
+
+    def set(self, key, value, ex=None, nx=False, xx=False):
+        with self._lock:
+            exists = self._alive(key)
+            if (nx and exists) or (xx and not exists):
+                return None
+            self._data[key] = value if isinstance(value, bytes) else str(value).encode()
+            if ex is not None:
+                self._expires[key] = time.time() + ex
+            else:
+                self._expires.pop(key, None)
+            return True
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._data[key]) + 1 if self._alive(key) else 1
+            self._data[key] = str(value).encode()
+            return value
+
+    def delete(self, *keys):
+        with self._lock:
+            return self._delete(keys)
+
+    def _delete(self, keys):
+        removed = 0
+        for key in keys:
+            if self._alive(key):
+                del self._data[key]
+                self._expires.pop(key, None)
+                removed += 1
+        return removed
+
+    def eval(self, script, numkeys, *keys_and_args):
+        """Run one of the module's Lua scripts atomically (others aren't supported)"""
+        keys, args = keys_and_args[:numkeys], [str(arg).encode() for arg in keys_and_args[numkeys:]]
+        with self._lock:
+            if script == SET_VERSIONED_SCRIPT:
+                version = int(self._data[keys[1]]) + 1 if self._alive(keys[1]) else 1
+                self._data[keys[1]] = str(version).encode()
+                self._data[keys[0]] = b'{"version": %d, "value": %s}' % (version, args[0])
+                self._expires.pop(keys[0], None)
+                return version
+            if script == ACQUIRE_LOCK_SCRIPT:
+                if self._alive(keys[0]) and self._data[keys[0]] != args[0]:
+                    return 0
+                self._data[keys[0]] = args[0]
+                self._expires[keys[0]] = time.time() + int(args[1])
+                return 1
+            if script == RELEASE_LOCK_SCRIPT:
+                if self._alive(keys[0]) and self._data[keys[0]] == args[0]:
+                    return self._delete(keys[:1])
+                return 0
+        raise NotImplementedError("MemoryRedis only runs the shared_cache scripts")
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache in Redis (or anything speaking the same commands)
+
+    Each key is stored as "<prefix><key>" holding {"version", "value"} JSON,
+    plus "<prefix><key>:version" so readers can poll the version alone.
+    """
+
+    def __init__(self, client, prefix: str = "statscout:"):
+        """
+        Args:
+            client: redis.Redis-compatible client (or MemoryRedis)
+            prefix: Namespace for this app's keys
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Tuple[int, Any]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return 0, None
+        entry = json.loads(raw)
+        return entry["version"], entry["value"]
+
+    def version(self, key: str) -> int:
+        raw = self.client.get(f"{self.prefix}{key}:version")
+        return int(raw) if raw is not None else 0
+
+    def set(self, key: str, value: Any) -> int:
+        # Version bump and payload in one script, so concurrent writers
+        # can't leave an older payload under a newer version
+        return int(self.client.eval(
+            SET_VERSIONED_SCRIPT, 2, self.prefix + key, f"{self.prefix}{key}:version", json.dumps(value)
+        ))
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        # Compare-and-renew in one script: a lease that lapsed and was taken
+        # by another worker is never overwritten
+        return bool(self.client.eval(
+            ACQUIRE_LOCK_SCRIPT, 1, f"{self.prefix}lock:{name}", owner, max(1, int(ttl))
+        ))
+
+    def release_lock(self, name: str, owner: str):
+        self.client.eval(RELEASE_LOCK_SCRIPT, 1, f"{self.prefix}lock:{name}", owner)
+
+
+def create_backend(url: str = None) -> CacheBackend:
+    """
+    Create a cache backend from a URL (see module docstring)
+
+    Args:
+        url: Backend URL (default: CACHE_URL environment variable, then SQLite)
+
+    Returns:
+        CacheBackend instance
+    """
+    url = url or os.getenv("CACHE_URL") or f"sqlite:///{DEFAULT_CACHE_DB}"
+
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        try:
+            import redis
+        except ImportError:
+            print("[WARNING] CACHE_URL points at Redis but the redis package isn't installed, using SQLite")
+            return SQLiteCacheBackend(DEFAULT_CACHE_DB)
+        print("[INFO] Using Redis shared cache")
+        return RedisCacheBackend(redis.Redis.from_url(url))
+
+    if url.startswith("memory://"):
+        return RedisCacheBackend(MemoryRedis())
+
+    if url.startswith("sqlite:///"):
+        return SQLiteCacheBackend(url[len("sqlite:///"):])
+
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+
+_default_backend = None
+_default_lock = threading.Lock()
+
+
+def get_backend() -> CacheBackend:
+    """Process-wide backend created from CACHE_URL on first use"""
+    global _default_backend
+    if _default_backend is None:
+        with _default_lock:
+            if _default_backend is None:
+                _default_backend = create_backend()
+    return _default_backend
+
+
+class SharedValue:
+    """
+    One cache entry plus this process's copy of it
+
+    publish() writes a new value for every worker; sync() pulls it in when
+    another worker published a newer version. Version checks are throttled
+    to one every check_interval seconds, so calling sync() on every request
+    is cheap.
+    """
+
+    def __init__(self, key: str, backend: CacheBackend = None, check_interval: float = 1.0):
+        """
+        Args:
+            key: Cache key
+            backend: CacheBackend (default: get_backend())
+            check_interval: Minimum seconds between version checks
+        """
+        self.key = key
+        self.backend = backend or get_backend()
+        self.check_interval = check_interval
+        self.version = 0
+        self.value = None
+        self._checked_at = 0.0
+
+    def publish(self, value: Any) -> int:
+        """Store a new value for every worker (and keep it as the local copy)"""
+        self.version = self.backend.set(self.key, value)
+        self.value = value
+        self._checked_at = time.monotonic()
+        return self.version
+
+    def sync(self, force: bool = False) -> bool:
+        """
+        Pull the shared value if another worker published a newer one
+
+        Args:
+            force: Check now even if checked within check_interval
+
+        Returns:
+            True if the local copy changed
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+
+        try:
+            if self.backend.version(self.key) == self.version:
+                return False
+            version, value = self.backend.get(self.key)
+        except Exception as e:
+            print(f"[WARNING] Shared cache read failed for {self.key}: {e}")
+            return False
+
+        if version == self.version:
+            return False
+        self.version = version
+        self.value = value
+        return True
+
+
+class LeaderLock:
+    """
+    Lease-based lock naming one process the leader
+
+    The holder must renew() more often than every ttl seconds; if it dies,
+    the lease expires and another process takes over on its next renew().
+    """
+
+    def __init__(self, name: str, backend: CacheBackend = None, ttl: float = 60.0):
+        """
+        Args:
+            name: Lock name
+            backend: CacheBackend (default: get_backend())
+            ttl: Lease length in seconds
+        """
+        self.name = name
+        self.backend = backend or get_backend()
+        self.ttl = ttl
+        self.owner = f"{os.getpid()}-{id(self):x}-{time.time():.6f}"
+        self.is_leader = False
+
+    def renew(self) -> bool:
+        """Take or extend the lease; returns whether this process is the leader"""
+        try:
+            self.is_leader = self.backend.acquire_lock(self.name, self.owner, self.ttl)
+        except Exception as e:
+            print(f"[WARNING] Leader lock check failed: {e}")
+            self.is_leader = False
+        return self.is_leader
+
+    def release(self):
+        """Give up the lease (if held)"""
+        if self.is_leader:
+            try:
+                self.backend.release_lock(self.name, self.owner)
+            except Exception as e:
+                print(f"[WARNING] Could not release leader lock: {e}")
+        self.is_leader = False
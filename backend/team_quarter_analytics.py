@@ -3,8 +3,11 @@ Team Quarter Analytics Calculator
 Analyzes team quarter performance trends, averages, and insights
 """
 
-from models import TeamGame, get_engine, get_session
-from sqlalchemy import func
+from models import TeamGame, TeamQuarterSummary, get_engine, get_session
+from team_quarter_summary import (
+    rebuild_team_quarter_summary, summary_averages, summary_win_correlation, summary_head_to_head
+)
+from sqlalchemy import and_, or_
 from typing import Dict, List, Any
 
 
@@ -14,154 +17,105 @@ class TeamQuarterAnalytics:
     def __init__(self):
         self.engine = get_engine()
         self.session = get_session(self.engine)
+        self._summarized_seasons = set()  # Seasons known to have summary rows
+        self._summary_marker = None
+
+    @property
+    def version(self) -> int:
+        """Shared version of team_quarter_summary (bumped by notify_summary_changed)"""
+        if self._summary_marker is None:
+            from shared_cache import SharedValue
+            self._summary_marker = SharedValue("team_quarters")
+        self._summary_marker.sync()
+        return self._summary_marker.version
+
+    def _ensure_summary(self, season: str):
+        """Backfill team_quarter_summary for a season that has games but no summary yet"""
+        if season in self._summarized_seasons:
+            return
+
+        # Databases created before the summary table existed
+        TeamQuarterSummary.__table__.create(self.engine, checkfirst=True)
+
+        has_summary = self.session.query(TeamQuarterSummary.team).filter_by(season=season).first()
+        if not has_summary and self.session.query(TeamGame.id).filter_by(season=season).first():
+            try:
+                rows = rebuild_team_quarter_summary(self.session, season)
+                self.session.commit()
+                print(f"[INFO] Built team quarter summary for {season} ({rows} rows)")
+                has_summary = True
+            except Exception as e:
+                # Another worker may have built it at the same time
+                self.session.rollback()
+                print(f"[WARNING] Could not build team quarter summary: {e}")
+                has_summary = self.session.query(TeamQuarterSummary.team).filter_by(season=season).first()
+
+        if has_summary:
+            self._summarized_seasons.add(season)
+
+    def _read_summaries(self, season: str, wanted: Dict[str, List[str]]) -> Dict[tuple, TeamQuarterSummary]:
+        """
+        Read summary rows for several teams in one primary-key query
+
+        Args:
+            season: Season string
+            wanted: {team: [splits]}
+
+        Returns:
+            Dict of {(team, split): TeamQuarterSummary}
+        """
+        self._ensure_summary(season)
+
+        rows = self.session.query(TeamQuarterSummary).filter(
+            TeamQuarterSummary.season == season,
+            or_(*[
+                and_(TeamQuarterSummary.team == team, TeamQuarterSummary.split.in_(splits))
+                for team, splits in wanted.items()
+            ])
+        ).populate_existing().all()  # Pick up updates made by the fetcher
+
+        return {(row.team, row.split): row for row in rows}
 
     def get_team_quarter_averages(self, team_abbr: str, season: str = "2025-26") -> Dict[str, Any]:
         """Get team's average points per quarter"""
-
-        games = self.session.query(TeamGame).filter_by(
-            team=team_abbr,
-            season=season
-        ).all()
-
-        if not games:
-            return None
-
-        # Calculate averages
-        q1_avg = sum(g.q1_points for g in games if g.q1_points) / len([g for g in games if g.q1_points])
-        q2_avg = sum(g.q2_points for g in games if g.q2_points) / len([g for g in games if g.q2_points])
-        q3_avg = sum(g.q3_points for g in games if g.q3_points) / len([g for g in games if g.q3_points])
-        q4_avg = sum(g.q4_points for g in games if g.q4_points) / len([g for g in games if g.q4_points])
-
-        # First and second half averages
-        h1_games = [g.first_half_points for g in games if g.first_half_points is not None]
-        h2_games = [g.second_half_points for g in games if g.second_half_points is not None]
-
-        h1_avg = sum(h1_games) / len(h1_games) if h1_games else 0
-        h2_avg = sum(h2_games) / len(h2_games) if h2_games else 0
-
-        # Three quarter average
-        three_q_games = [g.three_quarter_points for g in games if g.three_quarter_points is not None]
-        three_q_avg = sum(three_q_games) / len(three_q_games) if three_q_games else 0
-
-        # How often they reach 100+ by Q3
-        reached_100_count = sum(1 for g in games if g.reached_100_by_q3)
-        reached_100_pct = (reached_100_count / len(games)) * 100 if games else 0
-
-        return {
-            'team': team_abbr,
-            'total_games': len(games),
-            'q1_avg': round(q1_avg, 1),
-            'q2_avg': round(q2_avg, 1),
-            'q3_avg': round(q3_avg, 1),
-            'q4_avg': round(q4_avg, 1),
-            'first_half_avg': round(h1_avg, 1),
-            'second_half_avg': round(h2_avg, 1),
-            'three_quarter_avg': round(three_q_avg, 1),
-            'reached_100_by_q3_count': reached_100_count,
-            'reached_100_by_q3_pct': round(reached_100_pct, 1)
-        }
+        row = self._read_summaries(season, {team_abbr: ['all']}).get((team_abbr, 'all'))
+        return summary_averages(row) if row and row.games else None
 
     def get_quarter_win_correlation(self, team_abbr: str, season: str = "2025-26") -> Dict[str, Any]:
         """Analyze correlation between leading after each quarter and winning"""
-
-        games = self.session.query(TeamGame).filter_by(
-            team=team_abbr,
-            season=season
-        ).all()
-
-        if not games:
-            return None
-
-        # Track wins when leading after each quarter
-        q1_leads = []
-        q2_leads = []  # Halftime
-        q3_leads = []
-
-        for game in games:
-            # Get opponent game data to compare
-            opponent_game = self.session.query(TeamGame).filter_by(
-                game_id=game.game_id.replace(f"_{team_abbr}", f"_{game.opponent}"),
-                season=season
-            ).first()
-
-            if not opponent_game:
-                continue
-
-            # Q1 lead
-            if game.q1_points and opponent_game.q1_points:
-                leading_q1 = game.q1_points > opponent_game.q1_points
-                q1_leads.append({'leading': leading_q1, 'won': game.won})
-
-            # Halftime lead
-            if game.first_half_points and opponent_game.first_half_points:
-                leading_h1 = game.first_half_points > opponent_game.first_half_points
-                q2_leads.append({'leading': leading_h1, 'won': game.won})
-
-            # Q3 lead
-            if game.three_quarter_points and opponent_game.three_quarter_points:
-                leading_q3 = game.three_quarter_points > opponent_game.three_quarter_points
-                q3_leads.append({'leading': leading_q3, 'won': game.won})
-
-        # Calculate win percentages when leading
-        q1_lead_wins = sum(1 for x in q1_leads if x['leading'] and x['won'])
-        q1_lead_total = sum(1 for x in q1_leads if x['leading'])
-
-        h1_lead_wins = sum(1 for x in q2_leads if x['leading'] and x['won'])
-        h1_lead_total = sum(1 for x in q2_leads if x['leading'])
-
-        q3_lead_wins = sum(1 for x in q3_leads if x['leading'] and x['won'])
-        q3_lead_total = sum(1 for x in q3_leads if x['leading'])
-
-        return {
-            'team': team_abbr,
-            'when_leading_after_q1': {
-                'record': f"{q1_lead_wins}-{q1_lead_total - q1_lead_wins}",
-                'win_pct': round((q1_lead_wins / q1_lead_total) * 100, 1) if q1_lead_total > 0 else 0
-            },
-            'when_leading_at_halftime': {
-                'record': f"{h1_lead_wins}-{h1_lead_total - h1_lead_wins}",
-                'win_pct': round((h1_lead_wins / h1_lead_total) * 100, 1) if h1_lead_total > 0 else 0
-            },
-            'when_leading_after_q3': {
-                'record': f"{q3_lead_wins}-{q3_lead_total - q3_lead_wins}",
-                'win_pct': round((q3_lead_wins / q3_lead_total) * 100, 1) if q3_lead_total > 0 else 0
-            }
-        }
+        row = self._read_summaries(season, {team_abbr: ['all']}).get((team_abbr, 'all'))
+        return summary_win_correlation(row) if row and row.games else None
 
     def get_matchup_quarter_analysis(self, team1: str, team2: str, season: str = "2025-26") -> Dict[str, Any]:
         """Get quarter analysis for a team vs team matchup"""
 
-        team1_avg = self.get_team_quarter_averages(team1, season)
-        team2_avg = self.get_team_quarter_averages(team2, season)
+        # Both teams' overall and home/away rows plus head-to-head in one read
+        rows = self._read_summaries(season, {
+            team1: ['all', 'home', 'away', f"vs_{team2}"],
+            team2: ['all', 'home', 'away']
+        })
 
-        if not team1_avg or not team2_avg:
+        team1_row = rows.get((team1, 'all'))
+        team2_row = rows.get((team2, 'all'))
+        if not team1_row or not team1_row.games or not team2_row or not team2_row.games:
             return None
 
-        # Get head-to-head history if exists
-        h2h_games = self.session.query(TeamGame).filter_by(
-            team=team1,
-            opponent=team2,
-            season=season
-        ).all()
-
-        h2h_summary = None
-        if h2h_games:
-            avg_q1 = sum(g.q1_points for g in h2h_games if g.q1_points) / len(h2h_games)
-            avg_total = sum(g.total_points for g in h2h_games) / len(h2h_games)
-            wins = sum(1 for g in h2h_games if g.won)
-
-            h2h_summary = {
-                'games_played': len(h2h_games),
-                'record': f"{wins}-{len(h2h_games) - wins}",
-                'avg_q1_vs_opponent': round(avg_q1, 1),
-                'avg_total_vs_opponent': round(avg_total, 1)
+        team1_avg = summary_averages(team1_row)
+        team2_avg = summary_averages(team2_row)
+
+        splits = {}
+        for team in (team1, team2):
+            splits[team] = {
+                split: summary_averages(rows[(team, split)]) if (team, split) in rows else None
+                for split in ('home', 'away')
             }
 
         return {
             'matchup': f"{team1} vs {team2}",
             'team1': team1_avg,
             'team2': team2_avg,
-            'head_to_head': h2h_summary,
+            'home_away_splits': splits,
+            'head_to_head': summary_head_to_head(rows.get((team1, f"vs_{team2}"))),
             'insights': self._generate_matchup_insights(team1_avg, team2_avg)
         }
 
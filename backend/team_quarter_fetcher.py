@@ -6,8 +6,9 @@ Fetches quarter-by-quarter scoring data for all NBA teams from the 2025-26 seaso
 from nba_api.stats.endpoints import leaguegamefinder, boxscoresummaryv2
 from nba_api.stats.static import teams as nba_teams
 from models import TeamGame, get_engine, get_session, init_db
+from team_quarter_summary import record_team_game, notify_summary_changed
 from datetime import datetime
-import time
+import rate_limiter
 
 
 class TeamQuarterFetcher:
@@ -39,10 +40,6 @@ class TeamQuarterFetcher:
                 games_added = self.fetch_team_quarter_data(team_id, team_abbr, team_name)
                 total_games_added += games_added
 
-                # Rate limiting - be nice to NBA API
-                if idx < len(all_teams):
-                    time.sleep(0.6)
-
             except Exception as e:
                 print(f"[ERROR] Failed to fetch data for {team_name}: {e}")
                 continue
@@ -54,6 +51,7 @@ class TeamQuarterFetcher:
         """Fetch quarter data for a specific team"""
 
         # Find all games for this team in the season
+        rate_limiter.acquire(rate_limiter.NBA_STATS)
         gamefinder = leaguegamefinder.LeagueGameFinder(
             team_id_nullable=team_id,
             season_nullable=self.season,
@@ -89,14 +87,14 @@ class TeamQuarterFetcher:
                     # Create TeamGame record
                     team_game = TeamGame(**quarter_data)
                     self.session.add(team_game)
+                    # Keep team_quarter_summary in step (same transaction)
+                    record_team_game(self.session, team_game)
                     games_added += 1
 
                     # Commit every 10 games
                     if games_added % 10 == 0:
                         self.session.commit()
-
-                # Rate limiting
-                time.sleep(0.6)
+                        notify_summary_changed()
 
             except Exception as e:
                 print(f"    Error fetching game {game_id}: {e}")
@@ -104,6 +102,8 @@ class TeamQuarterFetcher:
 
         # Final commit
         self.session.commit()
+        if games_added:
+            notify_summary_changed()
         print(f"  Added {games_added} new games to database")
 
         return games_added
@@ -113,6 +113,7 @@ class TeamQuarterFetcher:
 
         try:
             # Fetch box score summary
+            rate_limiter.acquire(rate_limiter.NBA_STATS)
             box_summary = boxscoresummaryv2.BoxScoreSummaryV2(game_id=game_id)
             line_score_df = box_summary.line_score.get_data_frame()
 
@@ -0,0 +1,251 @@
+"""
+Team Quarter Summary
+Maintains the team_quarter_summary table: running quarter totals per
+(team, season, split) so the quarter endpoints read one team's rows instead
+of aggregating every TeamGame on each request
+"""
+
+import time
+from models import TeamGame, TeamQuarterSummary
+from typing import Dict, Any, Optional
+
+# Counter columns (everything except the primary key)
+SUMMARY_COUNTERS = [
+    column.name for column in TeamQuarterSummary.__table__.columns
+    if column.name not in ('team', 'season', 'split')
+]
+
+
+def game_splits(game) -> list:
+    """Summary splits a team game counts towards"""
+    return ['all', 'home' if game.is_home else 'away', f"vs_{game.opponent}"]
+
+
+def opponent_game_id(game) -> str:
+    """game_id of the other side of a team game (ids are "<nba id>_<TEAM>")"""
+    return game.game_id.replace(f"_{game.team}", f"_{game.opponent}")
+
+
+def _add_game_totals(row, game):
+    """Fold one team's side of a game into a summary row"""
+    row['games'] += 1
+    row['wins'] += 1 if game.won else 0
+    row['points_sum'] += game.total_points or 0
+    row['opponent_points_sum'] += game.opponent_points or 0
+
+    for quarter in ('q1', 'q2', 'q3', 'q4'):
+        points = getattr(game, f"{quarter}_points")
+        if points:
+            row[f"{quarter}_sum"] += points
+            row[f"{quarter}_count"] += 1
+
+    if game.q1_points is not None and game.q2_points is not None:
+        row['first_half_sum'] += game.q1_points + game.q2_points
+        row['first_half_count'] += 1
+
+    if game.q3_points is not None and game.q4_points is not None:
+        row['second_half_sum'] += game.q3_points + game.q4_points
+        row['second_half_count'] += 1
+
+    if game.q1_points is not None and game.q2_points is not None and game.q3_points is not None:
+        three_q = game.q1_points + game.q2_points + game.q3_points
+        row['three_quarter_sum'] += three_q
+        row['three_quarter_count'] += 1
+        if three_q >= 100:
+            row['reached_100_by_q3'] += 1
+
+
+def _running_points(game):
+    """Points after Q1, at halftime and after Q3 (None where quarters are missing)"""
+    q1, q2, q3 = game.q1_points, game.q2_points, game.q3_points
+    first_half = q1 + q2 if q1 is not None and q2 is not None else None
+    three_q = first_half + q3 if first_half is not None and q3 is not None else None
+    return q1, first_half, three_q
+
+
+def _add_game_leads(row, game, opponent_game):
+    """Fold whether the team led after Q1/halftime/Q3 (and won) into a summary row"""
+    for (points, opponent_points), led, won_led in zip(
+        zip(_running_points(game), _running_points(opponent_game)),
+        ('led_after_q1', 'led_at_half', 'led_after_q3'),
+        ('won_led_after_q1', 'won_led_at_half', 'won_led_after_q3')
+    ):
+        # Same rule as the original per-game comparison: skip missing/zero values
+        if points and opponent_points and points > opponent_points:
+            row[led] += 1
+            if game.won:
+                row[won_led] += 1
+
+
+class _SummaryRows:
+    """Summary rows being updated, fetched or created on demand"""
+
+    def __init__(self, session=None):
+        self.session = session
+        self.rows = {}
+
+    def get(self, team, season, split):
+        key = (team, season, split)
+        row = self.rows.get(key)
+        if row is None:
+            summary = self.session.get(TeamQuarterSummary, key) if self.session else None
+            if summary is None:
+                summary = TeamQuarterSummary(team=team, season=season, split=split,
+                                             **{counter: 0 for counter in SUMMARY_COUNTERS})
+                if self.session:
+                    self.session.add(summary)
+            row = self.rows[key] = _RowProxy(summary)
+        return row
+
+
+class _RowProxy:
+    """Dict-style access to a TeamQuarterSummary's counters"""
+
+    def __init__(self, summary):
+        self.summary = summary
+
+    def __getitem__(self, column):
+        return getattr(self.summary, column) or 0
+
+    def __setitem__(self, column, value):
+        setattr(self.summary, column, value)
+
+
+def record_team_game(session, game) -> None:
+    """
+    Fold a newly added TeamGame into team_quarter_summary
+
+    Call once per inserted game, in the same transaction. Lead records need
+    both sides of a game, so they are added for both teams when the second
+    side arrives.
+
+    If the season has no summary rows yet (e.g. team_games predates the
+    summary table), the season is rebuilt from team_games instead - which
+    includes this game - so the incremental totals never start from a
+    partial table.
+
+    Args:
+        session: Database session the game was added to
+        game: The new TeamGame
+    """
+    session.flush()  # The game must be visible to the queries below
+    if not session.query(TeamQuarterSummary.team).filter_by(season=game.season).first():
+        rows_written = rebuild_team_quarter_summary(session, game.season)
+        print(f"[INFO] Backfilled team quarter summary for {game.season} ({rows_written} rows)")
+        return
+
+    rows = _SummaryRows(session)
+
+    for split in game_splits(game):
+        _add_game_totals(rows.get(game.team, game.season, split), game)
+
+    opponent_game = session.query(TeamGame).filter_by(
+        game_id=opponent_game_id(game),
+        season=game.season
+    ).first()
+
+    if opponent_game:
+        for side, other in ((game, opponent_game), (opponent_game, game)):
+            for split in game_splits(side):
+                _add_game_leads(rows.get(side.team, side.season, split), side, other)
+
+    session.flush()
+
+
+def notify_summary_changed():
+    """
+    Tell every worker that team_quarter_summary changed (after committing)
+
+    Bumps the shared "team_quarters" version that TeamQuarterAnalytics.version
+    reports, which keys the HTTP cache of the quarter endpoints.
+    """
+    try:
+        from shared_cache import SharedValue
+        SharedValue("team_quarters").publish({"updated_at": time.time()})
+    except Exception as e:
+        print(f"[WARNING] Could not publish team quarter update: {e}")
+
+
+def rebuild_team_quarter_summary(session, season: str = "2025-26") -> int:
+    """
+    Recompute a season's summary rows from team_games
+
+    Used to backfill the table (or after team_games was edited outside
+    TeamQuarterFetcher). Does not commit.
+
+    Args:
+        session: Database session
+        season: Season string (e.g., "2025-26")
+
+    Returns:
+        Number of summary rows written
+    """
+    games = session.query(TeamGame).filter_by(season=season).all()
+    by_game_id = {game.game_id: game for game in games}
+
+    rows = _SummaryRows()
+    for game in games:
+        splits = game_splits(game)
+        for split in splits:
+            _add_game_totals(rows.get(game.team, season, split), game)
+
+        opponent_game = by_game_id.get(opponent_game_id(game))
+        if opponent_game:
+            for split in splits:
+                _add_game_leads(rows.get(game.team, season, split), game, opponent_game)
+
+    session.query(TeamQuarterSummary).filter_by(season=season).delete()
+    session.add_all(row.summary for row in rows.rows.values())
+    session.flush()
+
+    return len(rows.rows)
+
+
+def _average(total, count):
+    return total / count if count else 0
+
+
+def summary_averages(row) -> Dict[str, Any]:
+    """Quarter averages in the shape returned by get_team_quarter_averages"""
+    return {
+        'team': row.team,
+        'total_games': row.games,
+        'q1_avg': round(_average(row.q1_sum, row.q1_count), 1),
+        'q2_avg': round(_average(row.q2_sum, row.q2_count), 1),
+        'q3_avg': round(_average(row.q3_sum, row.q3_count), 1),
+        'q4_avg': round(_average(row.q4_sum, row.q4_count), 1),
+        'first_half_avg': round(_average(row.first_half_sum, row.first_half_count), 1),
+        'second_half_avg': round(_average(row.second_half_sum, row.second_half_count), 1),
+        'three_quarter_avg': round(_average(row.three_quarter_sum, row.three_quarter_count), 1),
+        'reached_100_by_q3_count': row.reached_100_by_q3,
+        'reached_100_by_q3_pct': round(_average(row.reached_100_by_q3, row.games) * 100, 1)
+    }
+
+
+def _lead_record(wins, total):
+    return {
+        'record': f"{wins}-{total - wins}",
+        'win_pct': round((wins / total) * 100, 1) if total > 0 else 0
+    }
+
+
+def summary_win_correlation(row) -> Dict[str, Any]:
+    """Lead-after-quarter records in the shape returned by get_quarter_win_correlation"""
+    return {
+        'team': row.team,
+        'when_leading_after_q1': _lead_record(row.won_led_after_q1, row.led_after_q1),
+        'when_leading_at_halftime': _lead_record(row.won_led_at_half, row.led_at_half),
+        'when_leading_after_q3': _lead_record(row.won_led_after_q3, row.led_after_q3)
+    }
+
+
+def summary_head_to_head(row) -> Optional[Dict[str, Any]]:
+    """Head-to-head summary from a 'vs_<OPP>' row (None if they haven't played)"""
+    if row is None or not row.games:
+        return None
+    return {
+        'games_played': row.games,
+        'record': f"{row.wins}-{row.games - row.wins}",
+        'avg_q1_vs_opponent': round(row.q1_sum / row.games, 1),
+        'avg_total_vs_opponent': round(row.points_sum / row.games, 1)
+    }
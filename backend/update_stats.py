@@ -5,11 +5,17 @@ Uses hybrid approach: nba_api for historical data + ESPN for recent games
 """
 import sys
 import io
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
-from nba_stats_fetcher import NBAStatsFetcher
+from nba_stats_fetcher import NBAStatsFetcher, game_log_rows
 from espn_recent_games_scraper import ESPNAPIClient
-from models import get_engine, get_session, Player, Game
-import time
+from models import (get_engine, get_session, Player, Game, IngestedEvent, UpdateJob, bulk_upsert_games,
+                    ensure_games_unique_index)
+from game_store import notify_games_changed
+from shared_cache import LeaderLock
+from sqlalchemy import func
+import pandas as pd
 
 # Force UTF-8 output only if not already wrapped
 if not isinstance(sys.stdout, io.TextIOWrapper) or sys.stdout.encoding != 'utf-8':
@@ -18,6 +24,24 @@ if not isinstance(sys.stdout, io.TextIOWrapper) or sys.stdout.encoding != 'utf-8
     except:
         pass  # Already wrapped or can't wrap
 
+# ESPN supplement: game rows per insert/commit
+ESPN_BATCH_SIZE = 500
+
+# Per-player mode: players loaded per page (also the most players between checkpoints)
+PLAYER_BATCH_SIZE = 20
+
+# Per-player mode: game logs fetched in parallel (paced by the NBA stats rate budget)
+UPDATE_WORKERS = 4
+
+# Per-player mode: new game rows per writer commit
+WRITE_BATCH_ROWS = 200
+
+# Unfinished jobs older than this are not resumed (a new run starts instead)
+JOB_RESUME_WINDOW = timedelta(hours=12)
+
+# Lease held by the process running an update (shared by all workers/instances)
+UPDATE_LOCK_NAME = "stats_update"
+
 
 def get_last_game_date(session, player_name):
     """Get the date of the most recent game for a player"""
@@ -29,6 +53,42 @@ def get_last_game_date(session, player_name):
     return last_game.date if last_game else None
 
 
+def new_game_rows(player_id, games, last_date=None):
+    """
+    Game rows to insert for a player's fetched games
+
+    Args:
+        player_id: Player's database id
+        games: Formatted games from NBAStatsFetcher.fetch_player_season
+        last_date: Date of the player's most recent stored game (older games are skipped)
+
+    Returns:
+        List of dicts with Game column values
+    """
+    rows = []
+    for game in games:
+        game_date = datetime.strptime(game['date'], '%Y-%m-%d').date()
+
+        # Skip if we already have this game
+        if last_date and game_date <= last_date:
+            continue
+
+        rows.append({
+            'player_id': player_id,
+            'date': game_date,
+            'opponent': game['opponent'],
+            'is_home': bool(game['is_home']),
+            'points': int(game['points']),
+            'rebounds': int(game['rebounds']),
+            'assists': int(game['assists']),
+            'steals': int(game['steals']),
+            'blocks': int(game['blocks']),
+            'three_pm': int(game['three_pm']),
+            'minutes': game.get('minutes')
+        })
+    return rows
+
+
 def update_player_stats(session, fetcher, player_name, team, position, season="2025-26"):
     """Fetch and update stats for a single player"""
 
@@ -64,44 +124,11 @@ def update_player_stats(session, fetcher, player_name, team, position, season="2
             player.team = team
 
     # Filter to only NEW games (after last_date)
-    new_games = []
-    for game in games:
-        game_date = datetime.strptime(game['date'], '%Y-%m-%d').date()
-
-        # Skip if we already have this game
-        if last_date and game_date <= last_date:
-            continue
-
-        # Check if game already exists (by date only - ignore opponent abbreviation differences)
-        existing = session.query(Game).filter_by(
-            player_id=player.id,
-            date=game_date
-        ).first()
-
-        if existing:
-            continue
-
-        new_games.append(game)
-
-    # Add new games to database
-    games_added = 0
-    for game in new_games:
-        game_date = datetime.strptime(game['date'], '%Y-%m-%d').date()
+    new_rows = new_game_rows(player.id, games, last_date)
 
-        new_game = Game(
-            player_id=player.id,
-            date=game_date,
-            opponent=game['opponent'],
-            is_home=bool(game['is_home']),
-            points=int(game['points']),
-            rebounds=int(game['rebounds']),
-            assists=int(game['assists']),
-            steals=int(game['steals']),
-            blocks=int(game['blocks']),
-            three_pm=int(game['three_pm'])
-        )
-        session.add(new_game)
-        games_added += 1
+    # Add new games to database (dates we already have are skipped by the
+    # unique player/date index - ignores opponent abbreviation differences)
+    games_added = bulk_upsert_games(session, new_rows)
 
     if games_added > 0:
         session.commit()
@@ -112,15 +139,109 @@ def update_player_stats(session, fetcher, player_name, team, position, season="2
     return games_added
 
 
-def add_espn_recent_games(session, days_back=7):
+def update_players_from_league_log(session, fetcher, season="2025-26", added_rows=None):
+    """
+    Fetch new games for every player from one league-wide game log
+
+    Pulls a single leaguegamelog covering the date range since the oldest
+    "last game" in the database and writes all new games with one batched
+    upsert (games already stored are skipped by the unique player/date
+    index).
+
+    Args:
+        session: Database session
+        fetcher: NBAStatsFetcher instance
+        season: Season string (e.g., "2025-26")
+        added_rows: Optional list to extend with the rows written, when every
+                    queued row was inserted (lets the game stores append them
+                    instead of reloading)
+
+    Returns:
+        Tuple of (games added, players with new games), or None if the
+        league game log could not be fetched
+    """
+    # Each player's last game date in one query (players without games get None)
+    last_dates = dict(
+        session.query(Player.id, func.max(Game.date))
+        .outerjoin(Game, Game.player_id == Player.id)
+        .group_by(Player.id)
+        .all()
+    )
+    players = session.query(Player).all()
+    players_by_name = {player.name: player for player in players}
+
+    # Start from the oldest last-game date (or the season start if any player has no games)
+    if not last_dates or any(d is None for d in last_dates.values()):
+        date_from = None
+    else:
+        date_from = min(last_dates.values())
+
+    game_logs_df = fetcher.fetch_league_game_logs(season, date_from=date_from)
+    if game_logs_df is None:
+        return None
+
+    id_map = fetcher.build_player_id_map(list(players_by_name))
+
+    # Parse the whole log at once, then keep our players' rows with a date
+    batch = fetcher.parse_game_log(game_logs_df)
+    our_ids = {nba_id: players_by_name[name].id for nba_id, name in id_map.items()}
+    player_ids = batch['nba_player_id'].map(our_ids)
+    bad_dates = player_ids.notna() & batch['game_date'].isna()
+    if bad_dates.any():
+        print(f"[WARNING] Dropped {int(bad_dates.sum())} league game log rows with unparseable dates "
+              f"(e.g. {batch.loc[bad_dates, 'date_str'].iloc[0]!r})")
+    keep = player_ids.notna() & batch['game_date'].notna()
+    batch, player_ids = batch[keep], player_ids[keep].astype(int)
+
+    # Logs without a team column keep each player's current team
+    current_teams = {player.id: player.team for player in players}
+    teams = batch['team'].fillna(player_ids.map(current_teams))
+
+    # Most recent team per player (first row on the latest date)
+    by_date = batch['game_date'].sort_values(ascending=False, kind='stable')
+    latest = player_ids[by_date.index].drop_duplicates(keep='first')
+    latest_team = dict(zip(latest.tolist(), teams[latest.index].tolist()))
+
+    # Skip games up to the player's last game and duplicates within the log
+    last_game = pd.to_datetime(player_ids.map(last_dates))
+    is_new = last_game.isna() | (batch['game_date'] > last_game)
+    new_games = pd.DataFrame({'player_id': player_ids, 'game_date': batch['game_date']})[is_new]
+    new_games = new_games.drop_duplicates(['player_id', 'game_date'], keep='first')
+
+    new_rows = game_log_rows(batch.loc[new_games.index], new_games['player_id'])
+
+    # Update teams in case of trades
+    for player in players:
+        if player.id in latest_team and player.team != latest_team[player.id]:
+            print(f"  [INFO] Team change detected for {player.name}: {player.team} -> {latest_team[player.id]}")
+            player.team = latest_team[player.id]
+
+    games_added = bulk_upsert_games(session, new_rows)
+    session.commit()
+
+    if added_rows is not None and games_added == len(new_rows):
+        added_rows.extend(new_rows)
+
+    players_updated = len(set(row['player_id'] for row in new_rows))
+    print(f"[SUCCESS] Added {games_added} new games for {players_updated} players")
+
+    return games_added, players_updated
+
+
+def add_espn_recent_games(session, days_back=7, batch_size=ESPN_BATCH_SIZE):
     """
     Add recent games from ESPN to supplement nba_api data
 
+    Box scores for the whole date range are fetched concurrently (see
+    ESPNAPIClient.iter_box_scores) and written in batches as they arrive.
+    Finished games already ingested on an earlier run are not fetched again.
+
     Note: Reduced to 7 days to avoid memory issues on free tier
 
     Args:
         session: Database session
         days_back: How many days to look back (default 7)
+        batch_size: Game rows per insert/commit
 
     Returns:
         Number of games added from ESPN
@@ -132,105 +253,317 @@ def add_espn_recent_games(session, days_back=7):
 
     espn_client = ESPNAPIClient()
     total_added = 0
-    games_batch = []
-    batch_size = 50  # Commit in smaller batches to reduce memory
+
+    # Name -> id lookup in one query instead of one per performance
+    player_ids = dict(session.query(Player.name, Player.id).all())
 
     try:
-        # Fetch player stats for each day
         today = datetime.now()
+        dates = [(today - timedelta(days=days_ago)).strftime("%Y%m%d") for days_ago in range(days_back)]
+        oldest = (today - timedelta(days=days_back)).date()
+
+        # Finished games stored by earlier runs
+        IngestedEvent.__table__.create(session.connection(), checkfirst=True)
+        ingested = {
+            event_id for (event_id,) in
+            session.query(IngestedEvent.event_id).filter(IngestedEvent.date >= oldest).all()
+        }
+        if ingested:
+            print(f"[INFO] Skipping {len(ingested)} games already ingested")
+
+        pending_rows = []
+        pending_events = []
+        games_fetched = 0
+
+        def flush():
+            """Insert the pending rows and mark their games ingested (one commit)"""
+            nonlocal total_added
+            # Games already in the database are skipped, by player and date
+            # only - ignores opponent abbreviation differences
+            added = bulk_upsert_games(session, pending_rows)
+            session.add_all(pending_events)
+            session.commit()
+            total_added += added
+            if added:
+                print(f"  [COMMIT] Saved {added} new games ({len(pending_events)} box scores)")
+            pending_rows.clear()
+            pending_events.clear()
 
-        for days_ago in range(days_back):
-            date_to_fetch = today - timedelta(days=days_ago)
-            date_str = date_to_fetch.strftime("%Y%m%d")
-
-            print(f"\n[INFO] Fetching {date_str}...")
-
-            # Get all player stats from this date
-            player_stats = espn_client.get_player_stats_from_date(date_str)
-
-            if not player_stats:
-                print(f"  No games found")
-                continue
-
-            print(f"  Found {len(player_stats)} player performances")
+        for event_id, date_str, player_stats in espn_client.iter_box_scores(dates, skip_event_ids=ingested):
+            games_fetched += 1
+            game_date = datetime.strptime(date_str, "%Y%m%d").date()
 
-            # Process each player's stats
+            # Build rows for our players (skip players not in our database)
             for stat in player_stats:
                 try:
-                    # Find player in database
-                    player = session.query(Player).filter_by(name=stat['player_name']).first()
-
-                    if not player:
-                        # Skip players not in our database
+                    player_id = player_ids.get(stat['player_name'])
+                    if not player_id:
                         continue
 
-                    # Check if game already exists (by player and date only - ignore opponent abbreviation differences)
-                    game_date = datetime.strptime(stat['date'], '%Y-%m-%d').date()
-                    existing = session.query(Game).filter_by(
-                        player_id=player.id,
-                        date=game_date
-                    ).first()
-
-                    if existing:
-                        # Game already in database
-                        continue
-
-                    # Add new game to batch
-                    new_game = Game(
-                        player_id=player.id,
-                        date=game_date,
-                        opponent=stat['opponent'],
-                        is_home=bool(stat['is_home']),
-                        points=int(stat['points']),
-                        rebounds=int(stat['rebounds']),
-                        assists=int(stat['assists']),
-                        steals=int(stat['steals']),
-                        blocks=int(stat['blocks']),
-                        three_pm=int(stat['three_pm'])
-                    )
-                    games_batch.append(new_game)
-                    total_added += 1
-
-                    # Commit in batches to reduce memory usage
-                    if len(games_batch) >= batch_size:
-                        session.bulk_save_objects(games_batch)
-                        session.commit()
-                        games_batch = []  # Clear batch
-                        print(f"  [COMMIT] Saved batch of {batch_size} games")
+                    pending_rows.append({
+                        'player_id': player_id,
+                        'date': game_date,
+                        'opponent': stat['opponent'],
+                        'is_home': bool(stat['is_home']),
+                        'points': int(stat['points']),
+                        'rebounds': int(stat['rebounds']),
+                        'assists': int(stat['assists']),
+                        'steals': int(stat['steals']),
+                        'blocks': int(stat['blocks']),
+                        'three_pm': int(stat['three_pm'])
+                    })
 
                 except Exception as e:
                     print(f"  [WARNING] Failed to add game for {stat.get('player_name')}: {e}")
                     continue
 
-            # Commit remaining games after each day
-            if games_batch:
-                session.bulk_save_objects(games_batch)
-                session.commit()
-                games_batch = []
-
-            # Rate limiting
-            time.sleep(0.5)
+            # A box score that parsed to no stat lines (missing or not yet
+            # published) is fetched again next run rather than marked done
+            if player_stats:
+                pending_events.append(IngestedEvent(event_id=event_id, date=game_date, player_games=len(player_stats)))
+            else:
+                print(f"  [WARNING] No player stats in box score {event_id}, will retry next run")
+            if len(pending_rows) >= batch_size:
+                flush()
 
-        # Final commit for any remaining games
-        if games_batch:
-            session.bulk_save_objects(games_batch)
-            session.commit()
+        if pending_rows or pending_events:
+            flush()
 
         print("\n" + "=" * 60)
-        print(f"[SUCCESS] Added {total_added} new games from ESPN")
+        print(f"[SUCCESS] Added {total_added} new games from ESPN ({games_fetched} box scores fetched)")
         print("=" * 60)
 
         return total_added
 
     except Exception as e:
+        session.rollback()
         print(f"\n[ERROR] ESPN supplement failed: {e}")
         import traceback
         traceback.print_exc()
-        return 0
+        return total_added
+
+
+def start_update_job(session, lease, season="2025-26", mode="league"):
+    """
+    Resume the latest unfinished update job for the season, or start a new one
+
+    A job is resumed if it failed (or its process died without marking it)
+    within JOB_RESUME_WINDOW; it carries on from its last checkpoint.
+    The lease is taken first, so two workers can't both see no running job
+    and start (or resume) one each; checkpoint() keeps renewing it.
+
+    Args:
+        session: Database session
+        lease: LeaderLock on UPDATE_LOCK_NAME (released by the caller)
+        season: Season string (e.g., "2025-26")
+        mode: Mode for a new job ('league' or 'player')
+
+    Returns:
+        Tuple of (UpdateJob, resumed); the job is None if another update
+        is running right now
+    """
+    if not lease.renew():
+        return None, False
+
+    UpdateJob.__table__.create(session.connection(), checkfirst=True)
+    now = datetime.now()
+
+    job = (
+        session.query(UpdateJob)
+        .filter(UpdateJob.season == season, UpdateJob.status != 'completed',
+                UpdateJob.started_at >= now - JOB_RESUME_WINDOW)
+        .order_by(UpdateJob.id.desc())
+        .first()
+    )
+
+    if job is not None and job.status == 'running' and not job.is_stale(now):
+        return None, False
+
+    if job is not None:
+        job.lease = lease
+        print(f"[INFO] Resuming update job {job.id} from phase '{job.phase}' "
+              f"({job.players_done} players done, last player id {job.last_player_id})")
+        checkpoint(session, job, status='running', error=None, resumed=job.resumed + 1)
+        return job, True
+
+    job = UpdateJob(
+        season=season,
+        mode=mode,
+        status='running',
+        phase='nba_api',
+        last_player_id=0,
+        players_total=0,
+        players_done=0,
+        players_updated=0,
+        new_games=0,
+        espn_games=0,
+        resumed=0,
+        started_at=now,
+        updated_at=now
+    )
+    job.lease = lease
+    session.add(job)
+    session.commit()
+    print(f"[INFO] Started update job {job.id}")
+    return job, False
+
+
+def checkpoint(session, job, **changes):
+    """Save job progress (and the heartbeat) in its own commit"""
+    lease = getattr(job, 'lease', None)
+    if lease is not None and not lease.renew():
+        raise RuntimeError(f"Lost the stats update lock, another process has taken over job {job.id}")
+    for field, value in changes.items():
+        setattr(job, field, value)
+    job.updated_at = datetime.now()
+    session.commit()
+
+
+def iter_players_after(session, last_player_id, batch_size=PLAYER_BATCH_SIZE):
+    """
+    Yield (id, name, team, position) for players after last_player_id, in id order
+
+    Pages by primary key rather than offset, so players added while
+    iterating don't shift the pages.
+    """
+    while True:
+        page = (
+            session.query(Player.id, Player.name, Player.team, Player.position)
+            .filter(Player.id > last_player_id)
+            .order_by(Player.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not page:
+            return
+        yield from page
+        last_player_id = page[-1].id
+
+
+def update_players_individually(
+    session,
+    fetcher,
+    job,
+    season="2025-26",
+    batch_size=PLAYER_BATCH_SIZE,
+    workers=UPDATE_WORKERS,
+    write_every=WRITE_BATCH_ROWS
+):
+    """
+    Per-player update, continuing from the job's checkpoint
+
+    Two stages: game logs are fetched on a thread pool (up to `workers`
+    requests in flight, paced by the shared NBA stats rate budget), and
+    this thread - the only one touching the database - takes the results
+    in player id order, keeps the new games and inserts them in batches.
+    Each batch is committed together with the job checkpoint, at least
+    every write_every rows or batch_size players, so a resumed job never
+    skips a player whose games weren't stored.
+
+    Args:
+        session: Database session
+        fetcher: NBAStatsFetcher instance
+        job: UpdateJob to checkpoint
+        season: Season string (e.g., "2025-26")
+        batch_size: Players loaded per page (and most players per checkpoint)
+        workers: Game logs fetched in parallel
+        write_every: New game rows per commit
 
+    Returns:
+        Number of games added by this call
+    """
+    remaining = session.query(Player).filter(Player.id > job.last_player_id).count()
+    checkpoint(session, job, players_total=job.players_done + remaining)
+    print(f"[INFO] Fetching {remaining} players with {workers} workers")
+
+    games_added = 0
+    pending_rows = []
+    pending = {"players": 0, "updated": 0, "last_player_id": job.last_player_id}
+
+    def flush():
+        """Write the pending rows and move the checkpoint past their players (one commit)"""
+        nonlocal games_added
+        added = bulk_upsert_games(session, pending_rows)
+        games_added += added
+        checkpoint(
+            session, job,
+            last_player_id=pending["last_player_id"],
+            players_done=job.players_done + pending["players"],
+            new_games=job.new_games + added,
+            players_updated=job.players_updated + pending["updated"]
+        )
+        if added:
+            print(f"  [COMMIT] Saved {added} new games ({job.players_done}/{job.players_total} players done)")
+        pending_rows.clear()
+        pending.update(players=0, updated=0)
+
+    def fetch(player):
+        """Fetch stage (pool thread): no database access"""
+        return fetcher.fetch_player_season(player.name, player.team, player.position, season)
+
+    players = iter_players_after(session, job.last_player_id, batch_size)
+    in_flight = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            # Keep a small window queued ahead of the writer
+            for player in players:
+                in_flight.append((player, executor.submit(fetch, player)))
+                if len(in_flight) >= workers * 2:
+                    break
+
+            while in_flight:
+                player, future = in_flight.popleft()
+                next_player = next(players, None)
+                if next_player is not None:
+                    in_flight.append((next_player, executor.submit(fetch, next_player)))
+
+                try:
+                    games = future.result()
+                except Exception as e:
+                    print(f"  [ERROR] Failed to fetch {player.name}: {e}")
+                    games = []
+
+                # Writer stage: keep only games after the player's last stored game
+                last_date = session.query(func.max(Game.date)).filter(Game.player_id == player.id).scalar()
+                rows = new_game_rows(player.id, games, last_date)
+                print(f"[{job.players_done + pending['players'] + 1}/{job.players_total}] "
+                      f"{player.name}: {len(rows)} new games")
+
+                pending_rows.extend(rows)
+                pending["players"] += 1
+                pending["updated"] += 1 if rows else 0
+                pending["last_player_id"] = player.id
+
+                if len(pending_rows) >= write_every or pending["players"] >= batch_size:
+                    flush()
+
+            if pending["players"]:
+                flush()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+    return games_added
+
+
+def update_all_players(season="2025-26", use_espn_supplement=True, mode="league", workers=UPDATE_WORKERS):
+    """
+    Update stats for all players in the database
+
+    Runs as a checkpointed UpdateJob: progress is saved per phase (and per
+    player in per-player mode), and a run that died part way is resumed
+    from its last checkpoint by the next call.
 
-def update_all_players(season="2025-26", use_espn_supplement=True):
-    """Update stats for all players in the database"""
+    Args:
+        season: Season string (e.g., "2025-26")
+        use_espn_supplement: Also add recent games from ESPN
+        mode: 'league' (one league-wide game log pull) or 'player'
+              (one game log request per player). League mode falls back
+              to per-player mode if the league pull fails. A resumed job
+              keeps the mode it started with.
+        workers: Game logs fetched in parallel in per-player mode
+    """
 
     print("=" * 60)
     print(f"AUTOMATED STATS UPDATE - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -239,71 +572,92 @@ def update_all_players(season="2025-26", use_espn_supplement=True):
     engine = get_engine()
     session = get_session(engine)
     fetcher = NBAStatsFetcher()
+    lease = LeaderLock(UPDATE_LOCK_NAME, ttl=UpdateJob.STALE_AFTER.total_seconds())
+    job = None
 
     try:
+        job, resumed = start_update_job(session, lease, season, mode)
+        if job is None:
+            print("[WARNING] Another stats update is already running, not starting a second one")
+            return {
+                "success": False,
+                "error": "A stats update is already running"
+            }
+
+        # Databases from before the unique index existed get it here (the
+        # deploy build also runs the migration); only the lease holder does
+        # the dedupe, so two workers never race on it
+        removed = ensure_games_unique_index(engine)
+        if removed:
+            print(f"[INFO] Removed {removed} duplicate games while adding the games unique index")
+
         # Get player count first
         player_count = session.query(Player).count()
         print(f"\n[INFO] Found {player_count} players in database")
 
-        total_new_games = 0
-        players_updated = 0
+        added_rows = []  # Rows known to be inserted (for in-place game store updates)
+        run_new_games = 0  # Added by this call (job totals include earlier attempts)
 
         # Step 1: Update from NBA API (historical data)
-        print("\n" + "=" * 60)
-        print("PHASE 1: NBA API UPDATE")
-        print("=" * 60)
-
-        # Process players in batches to reduce memory usage
-        batch_size = 20
-        for batch_start in range(0, player_count, batch_size):
-            # Get a batch of players
-            players_batch = session.query(Player).offset(batch_start).limit(batch_size).all()
-
-            print(f"\n[BATCH] Processing players {batch_start+1} to {min(batch_start+batch_size, player_count)}")
-
-            for idx, player in enumerate(players_batch, batch_start + 1):
-                print(f"\n[{idx}/{player_count}] Processing {player.name}...")
-
-                try:
-                    # Respect API rate limits
-                    time.sleep(0.6)
-
-                    new_games = update_player_stats(
-                        session,
-                        fetcher,
-                        player.name,
-                        player.team,
-                        player.position,
-                        season
+        if job.phase == 'nba_api':
+            print("\n" + "=" * 60)
+            print("PHASE 1: NBA API UPDATE")
+            print("=" * 60)
+
+            if job.mode == "league":
+                league_result = update_players_from_league_log(session, fetcher, season, added_rows=added_rows)
+                if league_result is None:
+                    print("[WARNING] League game log unavailable, falling back to per-player updates")
+                    checkpoint(session, job, mode='player')
+                else:
+                    games_added, players_updated = league_result
+                    run_new_games += games_added
+                    checkpoint(
+                        session, job,
+                        phase='espn',
+                        players_total=player_count,
+                        players_done=player_count,
+                        new_games=job.new_games + games_added,
+                        players_updated=job.players_updated + players_updated
                     )
 
-                    if new_games > 0:
-                        total_new_games += new_games
-                        players_updated += 1
-
-                except Exception as e:
-                    print(f"  [ERROR] Failed to update {player.name}: {e}")
-                    continue
-
-            # Clear session after each batch to free memory
-            session.expunge_all()
-            print(f"[BATCH COMPLETE] Cleared session cache")
+            if job.phase == 'nba_api':
+                run_new_games += update_players_individually(session, fetcher, job, season, workers=workers)
+                checkpoint(session, job, phase='espn')
+        else:
+            print(f"\n[INFO] NBA API phase already finished by job {job.id}, skipping")
 
         # Step 2: Supplement with ESPN recent games
-        espn_games_added = 0
-        if use_espn_supplement:
-            espn_games_added = add_espn_recent_games(session, days_back=7)
-            total_new_games += espn_games_added
+        if job.phase == 'espn':
+            espn_games_added = 0
+            if use_espn_supplement:
+                espn_games_added = add_espn_recent_games(session, days_back=7)
+                run_new_games += espn_games_added
+            checkpoint(
+                session, job,
+                phase='done',
+                new_games=job.new_games + espn_games_added,
+                espn_games=job.espn_games + espn_games_added
+            )
+
+        # Swap the new games into the in-memory game stores now that they're committed
+        # (appended in place when every new game is known, otherwise reloaded -
+        # including games an earlier attempt of a resumed job committed)
+        if run_new_games > 0 or (resumed and job.new_games > 0):
+            notify_games_changed(added_rows if len(added_rows) == job.new_games else None)
+
+        checkpoint(session, job, status='completed', finished_at=datetime.now())
 
         # Summary
         print("\n" + "=" * 60)
         print("FINAL UPDATE SUMMARY")
         print("=" * 60)
-        print(f"Players checked: {player_count}")
-        print(f"Players with new games (NBA API): {players_updated}")
-        print(f"New games from NBA API: {total_new_games - espn_games_added}")
-        print(f"New games from ESPN: {espn_games_added}")
-        print(f"Total new games added: {total_new_games}")
+        print(f"Update job: {job.id}" + (f" (resumed {job.resumed}x)" if job.resumed else ""))
+        print(f"Players checked: {job.players_total}")
+        print(f"Players with new games (NBA API): {job.players_updated}")
+        print(f"New games from NBA API: {job.new_games - job.espn_games}")
+        print(f"New games from ESPN: {job.espn_games}")
+        print(f"Total new games added: {job.new_games}")
 
         # Get updated totals
         total_games = session.query(Game).count()
@@ -312,20 +666,30 @@ def update_all_players(season="2025-26", use_espn_supplement=True):
 
         return {
             "success": True,
-            "players_checked": player_count,
-            "players_updated": players_updated,
-            "new_games": total_new_games,
-            "espn_games": espn_games_added,
+            "job_id": job.id,
+            "resumed": resumed,
+            "players_checked": job.players_total,
+            "players_updated": job.players_updated,
+            "new_games": job.new_games,
+            "espn_games": job.espn_games,
             "total_games": total_games
         }
 
     except Exception as e:
         print(f"\n[ERROR] Update failed: {e}")
+        if job is not None:
+            # Keep the checkpoint so the next run resumes from here
+            try:
+                session.rollback()
+                checkpoint(session, job, status='failed', error=str(e)[:500])
+            except Exception as mark_error:
+                print(f"[WARNING] Could not mark update job {job.id} failed: {mark_error}")
         return {
             "success": False,
             "error": str(e)
         }
     finally:
+        lease.release()
         session.close()
 
 